@@ -0,0 +1,141 @@
+"""List, hash and type the members of ZIP, TAR and gzip containers in memory.
+
+Nothing is extracted to disk. Each member is streamed once through the
+hashers and its first bytes are kept for type detection. A member that is
+itself a container is opened in turn while depth allows: ZIP needs random
+access, so nested containers up to MAX_NESTED_BYTES are held in memory
+while they are hashed; larger ones are hashed but not opened.
+"""
+import io
+import gzip
+import zlib
+import zipfile
+import tarfile
+from datetime import datetime
+import filetype
+import hashing
+
+
+# Virtual member paths look like "evidence.zip!/docs/report.docx!/word/document.xml"
+SEPARATOR = '!/'
+BLOCKSIZE = 1024 * 1024
+MAX_NESTED_BYTES = 64 * 1024 * 1024
+MAX_MEMBERS = 10000
+
+# Errors of a damaged, truncated or unsupported container or member
+ERRORS = (OSError, EOFError, zlib.error, zipfile.BadZipFile, tarfile.TarError)
+
+
+def container_kind(ftype):
+    """'zip', 'tar' or 'gzip' if `ftype` is a container this module opens, else None."""
+    if ftype is None:
+        return None
+    if ftype.ext in filetype.ZIP_BASED:
+        return 'zip'
+    return {'.tar': 'tar', '.gz': 'gzip'}.get(ftype.ext)
+
+
+def _zip_members(fileobj, name):
+    with zipfile.ZipFile(fileobj) as zf:
+        for info in zf.infolist():
+            if not info.is_dir():
+                yield info.filename, datetime(*info.date_time), lambda info=info: zf.open(info)
+
+
+def _tar_members(fileobj, name, mode='r|'):
+    # Stream mode reads members strictly in order and never seeks
+    with tarfile.open(fileobj=fileobj, mode=mode) as tf:
+        for member in tf:
+            if member.isfile():
+                yield (member.name, datetime.fromtimestamp(member.mtime),
+                       lambda member=member: tf.extractfile(member))
+
+
+def _gzip_members(fileobj, name):
+    """A .tar.gz yields its tar members, a plain .gz its one decompressed stream."""
+    start = fileobj.tell()
+    ftype = filetype.detect(gzip.GzipFile(fileobj=fileobj).read(512))
+    fileobj.seek(start)
+    if ftype is not None and ftype.ext == '.tar':
+        yield from _tar_members(fileobj, name, mode='r|gz')
+        return
+    inner = name.replace('\\', '/').rsplit('/', 1)[-1]
+    if inner.lower().endswith('.gz'):
+        inner = inner[:-3]
+    yield inner, None, lambda: gzip.GzipFile(fileobj=fileobj)
+
+
+_READERS = {'zip': _zip_members, 'tar': _tar_members, 'gzip': _gzip_members}
+
+
+def _read_member(f, nested, algorithms):
+    """Hash `f` to the end; returns (size, head, digests, content or None).
+
+    With `nested`, the content is kept in memory when the first block shows
+    a container of at most MAX_NESTED_BYTES.
+    """
+    hashers = hashing.new_hashers(algorithms)
+    size, head, kept = 0, b'', None
+    while block := f.read(BLOCKSIZE):
+        for h in hashers.values():
+            h.update(block)
+        if not size:
+            head = block[:filetype.SNIFF_BYTES]
+            if nested and container_kind(filetype.detect(head)):
+                kept = []
+        size += len(block)
+        if kept is not None:
+            kept.append(block)
+            if size > MAX_NESTED_BYTES:
+                kept = None
+    content = b''.join(kept) if kept is not None else None
+    return size, head, {name: h.hexdigest() for name, h in hashers.items()}, content
+
+
+def list_members(fileobj, kind, path, depth=1, algorithms=('MD5',)):
+    """Return a record for each member of the container `fileobj`.
+
+    `path` is the container's (virtual) path. Records hold the member's
+    name, virtual path, size, modified date, digests and detected FileType,
+    plus 'members' for nested containers opened within `depth` levels, or
+    'error' when the member cannot be read (e.g. encrypted). At most
+    MAX_MEMBERS members are listed per container; a container that breaks
+    off part way ends with an error record after the members before it.
+    """
+    records = []
+    members = _READERS[kind](fileobj, path)
+    while True:
+        # A damaged container keeps the members read so far plus one error record
+        try:
+            name, modified, open_member = next(members)
+        except StopIteration:
+            break
+        except ERRORS as e:
+            # A stream that broke inside the last member already has its error record
+            if not records or 'error' not in records[-1]:
+                records.append({'name': '…', 'path': path + SEPARATOR + '…', 'size': 0,
+                                'modified': '', 'error': f"damaged container: {e}"})
+            break
+        if len(records) >= MAX_MEMBERS:
+            records.append({'name': '…', 'path': path + SEPARATOR + '…', 'size': 0, 'modified': '',
+                            'error': f"more than {MAX_MEMBERS} members"})
+            break
+        record = {'name': name, 'path': path + SEPARATOR + name,
+                  'modified': modified.strftime('%Y-%m-%d') if modified else ''}
+        try:
+            with open_member() as f:
+                size, head, digests, content = _read_member(f, depth > 1, algorithms)
+        except ERRORS + (RuntimeError, NotImplementedError) as e:
+            record.update(size=0, error=str(e))
+            records.append(record)
+            continue
+        ftype = filetype.detect(head)
+        record.update(size=size, hashes=digests, ftype=ftype)
+        if content is not None:
+            try:
+                record['members'] = list_members(io.BytesIO(content), container_kind(ftype),
+                                                 record['path'], depth - 1, algorithms)
+            except ERRORS as e:
+                record['error'] = f"cannot open nested container: {e}"
+        records.append(record)
+    return records
@@ -0,0 +1,86 @@
+import unittest
+import io
+import gzip
+import tarfile
+import zipfile
+import hashlib
+from unittest.mock import patch
+import archives
+
+
+def tar_gz(files):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w:gz') as tf:
+        for name, payload in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(payload)
+            info.mtime = 1699963200  # midday UTC, same date in any timezone
+            tf.addfile(info, io.BytesIO(payload))
+    return buf.getvalue()
+
+
+def zip_of(files):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, payload in files.items():
+            zf.writestr(name, payload)
+    return buf.getvalue()
+
+
+class TestArchives(unittest.TestCase):
+
+    def evidence(self):
+        inner = tar_gz({'logs/auth.log': b'login ok\n', 'bin/tool': b'\x7fELF\x02\x01\x01' + bytes(64)})
+        return zip_of({'readme.txt': b'hello', 'nested/bundle.tar.gz': inner, 'empty/': b''})
+
+    def test_members_are_hashed_and_typed(self):
+        records = archives.list_members(io.BytesIO(self.evidence()), 'zip', 'case.zip')
+        self.assertEqual([r['path'] for r in records], ['case.zip!/readme.txt', 'case.zip!/nested/bundle.tar.gz'])
+        self.assertEqual(records[0]['hashes']['MD5'], hashlib.md5(b'hello').hexdigest())
+        self.assertEqual(records[1]['ftype'].ext, '.gz')
+        self.assertNotIn('members', records[1])
+
+    def test_every_zip_based_type_is_opened(self):
+        for marker, refined in archives.filetype._ZIP_MARKERS:
+            name, payload = (('mimetype', marker[8:]) if marker.startswith(b'mimetype')
+                             else (marker.decode() + 'x', b'x'))
+            buf = io.BytesIO()
+            with zipfile.ZipFile(buf, 'w') as zf:
+                zf.writestr(name, payload)
+            ftype = archives.filetype.detect(buf.getvalue())
+            self.assertEqual(ftype.ext, refined.ext)
+            self.assertEqual(archives.container_kind(ftype), 'zip', ftype)
+        self.assertEqual(archives.container_kind(archives.filetype.detect(zip_of({'a.whl': b'x'}))), 'zip')
+
+    def test_nested_containers_within_depth(self):
+        records = archives.list_members(io.BytesIO(self.evidence()), 'zip', 'case.zip', depth=2)
+        nested = records[1]['members']
+        self.assertEqual([r['path'] for r in nested],
+                         ['case.zip!/nested/bundle.tar.gz!/logs/auth.log', 'case.zip!/nested/bundle.tar.gz!/bin/tool'])
+        self.assertEqual(nested[1]['ftype'].category, 'executable')
+        self.assertEqual(nested[0]['size'], 9)
+        with patch.object(archives, 'MAX_NESTED_BYTES', 16):
+            records = archives.list_members(io.BytesIO(self.evidence()), 'zip', 'case.zip', depth=2)
+        self.assertNotIn('members', records[1])
+
+    def test_plain_gzip_and_tar(self):
+        records = archives.list_members(io.BytesIO(gzip.compress(b'%PDF-1.7\n' + bytes(20))), 'gzip', 'dir/report.pdf.gz')
+        self.assertEqual((records[0]['name'], records[0]['ftype'].ext), ('report.pdf', '.pdf'))
+        plain = gzip.decompress(tar_gz({'a.txt': b'abc'}))
+        records = archives.list_members(io.BytesIO(plain), 'tar', 'x.tar')
+        self.assertEqual((records[0]['path'], records[0]['modified']), ('x.tar!/a.txt', '2023-11-14'))
+
+    def test_unreadable_member_and_member_limit(self):
+        data = bytearray(zip_of({'a.txt': b'x' * 1000, 'b.txt': b'y'}))
+        data[data.index(b'a.txt') + 5:data.index(b'a.txt') + 15] = b'\xff' * 10  # damage a's deflate stream
+        records = archives.list_members(io.BytesIO(bytes(data)), 'zip', 'bad.zip')
+        self.assertIn('error', records[0])
+        self.assertEqual(records[1]['hashes']['MD5'], hashlib.md5(b'y').hexdigest())
+        with patch.object(archives, 'MAX_MEMBERS', 1):
+            records = archives.list_members(io.BytesIO(self.evidence()), 'zip', 'case.zip')
+        self.assertEqual(len(records), 2)
+        self.assertIn('more than 1 members', records[1]['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Parallel batch processing over a pool of worker processes or threads."""
+import os
+import functools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import forensics_core as core
+import scanner
+import result_cache
+
+
+DEFAULT_CHUNKSIZE = 16
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def scanned_entry(item, cache_path=None, **stages):
+    """Batch task for (path, stat) pairs produced by scanner.iter_files.
+
+    Workers open the cache by path (connections cannot cross processes).
+    `stages` are the optional core.batch_entry stages (carve, entropy,
+    archive_depth, strings, perceptual).
+    """
+    path, stat = item
+    cache = result_cache.open_cache(cache_path) if cache_path else None
+    return core.batch_entry(path, stat, cache, **stages)
+
+
+def _run_chunk(task, items):
+    """Apply `task` to each item; failed files yield None (the GUI skips them)."""
+    results = []
+    for item in items:
+        try:
+            results.append(task(item))
+        except Exception:
+            results.append(None)
+    return results
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def make_executor(workers=None, mode='process'):
+    workers = workers or default_workers()
+    if mode == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    if mode == 'process':
+        # spawn keeps workers independent of the Tk main thread's state;
+        # forensics_core is cheap to import, so start-up stays fast.
+        return ProcessPoolExecutor(max_workers=workers,
+                                   mp_context=multiprocessing.get_context('spawn'))
+    raise ValueError(f"Unknown executor mode: {mode}")
+
+
+def process_files(paths, task=core.batch_entry, workers=None, mode='process',
+                  chunksize=DEFAULT_CHUNKSIZE):
+    """Run `task` over `paths` in parallel and yield (item, result) pairs.
+
+    Results come back in input order regardless of which worker finishes
+    first. Paths may be any iterable (including a scanner generator); only a
+    bounded window of chunks is in flight at once, so memory does not grow
+    with the number of files. `result` is None when the task raised.
+    """
+    workers = workers or default_workers()
+    if workers == 1:
+        for chunk in _chunks(paths, chunksize):
+            yield from zip(chunk, _run_chunk(task, chunk))
+        return
+
+    max_pending = workers * 2
+    with make_executor(workers, mode) as pool:
+        pending = deque()
+        for chunk in _chunks(paths, chunksize):
+            pending.append((chunk, pool.submit(_run_chunk, task, chunk)))
+            if len(pending) >= max_pending:
+                done_chunk, future = pending.popleft()
+                yield from zip(done_chunk, future.result())
+        while pending:
+            done_chunk, future = pending.popleft()
+            yield from zip(done_chunk, future.result())
+
+
+def stream_folder(folder, workers=None, mode='process', chunksize=DEFAULT_CHUNKSIZE,
+                  max_depth=0, include=None, exclude=None, cache_path=None, **stages):
+    """Yield batch entries for files under `folder` while the walk is running.
+
+    Paths go to the workers as soon as the scanner finds them. `max_depth=0`
+    keeps the classic top-level scan; None recurses without limit. With
+    `cache_path`, unchanged files are served from the result cache.
+    `stages` turns on optional per-file work: `carve=True` searches for
+    appended and embedded data, `entropy=True` summarizes the byte entropy
+    profile, `archive_depth=N` lists ZIP/TAR/gzip members N levels deep,
+    `strings=True` keeps the first printable strings of each file and
+    `perceptual=True` adds perceptual hashes to images.
+    """
+    items = scanner.iter_files(folder, max_depth=max_depth, include=include, exclude=exclude)
+    task = functools.partial(scanned_entry, cache_path=cache_path, **stages)
+    for _, entry in process_files(items, task=task, workers=workers, mode=mode,
+                                  chunksize=chunksize):
+        if entry is not None:
+            yield entry
+
+
+def process_folder(folder, workers=None, mode='process', chunksize=DEFAULT_CHUNKSIZE,
+                   max_depth=0, include=None, exclude=None, cache_path=None, **stages):
+    """Return the batch entries for every file in `folder` in walk order."""
+    return list(stream_folder(folder, workers=workers, mode=mode, chunksize=chunksize,
+                              max_depth=max_depth, include=include, exclude=exclude,
+                              cache_path=cache_path, **stages))
@@ -0,0 +1,115 @@
+import unittest
+import os
+import shutil
+import hashlib
+import zipfile
+import batch_engine
+
+
+class TestBatchEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_batch"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        cls.paths = []
+        for i in range(40):
+            path = os.path.join(cls.test_dir, f"file_{i:03d}.txt")
+            with open(path, "wb") as f:
+                f.write(f"payload {i}".encode())
+            cls.paths.append(path)
+        with open(os.path.join(cls.test_dir, "tool.exe"), "wb") as f:
+            f.write(b"MZ")
+        with zipfile.ZipFile(os.path.join(cls.test_dir, "bundle.zip"), "w") as zf:
+            for path in cls.paths:
+                zf.write(path, os.path.basename(path))
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_thread_pool_preserves_order(self):
+        pairs = list(batch_engine.process_files(self.paths, workers=4, mode='thread', chunksize=3))
+        self.assertEqual([p for p, _ in pairs], self.paths)
+        expected = hashlib.md5(b"payload 7").hexdigest()[:8] + '...'
+        self.assertEqual(pairs[7][1]['md5'], expected)
+
+    def test_process_pool_matches_serial(self):
+        serial = list(batch_engine.process_files(self.paths, workers=1))
+        parallel = list(batch_engine.process_files(self.paths, workers=2, mode='process'))
+        self.assertEqual(serial, parallel)
+
+    def test_failed_file_yields_none(self):
+        missing = os.path.join(self.test_dir, "missing.bin")
+        pairs = list(batch_engine.process_files([missing], workers=2, mode='thread'))
+        self.assertEqual(pairs, [(missing, None)])
+
+    def test_process_folder_sorted(self):
+        entries = batch_engine.process_folder(self.test_dir, workers=2, mode='thread')
+        files = [e['file'] for e in entries]
+        self.assertEqual(files, sorted(files))
+        self.assertEqual(entries[-1]['status'], "🔴 Executable")
+
+    def test_stream_folder_recursive(self):
+        nested = os.path.join(self.test_dir, "nested")
+        os.makedirs(nested, exist_ok=True)
+        with open(os.path.join(nested, "inner.txt"), "wb") as f:
+            f.write(b"inner")
+        try:
+            top = batch_engine.process_folder(self.test_dir, workers=2, mode='thread')
+            deep = batch_engine.process_folder(self.test_dir, workers=2, mode='thread', max_depth=None,
+                                               include="*.txt")
+            self.assertNotIn("inner.txt", [os.path.basename(e['file']) for e in top])
+            self.assertEqual(os.path.basename(deep[-1]['file']), "inner.txt")
+            self.assertEqual(len(deep), 41)
+        finally:
+            shutil.rmtree(nested)
+
+    def setUp(self):
+        self.cache_path = os.path.join(self.test_dir, "cache.sqlite3")
+
+    def tearDown(self):
+        cache = batch_engine.result_cache._open_caches.pop(self.cache_path, None)
+        if cache is not None:
+            cache.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.cache_path + suffix):
+                os.remove(self.cache_path + suffix)
+
+    def scan(self, include="*.txt", mode='thread', cached=False, **stages):
+        return batch_engine.process_folder(self.test_dir, workers=2, mode=mode, include=include,
+                                           cache_path=self.cache_path if cached else None, **stages)
+
+    def assertCachedMatches(self, include="*.txt", mode='thread', **stages):
+        """A cold and a warm cached run both equal the uncached one; returns that."""
+        plain = self.scan(include, mode, **stages)
+        self.assertEqual(self.scan(include, cached=True, **stages), plain)
+        self.assertEqual(self.scan(include, cached=True, **stages), plain)
+        return plain
+
+    def test_cached_batch_matches_uncached(self):
+        self.assertCachedMatches()
+
+    def test_cached_carving(self):
+        carved = self.assertCachedMatches(carve=True)
+        self.assertEqual(carved[0]['embedded'], 0)
+
+    def test_cached_entropy_profile(self):
+        profiled = self.assertCachedMatches(entropy=True)
+        self.assertEqual(profiled[0]['high_entropy_windows'], 0)
+
+    def test_cached_strings(self):
+        extracted = self.assertCachedMatches(mode='process', strings=True)
+        self.assertTrue(extracted[0]['strings'])
+
+    def test_cached_perceptual_hashes(self):
+        self.assertEqual(self.assertCachedMatches(perceptual=True), self.scan())
+
+    def test_cached_archive_members(self):
+        nested = self.assertCachedMatches("*.zip", mode='process', archive_depth=1)
+        self.assertEqual(len(nested[0]['members']), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Sliding-window byte entropy profile of a (memory-mapped) file.
+
+The buffer is cut into `step`-byte rows and each row gets a 256-bin byte
+histogram: a block of rows is offset by row*256 into one preallocated index
+array and counted with a single bincount, so no Python loop touches
+individual rows. A window of `window` bytes is `window // step` consecutive
+rows; window histograms come from a running sum over the rows, and entropy
+uses a precomputed c*log2(c) table instead of per-bin logarithms. Blocks are
+streamed with the last rows carried over, so memory stays flat for any file
+size.
+"""
+import numpy as np
+
+
+DEFAULT_WINDOW = 4096
+BLOCK_BYTES = 256 * 1024
+# Windows at or above this many bits per byte look compressed or encrypted
+HIGH_ENTROPY = 7.5
+
+_clog_tables = {}
+
+
+def _clog(n):
+    """c * log2(c) for c in 0..n (0 for c == 0)."""
+    table = _clog_tables.get(n)
+    if table is None:
+        counts = np.arange(n + 1, dtype=np.float64)
+        table = np.zeros(n + 1)
+        table[1:] = counts[1:] * np.log2(counts[1:])
+        _clog_tables[n] = table
+    return table
+
+
+def _entropy(counts, length):
+    """Entropy in bits per byte of histograms (last axis) over `length` bytes."""
+    return np.log2(length) - np.take(_clog(length), counts).sum(axis=-1) / length
+
+
+def _row_histograms(data, step, index):
+    """256-bin histograms of the `step`-byte rows of a uint8 array."""
+    rows = data.size // step
+    index = index[:rows]
+    np.add(data.reshape(rows, step), _offsets(rows), out=index)
+    return np.bincount(index.ravel(), minlength=rows * 256).reshape(rows, 256)
+
+
+_offset_cache = {}
+
+
+def _offsets(rows):
+    offsets = _offset_cache.get(rows)
+    if offsets is None:
+        offsets = _offset_cache[rows] = (np.arange(rows, dtype=np.intp) * 256)[:, None]
+    return offsets
+
+
+def profile(buffer, window=DEFAULT_WINDOW, step=None, block_bytes=BLOCK_BYTES):
+    """Return the entropy (bits per byte) of each window of `buffer` as float32.
+
+    Window i starts at i * step (`step` defaults to `window`, i.e. no
+    overlap, and must divide it). Bytes past the last full window are
+    covered by one shorter final window, and a buffer smaller than
+    `window` gets a single window.
+    """
+    step = step or window
+    if window % step:
+        raise ValueError("window must be a multiple of step")
+    span = window // step
+    size = len(buffer)
+    full = size - size % step
+    block = max(window, block_bytes - block_bytes % window)
+    index = np.empty((block // step, step), dtype=np.intp)
+
+    out = []
+    carry = np.zeros((0, 256), dtype=np.intp)
+    for start in range(0, full, block):
+        data = np.frombuffer(buffer[start:min(start + block, full)], dtype=np.uint8)
+        rows = _row_histograms(data, step, index)
+        if span == 1:
+            out.append(_entropy(rows, window).astype(np.float32))
+            continue
+        rows = np.concatenate([carry, rows])
+        if len(rows) >= span:
+            running = np.cumsum(rows, axis=0)
+            windows = running[span - 1:].copy()
+            windows[1:] -= running[:-span]
+            out.append(_entropy(windows, window).astype(np.float32))
+        carry = rows[max(0, len(rows) - span + 1):]
+
+    tail = np.frombuffer(buffer[full:size], dtype=np.uint8)
+    if len(tail) or (0 < full < window):
+        counts = carry.sum(axis=0) + np.bincount(tail, minlength=256)
+        out.append(_entropy(counts[None, :], int(counts.sum())).astype(np.float32))
+    return np.concatenate(out) if out else np.zeros(0, dtype=np.float32)
+
+
+def summarize(entropy, step=DEFAULT_WINDOW):
+    """Max (with its offset), mean and high-entropy window count of a profile."""
+    if not len(entropy):
+        return {'max': 0.0, 'max_offset': 0, 'mean': 0.0, 'high_windows': 0, 'windows': 0}
+    peak = int(np.argmax(entropy))
+    return {
+        'max': round(float(entropy[peak]), 4),
+        'max_offset': peak * step,
+        'mean': round(float(entropy.mean()), 4),
+        'high_windows': int((entropy >= HIGH_ENTROPY).sum()),
+        'windows': len(entropy),
+    }
+
+
+def downsample(entropy, bins):
+    """Reduce a profile to at most `bins` values, keeping each bucket's maximum."""
+    if len(entropy) <= bins:
+        return entropy
+    edges = np.linspace(0, len(entropy), bins, endpoint=False).astype(np.intp)
+    return np.maximum.reduceat(entropy, edges)
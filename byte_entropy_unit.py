@@ -0,0 +1,56 @@
+import unittest
+import os
+import numpy as np
+import byte_entropy
+
+
+def reference(data, start, end):
+    counts = np.bincount(np.frombuffer(data[start:end], dtype=np.uint8), minlength=256)
+    p = counts[counts > 0] / counts.sum()
+    return float(-(p * np.log2(p)).sum())
+
+
+class TestByteEntropy(unittest.TestCase):
+
+    def test_constant_and_uniform_windows(self):
+        data = bytes(1024) + bytes(range(256)) * 4
+        profile = byte_entropy.profile(data, window=1024)
+        self.assertEqual(profile.dtype, np.float32)
+        np.testing.assert_allclose(profile, [0.0, 8.0], atol=1e-6)
+
+    def test_matches_reference_across_blocks(self):
+        data = bytes(np.random.default_rng(7).integers(0, 50, 10_000, dtype=np.uint8))
+        for window, step in ((512, 512), (512, 128)):
+            profile = byte_entropy.profile(data, window, step, block_bytes=1024)
+            starts = range(0, len(data) - window + 1, step)
+            expected = [reference(data, s, s + window) for s in starts]
+            # The bytes past the last full window get one shorter window
+            expected.append(reference(data, starts[-1] + step, len(data)))
+            np.testing.assert_allclose(profile, expected, atol=1e-4)
+
+    def test_short_and_empty_buffers(self):
+        self.assertEqual(len(byte_entropy.profile(b'')), 0)
+        np.testing.assert_allclose(byte_entropy.profile(b'ab' * 10, window=4096), [1.0], atol=1e-6)
+        with self.assertRaises(ValueError):
+            byte_entropy.profile(b'abc', window=100, step=30)
+
+    def test_summary_finds_encrypted_region(self):
+        data = b'plain text ' * 2000 + os.urandom(8192) + b'plain text ' * 2000
+        profile = byte_entropy.profile(data, window=1024)
+        summary = byte_entropy.summarize(profile, 1024)
+        self.assertGreater(summary['max'], 7.5)
+        self.assertTrue(22000 - 1024 <= summary['max_offset'] < 22000 + 8192)
+        self.assertGreaterEqual(summary['high_windows'], 7)
+        self.assertEqual(summary['windows'], len(profile))
+
+    def test_downsample_keeps_peaks(self):
+        profile = np.zeros(1000, dtype=np.float32)
+        profile[537] = 7.9
+        reduced = byte_entropy.downsample(profile, 100)
+        self.assertEqual(len(reduced), 100)
+        self.assertAlmostEqual(float(reduced.max()), 7.9, places=5)
+        self.assertIs(byte_entropy.downsample(profile, 2000), profile)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""`strings`-style extraction of ASCII and UTF-16LE text from any file.
+
+Each chunk of the (memory-mapped) buffer is classified in bulk with array
+comparisons, and for UTF-16LE the low bytes at even and odd alignments must
+be printable with a zero high byte. Runs are found from the edges of those
+masks, so Python only ever touches the strings it reports.
+A run still open at the end of a chunk is picked up again by the next
+chunk, which starts where the earliest open run began.
+"""
+import numpy as np
+
+
+CHUNK_BYTES = 4 * 1024 * 1024
+MIN_LENGTH = 4
+MAX_STRINGS = 100000
+# Cap on the total characters reported for one file
+MAX_CHARS = 16 * 1024 * 1024
+
+
+def printable_mask(arr):
+    """Printable ASCII (0x20-0x7E) plus tab, as in GNU strings, for a uint8 array.
+
+    Two vectorized comparisons are several times faster than a 256-entry
+    table lookup.
+    """
+    mask = (arr - np.uint8(0x20)) < 0x5F
+    mask |= arr == 0x09
+    return mask
+
+
+def _runs(mask, min_length):
+    """Runs of True in `mask` at least `min_length` long, and the open run.
+
+    Returns (starts, ends, open_start): index arrays of the qualifying runs,
+    and the start of the run that reaches the end of `mask` whatever its
+    length (None if the last entry is False). ANDing shifted copies of the
+    mask first leaves only windows of `min_length` True values, which are
+    sparse, so the edge search never sees the many short runs.
+    """
+    n = len(mask)
+    open_start = None
+    if n and mask[-1]:
+        trailing = int(np.argmin(mask[::-1]))
+        open_start = 0 if mask[n - 1 - trailing] else n - trailing
+
+    window, width = mask, 1
+    while width * 2 <= min_length:
+        window = window[:-width] & window[width:]
+        width *= 2
+    if width < min_length:
+        window = window[:width - min_length] & window[min_length - width:]
+    # window[i] is True when mask[i:i + min_length] is all True
+    bounds = np.flatnonzero(window[1:] != window[:-1]) + 1
+    if len(window) and window[0]:
+        bounds = np.concatenate(([0], bounds))
+    if len(window) and window[-1]:
+        bounds = np.concatenate((bounds, [len(window)]))
+    return bounds[0::2], bounds[1::2] + min_length - 1, open_start
+
+
+def _chunk_strings(chunk, base, final, min_length, done):
+    """Strings in one chunk as (offset, encoding, text), plus the restart offset per stream.
+
+    Three streams are scanned: ASCII, and UTF-16LE at even and odd byte
+    alignment. `done` maps each stream to the offset below which it has
+    already been reported.
+    """
+    arr = np.frombuffer(chunk, dtype=np.uint8)
+    printable = printable_mask(arr)
+    found, restart = [], {}
+
+    streams = [('ascii', printable, 0, 1)]
+    # units[i]: a printable UTF-16LE code unit starts at byte i. A trailing
+    # half unit is examined again by the next chunk.
+    units = printable[:-1] & (arr[1:] == 0)
+    for align in (0, 1):
+        # Named by absolute alignment, since chunks may start at odd offsets
+        streams.append((f'utf-16le/{(base + align) % 2}', units[align::2], align, 2))
+
+    for name, mask, align, width in streams:
+        starts, ends, open_start = _runs(mask, min_length)
+        restart[name] = base + align + len(mask) * width
+        if open_start is not None and not final:
+            # Open at the chunk end: report it from the next chunk
+            restart[name] = base + align + open_start * width
+        for start, stop in zip(starts.tolist(), ends.tolist()):
+            offset = base + align + start * width
+            if offset < done.get(name, 0) or offset >= restart[name]:
+                continue
+            raw = arr[align + start * width:align + stop * width].tobytes()
+            text = raw.decode('ascii') if width == 1 else raw.decode('utf-16-le')
+            found.append((offset, 'ascii' if width == 1 else 'utf-16le', text))
+    found.sort()
+    return found, restart
+
+
+def iter_strings(buffer, min_length=MIN_LENGTH, max_strings=MAX_STRINGS, max_chars=MAX_CHARS,
+                 chunk_bytes=CHUNK_BYTES, cancel=None, progress=None):
+    """Yield (offset, encoding, text) for printable runs of at least `min_length` characters.
+
+    `buffer` is bytes or an mmap; encoding is 'ascii' or 'utf-16le'.
+    Strings come chunk by chunk, sorted within each chunk. Runs longer than
+    a chunk are split. Stops after `max_strings` strings or `max_chars`
+    characters; `cancel` (e.g. a threading.Event) is checked and
+    `progress` called with the fraction done between chunks.
+    """
+    size = len(buffer)
+    pos, count, chars = 0, 0, 0
+    done = {}
+    while pos < size:
+        if cancel is not None and cancel.is_set():
+            return
+        stop = min(pos + chunk_bytes, size)
+        with memoryview(buffer)[pos:stop] as chunk:
+            found, restart = _chunk_strings(chunk, pos, stop == size, min_length, done)
+            next_pos = min(restart.values())
+            if next_pos <= pos:
+                # A run fills the whole chunk: report it split here
+                found, restart = _chunk_strings(chunk, pos, True, min_length, done)
+                next_pos = stop
+        for item in found:
+            yield item
+            count += 1
+            chars += len(item[2])
+            if count >= max_strings or chars >= max_chars:
+                return
+        done = restart
+        pos = next_pos
+        if progress is not None:
+            progress(pos / size)
+
+
+def extract(buffer, min_length=MIN_LENGTH, max_strings=MAX_STRINGS, max_chars=MAX_CHARS):
+    """Return {'strings': [(offset, encoding, text), ...], 'truncated': bool}."""
+    strings = list(iter_strings(buffer, min_length, max_strings + 1, max_chars + 1))
+    chars = sum(len(s[2]) for s in strings)
+    truncated = len(strings) > max_strings or chars > max_chars
+    return {'strings': strings[:max_strings], 'truncated': truncated}
@@ -0,0 +1,66 @@
+import unittest
+import re
+import os
+import threading
+import byte_strings
+
+
+def reference(data, min_length=4):
+    """Plain regex scan: ASCII runs, then UTF-16LE runs at each alignment."""
+    found = [(m.start(), 'ascii', m.group().decode('ascii'))
+             for m in re.finditer(rb'[\t\x20-\x7e]{%d,}' % min_length, data)]
+    for align in (0, 1):
+        # One character per whole code unit at this alignment, newline when not printable
+        units = data[align:len(data) - (len(data) - align) % 2]
+        text = ''.join(chr(lo) if hi == 0 and (lo == 9 or 0x20 <= lo < 0x7F) else '\n'
+                       for lo, hi in zip(units[0::2], units[1::2]))
+        for m in re.finditer(r'[^\n]{%d,}' % min_length, text):
+            found.append((align + 2 * m.start(), 'utf-16le', m.group()))
+    return sorted(found)
+
+
+class TestByteStrings(unittest.TestCase):
+
+    def test_ascii_and_utf16(self):
+        data = b'\x01\x02Hello, World\x00\xffab\x00\x00' + 'Secret'.encode('utf-16-le') + b'\x01' + \
+            'Key\tOne'.encode('utf-16-le')
+        strings = list(byte_strings.iter_strings(data))
+        self.assertEqual(strings, reference(data))
+        self.assertIn((2, 'ascii', 'Hello, World'), strings)
+        self.assertIn((20, 'utf-16le', 'Secret'), strings)
+        self.assertIn((33, 'utf-16le', 'Key\tOne'), strings)
+        self.assertNotIn('ab', [s[2] for s in strings])
+        self.assertIn((16, 'ascii', 'ab'), list(byte_strings.iter_strings(data, min_length=2)))
+
+    def test_chunk_boundaries_match_whole_scan(self):
+        rng = __import__('random').Random(7)
+        alphabet = b'abcXYZ09 \x00\x00\x00\x01\xff'
+        data = bytes(rng.choice(alphabet) for _ in range(20000)) + b'tail' * 10
+        for min_length in (1, 4, 7):
+            whole = reference(data, min_length)
+            for chunk_bytes in (150, 1001, 100000):
+                strings = byte_strings.iter_strings(data, min_length, chunk_bytes=chunk_bytes)
+                self.assertEqual(sorted(strings), whole, (min_length, chunk_bytes))
+
+    def test_run_longer_than_chunk_is_split(self):
+        data = b'A' * 1000
+        strings = list(byte_strings.iter_strings(data, chunk_bytes=256))
+        self.assertEqual(''.join(s[2] for s in strings), 'A' * 1000)
+        self.assertEqual(strings[0][0], 0)
+
+    def test_caps_and_cancel(self):
+        data = b'word\x00' * 1000
+        capped = byte_strings.extract(data, max_strings=10)
+        self.assertEqual((len(capped['strings']), capped['truncated']), (10, True))
+        self.assertTrue(byte_strings.extract(data, max_chars=100)['truncated'])
+        self.assertFalse(byte_strings.extract(b'word\x00' * 10)['truncated'])
+        cancel = threading.Event()
+        cancel.set()
+        self.assertEqual(list(byte_strings.iter_strings(data, cancel=cancel)), [])
+        fractions = []
+        list(byte_strings.iter_strings(os.urandom(5000), chunk_bytes=1000, progress=fractions.append))
+        self.assertEqual(fractions[-1], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
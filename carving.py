@@ -0,0 +1,349 @@
+"""Find appended data and embedded files inside a (memory-mapped) file.
+
+Two questions are answered for every file:
+
+* Where does the host format logically end? PNG ends at IEND, JPEG at the
+  EOI after the last scan, GIF at its trailer, ZIP at the end of its
+  central directory, PE after its last section or certificate, and so on.
+  Anything past that point is overlay data.
+* Where do other files' signatures start? The whole buffer is searched for
+  every carving signature in one pass. Each chunk is viewed as 16-bit words
+  at even and odd offsets, and one lookup in a 64K-entry table marks the
+  positions whose first two bytes start some signature. Only those few
+  candidates are checked in Python. Chunks are independent, so they are
+  spread over a thread pool (NumPy releases the GIL).
+"""
+import os
+import struct
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+CHUNK_BYTES = 4 * 1024 * 1024
+# Bytes read past each chunk so signatures and their validators never split
+OVERLAP = 1024
+MAX_HITS = 1000
+# Trailing padding of at most this many whitespace/NUL bytes is not overlay
+MAX_PADDING = 4096
+# Below this size a thread pool costs more than it saves
+THREAD_THRESHOLD = 32 * 1024 * 1024
+
+
+def _zip_ok(chunk, pos):
+    return chunk[pos + 4] <= 63 and chunk[pos + 5] == 0 and chunk[pos + 9] == 0
+
+
+def _gzip_ok(chunk, pos):
+    return chunk[pos + 3] & 0xE0 == 0
+
+
+def _jpeg_ok(chunk, pos):
+    return 0xC0 <= chunk[pos + 3] <= 0xFE
+
+
+def _bzip2_ok(chunk, pos):
+    return 0x31 <= chunk[pos + 3] <= 0x39 and chunk[pos + 4:pos + 10] == b'1AY&SY'
+
+
+def _pdf_ok(chunk, pos):
+    return 0x30 <= chunk[pos + 5] <= 0x39
+
+
+def _elf_ok(chunk, pos):
+    return chunk[pos + 4] in (1, 2) and chunk[pos + 5] in (1, 2) and chunk[pos + 6] == 1
+
+
+def _pe_ok(chunk, pos):
+    if pos + 0x40 > len(chunk):
+        return False
+    pe = pos + struct.unpack_from('<I', chunk, pos + 0x3C)[0]
+    return chunk[pe:pe + 4] == b'PE\x00\x00'
+
+
+# (magic, ext, description, category, validator)
+SIGNATURES = (
+    (b'PK\x03\x04', '.zip', 'ZIP archive', 'archive', _zip_ok),
+    (b'Rar!\x1a\x07', '.rar', 'RAR archive', 'archive', None),
+    (b"7z\xbc\xaf'\x1c", '.7z', '7-Zip archive', 'archive', None),
+    (b'\x1f\x8b\x08', '.gz', 'gzip data', 'archive', _gzip_ok),
+    (b'BZh', '.bz2', 'bzip2 data', 'archive', _bzip2_ok),
+    (b'\xfd7zXZ\x00', '.xz', 'xz data', 'archive', None),
+    (b'MSCF\x00\x00\x00\x00', '.cab', 'Cabinet archive', 'archive', None),
+    (b'\x89PNG\r\n\x1a\n', '.png', 'PNG image', 'image', None),
+    (b'\xff\xd8\xff', '.jpg', 'JPEG image', 'image', _jpeg_ok),
+    (b'GIF87a', '.gif', 'GIF image', 'image', None),
+    (b'GIF89a', '.gif', 'GIF image', 'image', None),
+    (b'%PDF-', '.pdf', 'PDF document', 'document', _pdf_ok),
+    (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', '.ole', 'OLE2 compound document', 'document', None),
+    (b'SQLite format 3\x00', '.sqlite', 'SQLite database', 'document', None),
+    (b'MZ', '.exe', 'Windows executable', 'executable', _pe_ok),
+    (b'\x7fELF', '.elf', 'ELF executable', 'executable', _elf_ok),
+)
+
+
+def _compile(signatures):
+    table = np.zeros(1 << 16, dtype=bool)
+    buckets = {}
+    for sig in signatures:
+        key = sig[0][0] | sig[0][1] << 8
+        table[key] = True
+        buckets.setdefault(sig[0][:2], []).append(sig)
+    return table, buckets
+
+
+_TABLE, _BUCKETS = _compile(SIGNATURES)
+
+
+def _scan_chunk(buffer, start, size, chunk_bytes):
+    """Return [(offset, signature)] for signatures starting in one chunk."""
+    end = min(start + chunk_bytes, size)
+    chunk = bytes(buffer[start:min(end + OVERLAP, size)])
+    arr = np.frombuffer(chunk, dtype=np.uint8)
+    span = end - start
+    even = arr[:(arr.size // 2) * 2].view('<u2')
+    odd = arr[1:1 + ((arr.size - 1) // 2) * 2].view('<u2')
+    candidates = np.concatenate([np.flatnonzero(_TABLE[even]) * 2,
+                                 np.flatnonzero(_TABLE[odd]) * 2 + 1])
+    candidates.sort()
+    hits = []
+    for pos in candidates[candidates < span].tolist():
+        for sig in _BUCKETS[chunk[pos:pos + 2]]:
+            magic, validator = sig[0], sig[4]
+            if chunk.startswith(magic, pos) and len(chunk) - pos >= 16 and \
+                    (validator is None or validator(chunk, pos)):
+                hits.append((start + pos, sig))
+                break
+    return hits
+
+
+def find_signatures(buffer, max_hits=MAX_HITS, chunk_bytes=CHUNK_BYTES, workers=None):
+    """Return ([(offset, ext, description, category)], truncated) for `buffer`.
+
+    `buffer` is bytes or an mmap. Every signature is found in one pass over
+    the data, in order of offset; after `max_hits` the search stops early.
+    """
+    size = len(buffer)
+    starts = range(0, size, chunk_bytes)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if size >= THREAD_THRESHOLD else 1
+    found = []
+    if workers <= 1:
+        results = (_scan_chunk(buffer, start, size, chunk_bytes) for start in starts)
+        return found, _collect(results, found, max_hits)
+
+    # A bounded window of chunks in flight keeps memory flat and lets an
+    # early stop skip the rest of the file
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def results():
+            for start in starts:
+                pending.append(pool.submit(_scan_chunk, buffer, start, size, chunk_bytes))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+        truncated = _collect(results(), found, max_hits)
+        for future in pending:
+            future.cancel()
+    return found, truncated
+
+
+def _collect(results, found, max_hits):
+    """Append hits from chunk results to `found`; True once max_hits is reached."""
+    for chunk_hits in results:
+        for offset, sig in chunk_hits:
+            found.append((offset, sig[1], sig[2], sig[3]))
+            if len(found) >= max_hits:
+                return True
+    return False
+
+
+# ---------- Logical end of the host format ----------
+def _png_end(buf, size):
+    pos = 8
+    while pos + 12 <= size:
+        length, kind = struct.unpack('>I4s', buf[pos:pos + 8])
+        pos += 12 + length
+        if kind == b'IEND':
+            return pos if pos <= size else None
+    return None
+
+
+def _jpeg_end(buf, size):
+    pos = 2
+    while pos + 2 <= size:
+        if buf[pos] != 0xFF:
+            return None
+        marker = buf[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0xD9:
+            return pos + 2
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        if pos + 4 > size:
+            return None
+        pos += 2 + int.from_bytes(buf[pos + 2:pos + 4], 'big')
+        if marker == 0xDA:
+            # Skip entropy-coded data: FF is always stuffed (FF00) or a restart marker
+            while True:
+                pos = buf.find(b'\xff', pos)
+                if pos < 0 or pos + 1 >= size:
+                    return None
+                nxt = buf[pos + 1]
+                if nxt == 0x00 or 0xD0 <= nxt <= 0xD7:
+                    pos += 2
+                elif nxt == 0xFF:
+                    pos += 1
+                else:
+                    break
+    return None
+
+
+def _gif_end(buf, size):
+    if size < 13:
+        return None
+    flags = buf[10]
+    pos = 13 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0)
+    while pos < size:
+        block = buf[pos]
+        if block == 0x3B:
+            return pos + 1
+        if block == 0x21:
+            pos += 2
+        elif block == 0x2C:
+            if pos + 10 > size:
+                return None
+            flags = buf[pos + 9]
+            pos += 10 + (3 << ((flags & 7) + 1) if flags & 0x80 else 0) + 1
+        else:
+            return None
+        while pos < size:
+            length = buf[pos]
+            pos += 1 + length
+            if length == 0:
+                break
+    return None
+
+
+def _zip_end(buf, size):
+    eocd = buf.rfind(b'PK\x05\x06', max(0, size - 65557))
+    if eocd < 0 or eocd + 22 > size:
+        return None
+    return eocd + 22 + struct.unpack('<H', buf[eocd + 20:eocd + 22])[0]
+
+
+def _pdf_end(buf, size):
+    pos = buf.rfind(b'%%EOF')
+    return pos + 5 if pos >= 0 else None
+
+
+def _bmp_end(buf, size):
+    declared = struct.unpack('<I', buf[2:6])[0] if size >= 6 else 0
+    return declared if 0 < declared <= size else None
+
+
+def _riff_end(buf, size):
+    declared = 8 + struct.unpack('<I', buf[4:8])[0] if size >= 8 else 0
+    declared += declared & 1
+    return declared if 8 < declared <= size else None
+
+
+def _pe_end(buf, size):
+    """End of the last section's raw data or of the Authenticode certificate."""
+    head = bytes(buf[:4096])
+    pe = struct.unpack_from('<I', head, 0x3C)[0]
+    if head[pe:pe + 4] != b'PE\x00\x00' or pe + 24 > len(head):
+        return None
+    sections, opt_size = struct.unpack_from('<H', head, pe + 6)[0], struct.unpack_from('<H', head, pe + 20)[0]
+    opt = pe + 24
+    table = opt + opt_size
+    if table + sections * 40 > len(head):
+        return None
+    end = max((sum(struct.unpack_from('<II', head, table + 40 * i + 16)) for i in range(sections)), default=0)
+    magic = struct.unpack_from('<H', head, opt)[0]
+    security = opt + (128 if magic == 0x10B else 144)  # data directory entry 4
+    if security + 8 <= table:
+        cert_offset, cert_size = struct.unpack_from('<II', head, security)
+        if cert_offset and cert_size:
+            end = max(end, cert_offset + cert_size)
+    return end if 0 < end <= size else None
+
+
+_END_FINDERS = {
+    '.png': _png_end, '.jpg': _jpeg_end, '.gif': _gif_end, '.pdf': _pdf_end, '.bmp': _bmp_end,
+    '.webp': _riff_end, '.wav': _riff_end, '.avi': _riff_end, '.exe': _pe_end, '.dll': _pe_end,
+    '.zip': _zip_end, '.docx': _zip_end, '.xlsx': _zip_end, '.pptx': _zip_end, '.jar': _zip_end,
+    '.apk': _zip_end, '.odt': _zip_end, '.ods': _zip_end, '.epub': _zip_end,
+}
+
+
+def logical_end(buffer, ext):
+    """Offset where a file of type `ext` logically ends, or None if unknown.
+
+    Trailing whitespace/NUL padding (up to MAX_PADDING bytes) counts as part
+    of the file.
+    """
+    finder = _END_FINDERS.get(ext)
+    size = len(buffer)
+    try:
+        end = finder(buffer, size) if finder else None
+    except (struct.error, IndexError, ValueError):
+        return None
+    if end is not None and 0 < size - end <= MAX_PADDING:
+        if not bytes(buffer[end:size]).strip(b' \t\r\n\x00'):
+            end = size
+    return end
+
+
+def scan(buffer, ftype=None):
+    """Carve `buffer`, the content of a file whose detected type is `ftype`.
+
+    Returns a dict with size, type, logical_end (None if the host format
+    is not understood), overlay (bytes past the logical end), embedded
+    (signature hits after offset 0, each with its location) and truncated.
+    """
+    size = len(buffer)
+    end = logical_end(buffer, ftype.ext) if ftype is not None else None
+    # The host's own signature inside its extent (ZIP members of a DOCX, the
+    # EXIF thumbnail of a JPEG) is structure, not an embedded file
+    own = None
+    if ftype is not None:
+        own = '.zip' if _END_FINDERS.get(ftype.ext) is _zip_end else ftype.ext
+    hits, truncated = find_signatures(buffer)
+    embedded = []
+    for offset, ext, description, category in hits:
+        location = 'overlay' if end is not None and offset >= end else 'inside'
+        if offset == 0 or (location == 'inside' and ext == own):
+            continue
+        embedded.append({'offset': offset, 'ext': ext, 'description': description,
+                         'category': category, 'location': location})
+    return {
+        'size': size,
+        'type': ftype.description if ftype is not None else 'Unknown',
+        'logical_end': end,
+        'overlay': size - end if end is not None else 0,
+        'embedded': embedded,
+        'truncated': truncated,
+    }
+
+
+def suspicious(result, host_category=None):
+    """Whether a scan found hidden data worth flagging.
+
+    Overlay bytes, any signature inside the overlay, and archives or
+    executables inside a host that is not itself an archive all count.
+    """
+    if result['overlay'] > 0:
+        return True
+    for hit in result['embedded']:
+        if hit['location'] == 'overlay':
+            return True
+        if hit['category'] in ('archive', 'executable') and host_category != 'archive':
+            return True
+    return False
@@ -0,0 +1,72 @@
+import unittest
+import io
+import zipfile
+from PIL import Image
+import carving
+import filetype
+
+
+def zip_bytes(name='secret.txt', payload=b'hidden'):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        zf.writestr(name, payload)
+    return buf.getvalue()
+
+
+class TestCarving(unittest.TestCase):
+
+    def encoded(self, fmt):
+        buf = io.BytesIO()
+        Image.new('RGB', (16, 16), color='blue').save(buf, fmt)
+        return buf.getvalue()
+
+    def test_logical_end_of_images(self):
+        for fmt, ext in (('PNG', '.png'), ('JPEG', '.jpg'), ('GIF', '.gif'), ('BMP', '.bmp')):
+            data = self.encoded(fmt)
+            self.assertEqual(carving.logical_end(data, ext), len(data), fmt)
+            self.assertEqual(carving.logical_end(data + b'\x00' * 10, ext), len(data) + 10, fmt)
+
+    def test_appended_zip_is_overlay(self):
+        image = self.encoded('PNG')
+        data = image + zip_bytes()
+        result = carving.scan(data, filetype.detect(data))
+        self.assertEqual((result['logical_end'], result['overlay']), (len(image), len(data) - len(image)))
+        self.assertEqual(result['embedded'][0], {'offset': len(image), 'ext': '.zip', 'description': 'ZIP archive',
+                                                 'category': 'archive', 'location': 'overlay'})
+        self.assertTrue(carving.suspicious(result, 'image'))
+
+    def test_clean_files_are_not_suspicious(self):
+        image = self.encoded('JPEG')
+        result = carving.scan(image, filetype.detect(image))
+        self.assertEqual((result['overlay'], result['embedded']), (0, []))
+        self.assertFalse(carving.suspicious(result, 'image'))
+        # Members of an OOXML container are its own structure
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zf:
+            zf.writestr('[Content_Types].xml', '<Types/>')
+            zf.writestr('word/document.xml', '<w:document/>')
+            zf.writestr('word/media/inner.zip', zip_bytes())
+        data = buf.getvalue()
+        result = carving.scan(data, filetype.detect(data))
+        self.assertEqual(result['overlay'], 0)
+        self.assertFalse(carving.suspicious(result, 'document'))
+
+    def test_hits_across_chunk_boundaries(self):
+        data = bytearray(1000)
+        data[97:97 + 16] = b'%PDF-1.7\n' + bytes(7)
+        data[300:316] = b'\x7fELF\x02\x01\x01' + bytes(9)
+        data = bytes(data)
+        expected = [(97, '.pdf', 'PDF document', 'document'), (300, '.elf', 'ELF executable', 'executable')]
+        for chunk_bytes in (100, 301, 4096):
+            self.assertEqual(carving.find_signatures(data, chunk_bytes=chunk_bytes), (expected, False))
+        self.assertEqual(carving.find_signatures(data, chunk_bytes=64, workers=2), (expected, False))
+
+    def test_hit_limit(self):
+        data = b'%PDF-1.7\n' * 50
+        found, truncated = carving.find_signatures(data, max_hits=5, chunk_bytes=64, workers=2)
+        self.assertTrue(truncated)
+        self.assertEqual([f[0] for f in found], [0, 9, 18, 27, 36])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""Content-based file type detection from magic numbers.
+
+Signatures are compiled once into a prefix index: for each distinct anchor
+offset, a dict keyed by the first two magic bytes holds the few signatures
+that start with them. A lookup is therefore a handful of dict probes plus
+`startswith` checks, no matter how many signatures the table has. Only the
+first SNIFF_BYTES of a file are ever needed.
+"""
+import struct
+from collections import namedtuple
+
+
+SNIFF_BYTES = 4096
+
+FileType = namedtuple('FileType', 'ext description category extensions')
+
+_ZIP_CONTAINERS = ('.zip', '.docx', '.xlsx', '.pptx', '.jar', '.apk', '.odt', '.ods', '.odp',
+                   '.epub', '.xpi', '.vsix', '.whl', '.nupkg', '.ipa', '.kmz')
+_OLE_CONTAINERS = ('.doc', '.xls', '.ppt', '.msi', '.msg', '.pub', '.vsd')
+_ISO_MEDIA = ('.mp4', '.m4a', '.m4v', '.mov', '.3gp', '.3g2', '.heic', '.heif', '.avif')
+
+# (ext, description, category, accepted extensions, ((offset, magic), ...))
+# The first part is the anchor used by the index; the rest must also match.
+SIGNATURES = (
+    ('.jpg', 'JPEG image', 'image', ('.jpg', '.jpeg', '.jpe', '.jfif'), ((0, b'\xff\xd8\xff'),)),
+    ('.png', 'PNG image', 'image', ('.png',), ((0, b'\x89PNG\r\n\x1a\n'),)),
+    ('.gif', 'GIF image', 'image', ('.gif',), ((0, b'GIF87a'),)),
+    ('.gif', 'GIF image', 'image', ('.gif',), ((0, b'GIF89a'),)),
+    ('.bmp', 'BMP image', 'image', ('.bmp', '.dib'), ((0, b'BM'), (6, b'\x00\x00\x00\x00'))),
+    ('.tiff', 'TIFF image', 'image', ('.tiff', '.tif', '.dng', '.nef', '.cr2', '.arw'), ((0, b'II*\x00'),)),
+    ('.tiff', 'TIFF image', 'image', ('.tiff', '.tif', '.dng', '.nef', '.cr2', '.arw'), ((0, b'MM\x00*'),)),
+    ('.webp', 'WebP image', 'image', ('.webp',), ((0, b'RIFF'), (8, b'WEBP'))),
+    ('.ico', 'Windows icon', 'image', ('.ico', '.cur'), ((0, b'\x00\x00\x01\x00'),)),
+    ('.heic', 'HEIF image', 'image', ('.heic', '.heif'), ((4, b'ftypheic'),)),
+    ('.heic', 'HEIF image', 'image', ('.heic', '.heif'), ((4, b'ftypmif1'),)),
+    ('.avif', 'AVIF image', 'image', ('.avif',), ((4, b'ftypavif'),)),
+    ('.psd', 'Photoshop image', 'image', ('.psd', '.psb'), ((0, b'8BPS'),)),
+
+    ('.pdf', 'PDF document', 'document', ('.pdf', '.ai'), ((0, b'%PDF-'),)),
+    ('.rtf', 'RTF document', 'document', ('.rtf', '.doc'), ((0, b'{\\rtf'),)),
+    ('.ole', 'OLE2 compound document', 'document', _OLE_CONTAINERS,
+     ((0, b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'),)),
+    ('.sqlite', 'SQLite database', 'document', ('.sqlite', '.sqlite3', '.db', '.db3'),
+     ((0, b'SQLite format 3\x00'),)),
+
+    ('.zip', 'ZIP archive', 'archive', _ZIP_CONTAINERS, ((0, b'PK\x03\x04'),)),
+    ('.zip', 'ZIP archive (empty)', 'archive', _ZIP_CONTAINERS, ((0, b'PK\x05\x06'),)),
+    ('.zip', 'ZIP archive (spanned)', 'archive', _ZIP_CONTAINERS, ((0, b'PK\x07\x08'),)),
+    ('.rar', 'RAR archive', 'archive', ('.rar',), ((0, b'Rar!\x1a\x07\x00'),)),
+    ('.rar', 'RAR5 archive', 'archive', ('.rar',), ((0, b'Rar!\x1a\x07\x01\x00'),)),
+    ('.7z', '7-Zip archive', 'archive', ('.7z',), ((0, b"7z\xbc\xaf'\x1c"),)),
+    ('.gz', 'gzip data', 'archive', ('.gz', '.tgz'), ((0, b'\x1f\x8b\x08'),)),
+    ('.bz2', 'bzip2 data', 'archive', ('.bz2', '.tbz2'), ((0, b'BZh'),)),
+    ('.xz', 'xz data', 'archive', ('.xz', '.txz'), ((0, b'\xfd7zXZ\x00'),)),
+    ('.zst', 'Zstandard data', 'archive', ('.zst',), ((0, b'\x28\xb5\x2f\xfd'),)),
+    ('.tar', 'tar archive', 'archive', ('.tar',), ((257, b'ustar'),)),
+    ('.cab', 'Cabinet archive', 'archive', ('.cab',), ((0, b'MSCF\x00\x00\x00\x00'),)),
+
+    ('.exe', 'Windows executable', 'executable', ('.exe', '.dll', '.sys', '.scr', '.cpl', '.ocx', '.com', '.efi'),
+     ((0, b'MZ'),)),
+    ('.elf', 'ELF executable', 'executable', ('.elf', '.so', '.o', '.ko', '.bin', ''), ((0, b'\x7fELF'),)),
+    ('.macho', 'Mach-O executable', 'executable', ('.dylib', '.bundle', ''), ((0, b'\xfe\xed\xfa\xce'),)),
+    ('.macho', 'Mach-O executable', 'executable', ('.dylib', '.bundle', ''), ((0, b'\xfe\xed\xfa\xcf'),)),
+    ('.macho', 'Mach-O executable', 'executable', ('.dylib', '.bundle', ''), ((0, b'\xce\xfa\xed\xfe'),)),
+    ('.macho', 'Mach-O executable', 'executable', ('.dylib', '.bundle', ''), ((0, b'\xcf\xfa\xed\xfe'),)),
+    ('.class', 'Java class / Mach-O universal binary', 'executable', ('.class', ''), ((0, b'\xca\xfe\xba\xbe'),)),
+    ('.dex', 'Android DEX', 'executable', ('.dex',), ((0, b'dex\n'),)),
+
+    ('.mp3', 'MP3 audio', 'media', ('.mp3',), ((0, b'ID3'),)),
+    ('.wav', 'WAVE audio', 'media', ('.wav',), ((0, b'RIFF'), (8, b'WAVE'))),
+    ('.avi', 'AVI video', 'media', ('.avi',), ((0, b'RIFF'), (8, b'AVI '))),
+    ('.ogg', 'Ogg media', 'media', ('.ogg', '.oga', '.ogv', '.opus'), ((0, b'OggS'),)),
+    ('.flac', 'FLAC audio', 'media', ('.flac',), ((0, b'fLaC'),)),
+    ('.mkv', 'Matroska / WebM video', 'media', ('.mkv', '.webm', '.mka'), ((0, b'\x1a\x45\xdf\xa3'),)),
+    ('.mp4', 'ISO media', 'media', _ISO_MEDIA, ((4, b'ftyp'),)),
+
+    ('.sh', 'Script (shebang)', 'script', None, ((0, b'#!'),)),
+)
+
+# Zip members whose names (in the first local headers) identify the container
+_ZIP_MARKERS = (
+    (b'word/', FileType('.docx', 'Word document (OOXML)', 'document', ('.docx', '.docm', '.dotx'))),
+    (b'xl/', FileType('.xlsx', 'Excel workbook (OOXML)', 'document', ('.xlsx', '.xlsm', '.xltx'))),
+    (b'ppt/', FileType('.pptx', 'PowerPoint presentation (OOXML)', 'document', ('.pptx', '.pptm', '.potx'))),
+    (b'AndroidManifest.xml', FileType('.apk', 'Android package', 'executable', ('.apk', '.aab'))),
+    (b'META-INF/MANIFEST.MF', FileType('.jar', 'Java archive', 'executable', ('.jar', '.war', '.ear'))),
+    (b'mimetypeapplication/vnd.oasis.opendocument.text',
+     FileType('.odt', 'OpenDocument text', 'document', ('.odt',))),
+    (b'mimetypeapplication/vnd.oasis.opendocument.spreadsheet',
+     FileType('.ods', 'OpenDocument spreadsheet', 'document', ('.ods',))),
+    (b'mimetypeapplication/epub+zip', FileType('.epub', 'EPUB book', 'document', ('.epub',))),
+)
+# Detected types whose content is a ZIP archive: the generic ZIP and its refinements
+ZIP_BASED = ('.zip',) + tuple(refined.ext for _, refined in _ZIP_MARKERS)
+_PE_DLL = FileType('.dll', 'Windows DLL', 'executable', ('.dll', '.sys', '.ocx', '.cpl', '.drv', '.exe'))
+_PE_CHARACTERISTICS_DLL = 0x2000
+
+
+def _compile(signatures):
+    """Build {offset: {first two magic bytes: [(parts, FileType), ...]}}."""
+    index = {}
+    for ext, description, category, extensions, parts in signatures:
+        offset, magic = parts[0]
+        bucket = index.setdefault(offset, {}).setdefault(magic[:2], [])
+        bucket.append((parts, sum(len(m) for _, m in parts),
+                       FileType(ext, description, category, extensions)))
+    for table in index.values():
+        for bucket in table.values():
+            bucket.sort(key=lambda item: -item[1])
+    return sorted(index.items())
+
+
+_INDEX = _compile(SIGNATURES)
+
+
+def _refine_zip(head, ftype):
+    for marker, refined in _ZIP_MARKERS:
+        if marker in head:
+            return refined
+    return ftype
+
+
+def _refine_pe(head, ftype):
+    """Confirm the PE header behind an MZ stub and tell DLLs from EXEs."""
+    if len(head) < 0x40:
+        return ftype
+    pe = struct.unpack_from('<I', head, 0x3C)[0]
+    if head[pe:pe + 4] != b'PE\x00\x00' or pe + 24 > len(head):
+        return ftype
+    characteristics = struct.unpack_from('<H', head, pe + 22)[0]
+    return _PE_DLL if characteristics & _PE_CHARACTERISTICS_DLL else ftype
+
+
+_REFINERS = {'.zip': _refine_zip, '.exe': _refine_pe}
+
+
+def detect(head):
+    """Return the FileType for content starting with `head`, or None."""
+    best, best_len = None, 0
+    for offset, table in _INDEX:
+        bucket = table.get(bytes(head[offset:offset + 2]))
+        if not bucket:
+            continue
+        for parts, length, ftype in bucket:
+            if length <= best_len:
+                break
+            if all(head[off:off + len(magic)] == magic for off, magic in parts):
+                best, best_len = ftype, length
+                break
+    if best is not None and best.ext in _REFINERS:
+        best = _REFINERS[best.ext](bytes(head), best)
+    return best
+
+
+def detect_file(path, size=SNIFF_BYTES):
+    """Detect the type of the file at `path` from its first `size` bytes."""
+    with open(path, 'rb') as f:
+        return detect(f.read(size))
+
+
+def extension_matches(ftype, ext):
+    """Whether the declared extension `ext` is plausible for `ftype`."""
+    return ftype is None or ftype.extensions is None or ext.lower() in ftype.extensions
@@ -0,0 +1,84 @@
+import unittest
+import io
+import os
+import shutil
+import struct
+import zipfile
+from PIL import Image
+import filetype
+
+
+def pe_header(dll=False):
+    head = bytearray(512)
+    head[:2] = b'MZ'
+    struct.pack_into('<I', head, 0x3C, 0x80)
+    head[0x80:0x84] = b'PE\x00\x00'
+    struct.pack_into('<H', head, 0x80 + 22, 0x2000 if dll else 0x0102)
+    return bytes(head)
+
+
+class TestFileType(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_filetype"
+        os.makedirs(cls.test_dir, exist_ok=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def encoded(self, fmt):
+        buf = io.BytesIO()
+        Image.new('RGB', (8, 8)).save(buf, fmt)
+        return buf.getvalue()
+
+    def test_images(self):
+        for fmt, ext in (('PNG', '.png'), ('JPEG', '.jpg'), ('GIF', '.gif'), ('BMP', '.bmp'),
+                         ('TIFF', '.tiff'), ('WEBP', '.webp')):
+            self.assertEqual(filetype.detect(self.encoded(fmt)).ext, ext, fmt)
+
+    def test_multi_part_and_offset_signatures(self):
+        self.assertEqual(filetype.detect(b'RIFF\x00\x00\x00\x00WAVEfmt ').ext, '.wav')
+        self.assertEqual(filetype.detect(b'RIFF\x00\x00\x00\x00AVI LIST').ext, '.avi')
+        tar = bytearray(512)
+        tar[257:262] = b'ustar'
+        self.assertEqual(filetype.detect(bytes(tar)).ext, '.tar')
+        self.assertEqual(filetype.detect(b'\x00\x00\x00\x18ftypisom').ext, '.mp4')
+        self.assertEqual(filetype.detect(b'\x00\x00\x00\x18ftypheic').ext, '.heic')
+
+    def test_executables(self):
+        self.assertEqual(filetype.detect(pe_header()).description, 'Windows executable')
+        self.assertEqual(filetype.detect(pe_header(dll=True)).ext, '.dll')
+        self.assertEqual(filetype.detect(b'\x7fELF\x02\x01\x01').category, 'executable')
+
+    def test_zip_containers(self):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zf:
+            zf.writestr('[Content_Types].xml', '<Types/>')
+            zf.writestr('word/document.xml', '<w:document/>')
+        self.assertEqual(filetype.detect(buf.getvalue()).ext, '.docx')
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zf:
+            zf.writestr('notes.txt', 'hello')
+        self.assertEqual(filetype.detect(buf.getvalue()).ext, '.zip')
+
+    def test_unknown_and_short(self):
+        self.assertIsNone(filetype.detect(b''))
+        self.assertIsNone(filetype.detect(b'plain text file'))
+        self.assertIsNone(filetype.detect(b'M'))
+
+    def test_detect_file_and_extension_matches(self):
+        path = os.path.join(self.test_dir, "photo.png")
+        with open(path, 'wb') as f:
+            f.write(self.encoded('JPEG'))
+        ftype = filetype.detect_file(path)
+        self.assertEqual(ftype.ext, '.jpg')
+        self.assertFalse(filetype.extension_matches(ftype, '.png'))
+        self.assertTrue(filetype.extension_matches(ftype, '.JPEG'))
+        self.assertTrue(filetype.extension_matches(None, '.anything'))
+
+
+if __name__ == '__main__':
+    unittest.main()
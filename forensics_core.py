@@ -0,0 +1,912 @@
+"""Headless forensic operations behind the HideU GUI.
+
+Nothing here touches Tk. Heavy format parsers (PIL, numpy, PyPDF2) and
+the OOXML reader are imported the first time a file that needs them is
+seen, so importing this module stays cheap for worker processes.
+"""
+import io
+import os
+import mmap
+import functools
+import contextlib
+import importlib
+from datetime import datetime
+import filetype
+import hashing
+import hexview
+
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp')
+EXECUTABLE_EXTENSIONS = ('.exe', '.dll', '.bat', '.vbs', '.elf')
+LARGE_FILE_BYTES = 10_000_000
+HEX_DUMP_LIMIT = 2048
+# Estimated embedding rates at or above this are reported as suspicious
+STEGO_RATE_THRESHOLD = 0.15
+# Tile size (pixels) of the suspicion heatmap, and the mean score that marks
+# a row of tiles as hot
+HEATMAP_TILE = 64
+HEATMAP_HOT = 0.5
+# Working memory for strip-streamed encode, decode and analysis
+MEMORY_BUDGET = 64 * 1024 * 1024
+# Stego tab preview size and how many thumbnails to keep
+PREVIEW_SIZE = (300, 300)
+THUMBNAIL_CACHE_SIZE = 32
+# Window (bytes) of the byte entropy profile
+ENTROPY_WINDOW = 4096
+# Most strings listed for one file in the Hex tab
+STRINGS_LIMIT = 100000
+# Per-file cap on the strings kept by the batch strings stage
+BATCH_STRINGS = 200
+BATCH_STRING_CHARS = 64 * 1024
+
+FILE_TYPE_ICONS = {'.jpg':'🖼️','.jpeg':'🖼️','.png':'🖼️','.gif':'🖼️','.bmp':'🖼️','.tiff':'🖼️',
+                   '.pdf':'📄','.docx':'📝','.doc':'📝','.xlsx':'📊','.txt':'📃','.zip':'📦',
+                   '.rar':'📦','.7z':'📦','.exe':'⚙️','.dll':'⚙️','.odt':'📝','.rtf':'📝',
+                   '.ods':'📊','.pptx':'📽️','.epub':'📚','.sqlite':'🗄️'}
+# Fallback for detected types without their own icon, by filetype category
+FILE_CATEGORY_ICONS = {'image':'🖼️','document':'📄','archive':'📦','executable':'⚙️',
+                       'media':'🎞️','script':'📜'}
+
+_modules = {}
+
+
+def _lazy(name):
+    """Import `name` on first use and cache the module object."""
+    mod = _modules.get(name)
+    if mod is None:
+        mod = importlib.import_module(name)
+        _modules[name] = mod
+    return mod
+
+
+# ---------- File Type ----------
+def sniff(path, data=None):
+    """Detect the content type of `path` (or of `data`, its content) by magic number."""
+    try:
+        if data is not None:
+            return filetype.detect(data[:filetype.SNIFF_BYTES])
+        return filetype.detect_file(path)
+    except OSError:
+        return None
+
+
+def content_ext(path, ftype):
+    """Extension to dispatch on: the detected one, else the declared one.
+
+    A generic ZIP whose declared extension is one of its container types
+    (.docx, .xlsx, ...) keeps that extension: sniffing only sees the first
+    members, which need not reveal the package type.
+    """
+    declared = os.path.splitext(path)[1].lower()
+    if ftype is None:
+        return declared
+    if ftype.ext == '.zip' and declared != '.zip' and filetype.extension_matches(ftype, declared):
+        return declared
+    return ftype.ext
+
+
+def file_type_icon(ext, ftype):
+    """Icon for extension `ext`, falling back to the category of the detected `ftype`."""
+    icon = FILE_TYPE_ICONS.get(ext)
+    if icon is None and ftype is not None:
+        icon = FILE_CATEGORY_ICONS.get(ftype.category)
+    return icon or '📁'
+
+
+def file_type_label(filename):
+    """Label for the detected type of `filename`, flagging a misleading extension."""
+    ext = os.path.splitext(filename)[1].lower()
+    ftype = sniff(filename) if os.path.isfile(filename) else None
+    shown = content_ext(filename, ftype)
+    label = f"{file_type_icon(shown, ftype)} {shown[1:].upper() if shown else 'UNKNOWN'}"
+    if not filetype.extension_matches(ftype, ext):
+        label += f" (as {ext or 'no extension'})"
+    return label
+
+
+# ---------- METADATA EXTRACTION ----------
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a shared bytes or mmap buffer.
+
+    Each parser gets its own reader, so their positions never interfere and
+    the underlying file is not read again.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self._buffer = buffer
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, b):
+        data = self._buffer[self._pos:self._pos + len(b)]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._buffer)
+        if offset < 0:
+            raise ValueError("negative seek position")
+        self._pos = offset
+        return offset
+
+    def tell(self):
+        return self._pos
+
+
+@contextlib.contextmanager
+def open_shared(path):
+    """Open `path` once and yield (buffer, stat) for hashers and parsers.
+
+    The buffer is a read-only memory map, so pages are fetched on first
+    touch and then served from the page cache to every later consumer.
+    """
+    with open(path, 'rb') as f:
+        stat = os.fstat(f.fileno())
+        if stat.st_size == 0:
+            yield b'', stat
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm, stat
+
+
+def _source(path, data):
+    """A file object over `data` when given, otherwise the path itself."""
+    return path if data is None else _BufferReader(data)
+
+
+def extract_all_metadata(path, cache=None):
+    """Collect file system, hash and format metadata for `path`.
+
+    The file is opened once; hashes and format parsers all read from the
+    same mapping. With a ResultCache, hashes and format metadata are reused
+    for unchanged content; the file system section is always read fresh.
+    """
+    meta = {}
+    with open_shared(path) as (data, stat):
+        meta['Basic Info'] = {
+            'File Name': os.path.basename(path),
+            'File Size': f"{stat.st_size:,} bytes",
+            'Created': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
+            'Modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+            'Accessed': datetime.fromtimestamp(stat.st_atime).strftime('%Y-%m-%d %H:%M:%S'),
+            'Extension': os.path.splitext(path)[1],
+        }
+        ftype = sniff(path, data)
+        meta['Basic Info']['Detected Type'] = ftype.description if ftype else 'Unknown'
+        if not filetype.extension_matches(ftype, os.path.splitext(path)[1]):
+            meta['Basic Info']['Extension Mismatch'] = f"content is {ftype.description}"
+
+        if cache is None:
+            meta['Hashes'] = compute_hashes(path, data=data)
+            meta.update(extract_format_metadata(path, data, ftype))
+        else:
+            ext = content_ext(path, ftype)
+            meta['Hashes'] = cache.hashes(path, stat, data)
+            meta.update(cache.get_or_compute(path, f'metadata4{ext}',
+                                             lambda p: extract_format_metadata(p, data, ftype), stat, data))
+
+    return meta
+
+
+def extract_format_metadata(path, data=None, ftype=None):
+    """Dispatch to the format-specific extractor for `path`.
+
+    The parser is chosen from the content's magic number, falling back to
+    the extension for unrecognised content. `data` is the file's content
+    when the caller already has it open; `ftype` a detection already made.
+    """
+    ext = content_ext(path, ftype or sniff(path, data))
+    if ext in IMAGE_EXTENSIONS:
+        return extract_image_metadata(path, data)
+    elif ext == '.pdf':
+        return extract_pdf_metadata(path, data)
+    elif ext == '.docx':
+        return extract_docx_metadata(path, data)
+    elif ext == '.xlsx':
+        return extract_xlsx_metadata(path, data)
+    return {}
+
+
+def compute_hashes(path, blocksize=hashing.DEFAULT_BLOCKSIZE, algorithms=hashing.DEFAULT_ALGORITHMS,
+                   data=None):
+    if data is not None:
+        return hashing.hash_buffer(data, algorithms, blocksize)
+    return hashing.hash_file(path, algorithms, blocksize)
+
+
+def extract_image_metadata(path, data=None):
+    meta = {}
+    try:
+        Image = _lazy('PIL.Image')
+        ExifTags = _lazy('PIL.ExifTags')
+        img = Image.open(_source(path, data))
+        info = {
+            'Format': img.format,
+            'Mode': img.mode,
+            'Width': img.width,
+            'Height': img.height,
+            'Is Animated': getattr(img, 'is_animated', False),
+            'Frames': getattr(img, 'n_frames', 1)
+        }
+        meta['Image Properties'] = info
+
+        # One EXIF parse feeds both the general tags and the GPS block
+        exif = img.getexif()
+        tags = dict(exif)
+        tags.update(exif.get_ifd(ExifTags.IFD.Exif))
+        gps = exif.get_ifd(ExifTags.IFD.GPSInfo)
+        if gps:
+            tags[ExifTags.IFD.GPSInfo] = gps
+        exif_data = {ExifTags.TAGS.get(tag_id, tag_id): str(value) for tag_id, value in tags.items()}
+        if exif_data:
+            meta['EXIF'] = exif_data
+        if gps:
+            meta['GPS'] = {f"GPS {ExifTags.GPSTAGS.get(k, k)}": str(v) for k, v in gps.items()}
+    except Exception as e:
+        meta['Image Error'] = str(e)
+    return meta
+
+
+def extract_pdf_metadata(path, data=None):
+    """PDF metadata from the trailer chain, falling back to PyPDF2.
+
+    The fast path reads only the trailers, xref data and the Info, XMP,
+    catalog and page-tree-root objects, and lists the Info of every
+    incremental-update revision. Damaged or unusual files go through the
+    full parser instead.
+    """
+    try:
+        result = _lazy('pdf_meta').read_metadata(_source(path, data))
+    except Exception:
+        return _pdf_full_metadata(path, data)
+
+    meta = {}
+    if result['info']:
+        meta['PDF Metadata'] = result['info']
+    meta['PDF Info'] = {
+        'Number of Pages': result['pages'],
+        'Encrypted': result['encrypted'],
+        'PDF Version': result['version'],
+        'Revisions': len(result['revisions']),
+    }
+    if result['xmp']:
+        meta['PDF XMP'] = result['xmp']
+    if len(result['revisions']) > 1:
+        meta['PDF Revisions'] = {
+            f"Revision {i} (xref @ {rev['xref_offset']:,})":
+                '; '.join(f"{k.lstrip('/')}={v}" for k, v in rev['info'].items()) or '(no Info dictionary)'
+            for i, rev in enumerate(result['revisions'], 1)
+        }
+    return meta
+
+
+def _pdf_full_metadata(path, data=None):
+    meta = {}
+    try:
+        reader = _lazy('PyPDF2').PdfReader(_source(path, data))
+        info = reader.metadata
+        if info:
+            meta['PDF Metadata'] = {k: str(v) for k, v in info.items()}
+        meta['PDF Info'] = {
+            'Number of Pages': len(reader.pages),
+            'Encrypted': reader.is_encrypted
+        }
+    except Exception as e:
+        meta['PDF Error'] = str(e)
+    return meta
+
+
+def extract_docx_metadata(path, data=None):
+    meta = {}
+    try:
+        props = _lazy('ooxml').read_properties(_source(path, data))
+        core, app = props['core'], props['app']
+        p = {
+            'Author': core.get('creator'),
+            'Title': core.get('title'),
+            'Subject': core.get('subject'),
+            'Keywords': core.get('keywords'),
+            'Comments': core.get('description'),
+            'Category': core.get('category'),
+            'Created': core.get('created'),
+            'Modified': core.get('modified'),
+            'Last Modified By': core.get('lastModifiedBy'),
+            'Last Printed': core.get('lastPrinted'),
+            'Revision': core.get('revision'),
+            'Pages': app.get('Pages'),
+            'Word Count': app.get('Words'),
+            'Characters': app.get('Characters'),
+            'Total Editing Time (min)': app.get('TotalTime'),
+            'Template': app.get('Template'),
+            'Application': app.get('Application'),
+            'Company': app.get('Company'),
+        }
+        meta['DOCX Properties'] = {k: v for k, v in p.items() if v}
+    except Exception as e:
+        meta['DOCX Error'] = str(e)
+    return meta
+
+
+def extract_xlsx_metadata(path, data=None):
+    meta = {}
+    try:
+        props = _lazy('ooxml').read_properties(_source(path, data))
+        core, app = props['core'], props['app']
+        p = {
+            'Title': core.get('title'),
+            'Subject': core.get('subject'),
+            'Creator': core.get('creator'),
+            'Keywords': core.get('keywords'),
+            'Description': core.get('description'),
+            'Created': core.get('created'),
+            'Modified': core.get('modified'),
+            'Last Modified By': core.get('lastModifiedBy'),
+            'Category': core.get('category'),
+            'Application': app.get('Application'),
+            'Company': app.get('Company'),
+            'Sheets': props['sheets'],
+        }
+        meta['XLSX Properties'] = {k: str(v) for k, v in p.items() if v}
+    except Exception as e:
+        meta['XLSX Error'] = str(e)
+    return meta
+
+
+# ---------- STEGANOGRAPHY ----------
+def encode_message(path, message):
+    """Hide `message` in the image at `path`; returns (PIL image, stats)."""
+    return _lazy('lsb_engine').embed_message(path, message.encode('utf-8'))
+
+
+def encode_message_to_file(path, message, out_path, budget=MEMORY_BUDGET):
+    """Hide `message` in the image at `path`, streaming a PNG to `out_path`; returns stats."""
+    return _lazy('lsb_engine').embed_message_to_file(path, out_path, message.encode('utf-8'), budget)
+
+
+def decode_message(path, budget=MEMORY_BUDGET):
+    """Return the message hidden in the image at `path`."""
+    data = _lazy('lsb_engine').extract_message(path, budget)
+    return data.decode('utf-8', errors='replace')
+
+
+def analyze_image(path, cache=None):
+    """Compute the steganalysis statistics for the image at `path`."""
+    if cache is not None:
+        # 'stego4' results carry embedding-rate estimates, the tile heatmap
+        # and per-channel statistics
+        result = cache.get_or_compute(path, 'stego4', _analyze_image)
+        result['file'] = os.path.basename(path)
+        return result
+    return _analyze_image(path)
+
+
+def _analyze_image(path, budget=MEMORY_BUDGET):
+    Image = _lazy('PIL.Image')
+    np = _lazy('numpy')
+    lsb_engine = _lazy('lsb_engine')
+    steganalysis = _lazy('steganalysis')
+    with Image.open(path) as img:
+        mode = img.mode
+        width, height = img.size
+
+    # The image is read in strips; one counting pass per strip feeds LSB
+    # ratios, entropy and the chi-square test
+    strips = lsb_engine.iter_rgb_strips(path, lsb_engine.strip_rows(width, budget, HEATMAP_TILE))
+    stream = steganalysis.analyze_stream(strips, (height, width, 3), HEATMAP_TILE)
+    summary = steganalysis.histogram_summary(stream['counts'].sum(axis=0))
+    lsb_ratio = summary['lsb_ratio']
+    entropy = summary['entropy']
+    file_size = os.stat(path).st_size
+    expected_size = height * width * 3 + 1000
+    size_ratio = file_size / expected_size if expected_size else 1
+
+    suspicious = []
+    if abs(lsb_ratio - 0.5) > 0.1:
+        suspicious.append("LSB distribution not uniform (potential stego)")
+    if entropy > 7.9:
+        suspicious.append("High entropy (possible encrypted/carved data)")
+    if size_ratio > 1.2:
+        suspicious.append("File significantly larger than expected")
+
+    rates = stream['rates']
+    for channel, estimates in rates.items():
+        # Noisy covers equalise value pairs too; only a prefix followed by
+        # clearly unequal pairs points at sequential embedding
+        if estimates['chi_square'] >= STEGO_RATE_THRESHOLD and estimates['chi_square_p'] < 0.01:
+            suspicious.append(f"{channel}: value pairs equalised over the first "
+                              f"{estimates['chi_square']:.0%} of samples (chi-square)")
+        rate = max(estimates['rs'], estimates['spa'])
+        if rate >= STEGO_RATE_THRESHOLD:
+            suspicious.append(f"{channel}: RS/SPA estimate ~{rate:.0%} of LSBs carry data")
+
+    heatmap = stream['tiles']['heatmap'] if stream['tiles'] else np.zeros((0, 0))
+    hot_rows = np.nonzero(heatmap.mean(axis=1) >= HEATMAP_HOT)[0] if heatmap.size else []
+    if len(hot_rows):
+        first, last = hot_rows[0] * HEATMAP_TILE, (hot_rows[-1] + 1) * HEATMAP_TILE
+        suspicious.append(f"Localized LSB anomaly in {len(hot_rows)} tile row(s) "
+                          f"between pixel rows {first}-{last}")
+
+    return {
+        'file': os.path.basename(path),
+        'file_size': file_size,
+        'width': width,
+        'height': height,
+        'mode': mode,
+        'pixels': width * height,
+        'lsb_ones': summary['lsb_ones'],
+        'total_values': summary['values'],
+        'lsb_ratio': lsb_ratio,
+        'entropy': entropy,
+        'channel_stats': summary['channels'],
+        'size_ratio': size_ratio,
+        'embedding_rates': rates,
+        'heatmap': heatmap.tolist(),
+        'heatmap_tile': HEATMAP_TILE,
+        'suspicious': suspicious,
+    }
+
+
+def format_analysis_report(result):
+    report = []
+    report.append("🔬 STEGANOGRAPHY ANALYSIS REPORT")
+    report.append("=" * 60)
+    report.append(f"File: {result['file']}")
+    report.append(f"Size: {result['file_size']:,} bytes")
+    report.append(f"Dimensions: {result['width']}×{result['height']}")
+    report.append(f"Mode: {result['mode']}")
+    report.append("")
+    report.append("📊 STATISTICAL ANALYSIS:")
+    report.append(f"  LSB 1s: {result['lsb_ones']:,} / {result['total_values']:,} ({result['lsb_ratio']:.2%})")
+    report.append(f"  Entropy: {result['entropy']:.4f} bits")
+    for channel, stats in result['channel_stats'].items():
+        report.append(f"    {channel:<6} LSB 1s {stats['lsb_ratio']:.2%}, entropy {stats['entropy']:.4f} bits")
+    report.append(f"  File size vs expected: {result['size_ratio']:.2f}x")
+    report.append("")
+    report.append("📈 ESTIMATED EMBEDDING RATE (chi-square / RS / SPA):")
+    for channel, estimates in result['embedding_rates'].items():
+        report.append(f"  {channel:<6} {estimates['chi_square']:6.1%} {estimates['rs']:6.1%} {estimates['spa']:6.1%}")
+    heatmap = result['heatmap']
+    if heatmap:
+        peak = max(max(row) for row in heatmap)
+        report.append(f"  Tile heatmap: {len(heatmap)}×{len(heatmap[0])} tiles of "
+                      f"{result['heatmap_tile']} px, peak score {peak:.0%}")
+    report.append("")
+    report.append("⚠️  SUSPICION INDICATORS:")
+    if result['suspicious']:
+        for s in result['suspicious']:
+            report.append(f"  • {s}")
+    else:
+        report.append("  No obvious steganographic signs.")
+    return "\n".join(report)
+
+
+def image_header(path):
+    """Format, size, mode and LSB capacity of an image, read from its header only."""
+    with _lazy('PIL.Image').open(path) as img:
+        width, height = img.size
+        return {
+            'format': img.format or os.path.splitext(path)[1].upper()[1:] or 'UNKNOWN',
+            'width': width,
+            'height': height,
+            'mode': img.mode,
+            'capacity': _lazy('lsb_engine').capacity_bytes((height, width, 3)),
+        }
+
+
+def preview_thumbnail(path, size=PREVIEW_SIZE):
+    """Return an RGB or L thumbnail of the image at `path`, cached by path and mtime.
+
+    The returned image is shared between callers and must not be modified.
+    """
+    stat = os.stat(path)
+    return _cached_thumbnail(path, stat.st_mtime_ns, stat.st_size, tuple(size))
+
+
+@functools.lru_cache(maxsize=THUMBNAIL_CACHE_SIZE)
+def _cached_thumbnail(path, mtime_ns, file_size, size):
+    # thumbnail() lets JPEG decode at reduced scale (draft) and reduces other
+    # formats before resampling; only the small result is converted
+    img = _lazy('PIL.Image').open(path)
+    img.thumbnail(size)
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    return img
+
+
+def heatmap_overlay(path, heatmap, tile, size=PREVIEW_SIZE, opacity=0.6):
+    """Return a thumbnail of the image at `path` with `heatmap` drawn in red.
+
+    `heatmap` is a (rows, cols) grid of scores in [0, 1], one per `tile` x
+    `tile` block of the full-size image.
+    """
+    Image = _lazy('PIL.Image')
+    np = _lazy('numpy')
+    full_width = image_header(path)['width']
+    img = preview_thumbnail(path, size).convert('RGB')
+    heat = np.asarray(heatmap, dtype=np.float64)
+    if heat.size == 0:
+        return img
+
+    scale = img.width / full_width
+    cover = (max(1, round(heat.shape[1] * tile * scale)), max(1, round(heat.shape[0] * tile * scale)))
+    levels = Image.fromarray((np.clip(heat, 0, 1) * opacity * 255).astype(np.uint8), 'L')
+    alpha = Image.new('L', img.size, 0)
+    alpha.paste(levels.resize(cover, Image.NEAREST), (0, 0))
+    return Image.composite(Image.new('RGB', img.size, (255, 0, 0)), img, alpha)
+
+
+def calculate_entropy(data):
+    """Shannon entropy in bits of a uint8 array, from one counting pass."""
+    np = _lazy('numpy')
+    counts = np.bincount(np.asarray(data, dtype=np.uint8).ravel(), minlength=256)
+    return float(_lazy('steganalysis').histogram_entropy(counts))
+
+
+# ---------- CARVING ----------
+def carve_file(path, cache=None):
+    """Look for appended data and embedded files in `path`."""
+    if cache is not None:
+        result = cache.get_or_compute(path, 'carve1', _carve_file)
+    else:
+        result = _carve_file(path)
+    result['file'] = os.path.basename(path)
+    return result
+
+
+def _carve_file(path, data=None, ftype=None):
+    if data is None:
+        with open_shared(path) as (data, _):
+            return _carve_file(path, data, ftype)
+    carving = _lazy('carving')
+    ftype = ftype or sniff(path, data)
+    result = carving.scan(data, ftype)
+    result['suspicious'] = carving.suspicious(result, ftype.category if ftype else None)
+    return result
+
+
+def format_carve_report(result):
+    report = []
+    report.append("🧲 APPENDED & EMBEDDED DATA REPORT")
+    report.append("=" * 60)
+    report.append(f"File: {result['file']}")
+    report.append(f"Type: {result['type']}")
+    report.append(f"Size: {result['size']:,} bytes")
+    if result['logical_end'] is None:
+        report.append("Logical end: unknown for this format")
+    else:
+        report.append(f"Logical end: {result['logical_end']:,} (0x{result['logical_end']:X})")
+        report.append(f"Overlay past end: {result['overlay']:,} bytes")
+    report.append("")
+    report.append("📌 EMBEDDED SIGNATURES:")
+    if result['embedded']:
+        for hit in result['embedded']:
+            report.append(f"  0x{hit['offset']:08X}  {hit['description']:<24} {hit['location']}")
+        if result['truncated']:
+            report.append("  … stopped after the hit limit")
+    else:
+        report.append("  None found.")
+    report.append("")
+    report.append("⚠️  Hidden data likely." if result['suspicious'] else "No appended or embedded data.")
+    return "\n".join(report)
+
+
+# ---------- BYTE ENTROPY ----------
+def entropy_profile(path, window=ENTROPY_WINDOW, step=None):
+    """Byte entropy (bits per byte) of each window of `path`, as a float32 array."""
+    with open_shared(path) as (data, _):
+        return _lazy('byte_entropy').profile(data, window, step)
+
+
+def _entropy_summary(path, data=None):
+    if data is None:
+        with open_shared(path) as (data, _):
+            return _entropy_summary(path, data)
+    byte_entropy = _lazy('byte_entropy')
+    return byte_entropy.summarize(byte_entropy.profile(data, ENTROPY_WINDOW), ENTROPY_WINDOW)
+
+
+# ---------- STRINGS ----------
+def iter_strings(path, min_length=4, cancel=None, progress=None):
+    """Yield (offset, encoding, text) for the ASCII and UTF-16LE strings in `path`."""
+    with open_shared(path) as (data, _):
+        yield from _lazy('byte_strings').iter_strings(data, min_length, max_strings=STRINGS_LIMIT,
+                                                      cancel=cancel, progress=progress)
+
+
+def _batch_strings(path, data=None):
+    if data is None:
+        with open_shared(path) as (data, _):
+            return _batch_strings(path, data)
+    found = _lazy('byte_strings').extract(data, max_strings=BATCH_STRINGS, max_chars=BATCH_STRING_CHARS)
+    return {'strings': [list(s) for s in found['strings']], 'truncated': found['truncated']}
+
+
+# ---------- PERCEPTUAL HASHES ----------
+def perceptual_hashes(path, data=None):
+    """aHash, dHash and pHash of the image at `path` as 16-digit hex strings."""
+    return _lazy('perceptual_hash').image_hashes(_source(path, data))
+
+
+def _batch_perceptual(path, data, ftype):
+    # Only decodable images are hashed; {} marks the rest (and is cacheable)
+    if ftype is None or ftype.category != 'image':
+        return {}
+    try:
+        return perceptual_hashes(path, data)
+    except Exception:
+        return {}
+
+
+def near_duplicates(results, distance=None):
+    """Pairs (distance, a, b) of batch entries whose pHashes differ by at most `distance` bits.
+
+    `distance` defaults to perceptual_hash.NEAR_DISTANCE.
+    """
+    hashed = [(int(r['phash'], 16), r) for r in results if r.get('phash')]
+    if not hashed:
+        return []
+    perceptual_hash = _lazy('perceptual_hash')
+    if distance is None:
+        distance = perceptual_hash.NEAR_DISTANCE
+    return perceptual_hash.near_duplicates(hashed, distance)
+
+
+# ---------- BATCH PROCESSING ----------
+def list_folder(folder):
+    """Return the files directly inside `folder` (top-level only)."""
+    files = []
+    for root, dirs, files_ in os.walk(folder):
+        for f in files_:
+            files.append(os.path.join(root, f))
+        break  # top-level only
+    return files
+
+
+def batch_status(ext, size, ftype, hidden=False):
+    """Heuristic batch status; later checks take precedence."""
+    status = "✅ Clean"
+    if size > LARGE_FILE_BYTES:
+        status = "⚠️ Large"
+    if not filetype.extension_matches(ftype, ext):
+        status = "⚠️ Mismatch"
+    if hidden:
+        status = "🟣 Hidden Data"
+    if ext in EXECUTABLE_EXTENSIONS or (ftype is not None and ftype.category == 'executable'):
+        status = "🔴 Executable"
+    return status
+
+
+def batch_entry(path, stat=None, cache=None, carve=False, entropy=False, archive_depth=0, strings=False,
+                perceptual=False):
+    """Build the batch result row for a single file.
+
+    `stat` may be passed in when the caller already has it (e.g. from a
+    scandir walk) to avoid a second stat call. With `carve`, the file is
+    also searched for appended data and embedded files; with `entropy`,
+    its byte entropy profile is summarized. ZIP, TAR and gzip containers
+    are opened up to `archive_depth` levels deep and their members listed
+    as child rows under 'members'. With `strings`, the first BATCH_STRINGS
+    printable strings are kept as [offset, encoding, text]. With
+    `perceptual`, images also get 'ahash', 'dhash' and 'phash' for
+    near-duplicate search.
+    """
+    if stat is None:
+        stat = os.stat(path)
+    size = stat.st_size
+    ext = os.path.splitext(path)[1].lower()
+    modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
+    stages = _batch_stages(carve, entropy, archive_depth, strings, perceptual)
+    # An unchanged file is served from its stat alone, without opening it
+    results = cache.lookup(stat, ('hashes', 'sniff1') + tuple(stages)) if cache is not None else None
+    if results is None:
+        with open_shared(path) as (data, _):
+            ftype = sniff(path, data)
+            if cache is None:
+                # The batch view only shows an MD5 prefix, so skip the other digests
+                results = {'hashes': compute_hashes(path, algorithms=('MD5',), data=data)}
+                results.update((kind, compute(path, data, ftype)) for kind, compute in stages.items())
+            else:
+                results = {'hashes': cache.hashes(path, stat, data),
+                           'sniff1': cache.get_or_compute(path, 'sniff1', lambda p: _ftype_record(ftype),
+                                                          stat, data)}
+                for kind, compute in stages.items():
+                    results[kind] = cache.get_or_compute(path, kind, lambda p, c=compute: c(p, data, ftype),
+                                                         stat, data)
+    else:
+        ftype = _ftype_from_record(results['sniff1'])
+    hashes = results['hashes']
+    carved = results.get('carve1')
+    profiled = results.get('entropy1')
+    found = results.get('strings1')
+    fingerprints = results.get('phash2')
+    members = None
+    if archive_depth and _lazy('archives').container_kind(ftype):
+        # Rows are named relative to the container, so byte-identical copies
+        # under other names get their own paths
+        members = _place_members(results[f'members2-{archive_depth}'], path)
+    entry = {
+        'file': path, 'type': content_ext(path, ftype), 'size': size,
+        'md5': hashes['MD5'][:8] + '...',
+        'status': batch_status(ext, size, ftype, carved is not None and carved['suspicious']),
+        'modified': modified, 'detected': ftype.description if ftype else 'Unknown',
+    }
+    if carved is not None:
+        entry['overlay'] = carved['overlay']
+        entry['embedded'] = len(carved['embedded'])
+    if profiled is not None:
+        entry['max_entropy'] = profiled['max']
+        entry['max_entropy_offset'] = profiled['max_offset']
+        entry['high_entropy_windows'] = profiled['high_windows']
+    if found is not None:
+        entry['strings'] = found['strings']
+        entry['strings_truncated'] = found['truncated']
+    if fingerprints:
+        entry.update(fingerprints)
+    if members is not None:
+        entry['members'] = members
+    return entry
+
+
+def _batch_stages(carve, entropy, archive_depth, strings, perceptual):
+    """{cache kind: compute(path, data, ftype)} for the optional batch stages."""
+    stages = {}
+    if carve:
+        stages['carve1'] = _carve_file
+    if entropy:
+        stages['entropy1'] = lambda path, data, ftype: _entropy_summary(path, data)
+    if strings:
+        stages['strings1'] = lambda path, data, ftype: _batch_strings(path, data)
+    if perceptual:
+        stages['phash2'] = _batch_perceptual
+    if archive_depth:
+        stages[f'members2-{archive_depth}'] = lambda path, data, ftype: (
+            _archive_rows(data, ftype, archive_depth) if _lazy('archives').container_kind(ftype) else [])
+    return stages
+
+
+def _ftype_record(ftype):
+    # JSON-friendly detection result; [] for unrecognised content
+    return list(ftype) if ftype is not None else []
+
+
+def _ftype_from_record(record):
+    if not record:
+        return None
+    ext, description, category, extensions = record
+    return filetype.FileType(ext, description, category, tuple(extensions) if extensions else extensions)
+
+
+def archive_members(path, data, ftype, depth=1):
+    """Batch rows for the members of the container `path` (content `data`).
+
+    Members are streamed from memory; nothing is extracted to disk. A
+    container that cannot be opened gets no rows.
+    """
+    return _place_members(_archive_rows(data, ftype, depth), path)
+
+
+def _archive_rows(data, ftype, depth):
+    """Member rows whose 'file' is relative to the container ("docs/a.docx!/word/x.xml")."""
+    archives = _lazy('archives')
+    try:
+        records = archives.list_members(_BufferReader(data), archives.container_kind(ftype), '', depth)
+    except archives.ERRORS:
+        return []
+    rows = [_member_entry(record) for record in records]
+    _relocate(rows, len(archives.SEPARATOR))
+    return rows
+
+
+def _relocate(rows, strip):
+    for row in rows:
+        row['file'] = row['file'][strip:]
+        _relocate(row.get('members', ()), strip)
+
+
+def _place_members(rows, path):
+    """Copies of relative member rows with 'file' under the container `path`."""
+    separator = _lazy('archives').SEPARATOR
+    placed = []
+    for row in rows:
+        row = dict(row, file=path + separator + row['file'])
+        if 'members' in row:
+            row['members'] = _place_members(row['members'], path)
+        placed.append(row)
+    return placed
+
+
+def _member_entry(record):
+    ftype = record.get('ftype')
+    ext = os.path.splitext(record['name'])[1].lower()
+    entry = {
+        'file': record['path'], 'type': content_ext(record['name'], ftype), 'size': record['size'],
+        'md5': record['hashes']['MD5'][:8] + '...' if 'hashes' in record else '',
+        'status': batch_status(ext, record['size'], ftype) if 'hashes' in record else "⚠️ Unreadable",
+        'modified': record['modified'], 'detected': ftype.description if ftype else 'Unknown',
+    }
+    if 'error' in record:
+        entry['error'] = record['error']
+    if 'members' in record:
+        entry['members'] = [_member_entry(m) for m in record['members']]
+    return entry
+
+
+def format_batch_report(results, folder):
+    report = "Batch Analysis Report\n"
+    report += "="*50 + "\n"
+    report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+    report += f"Folder: {folder}\n"
+    report += f"Files analyzed: {len(results)}\n\n"
+    clean = sum(1 for r in results if r['status'] == '✅ Clean')
+    suspicious = len(results) - clean
+    report += f"Clean files: {clean}\n"
+    report += f"Suspicious files: {suspicious}\n"
+    profiled = [r for r in results if 'max_entropy' in r]
+    if profiled:
+        high = sum(1 for r in profiled if r['high_entropy_windows'])
+        report += f"High-entropy files: {high} of {len(profiled)} profiled\n"
+    members = [m for r in results for m in _walk_members(r.get('members', ()))]
+    if members:
+        flagged = sum(1 for m in members if m['status'] != '✅ Clean')
+        report += f"Archive members: {len(members)} ({flagged} flagged)\n"
+    pairs = near_duplicates(results)
+    if pairs:
+        report += f"Near-duplicate image pairs: {len(pairs)} (pHash within {_lazy('perceptual_hash').NEAR_DISTANCE} bits)\n"
+        for distance, a, b in pairs:
+            # Same picture, different bytes: a re-encoded or modified (e.g. LSB) copy
+            kind = "identical content" if a['md5'] == b['md5'] else "content differs"
+            report += f"  {a['file']} ≈ {b['file']} - distance {distance} - {kind}\n"
+    report += "\n"
+    report += "Details:\n"
+    for r in results:
+        report += _report_line(r)
+    return report
+
+
+def _walk_members(entries):
+    for entry in entries:
+        yield entry
+        yield from _walk_members(entry.get('members', ()))
+
+
+def _report_line(r, depth=0):
+    indent = "  " * (depth + 1) + ("↳ " if depth else "")
+    line = f"{indent}{r['file']} - {r['type']} - {r['size']} bytes - {r['md5']} - {r['status']}"
+    if r.get('overlay') or r.get('embedded'):
+        line += f" - {r['overlay']} overlay bytes, {r['embedded']} embedded signatures"
+    if 'max_entropy' in r:
+        line += f" - max entropy {r['max_entropy']:.2f} bits/byte at 0x{r['max_entropy_offset']:X}"
+    if 'error' in r:
+        line += f" - {r['error']}"
+    line += "\n"
+    for offset, encoding, text in r.get('strings', ()):
+        line += f"{indent}    0x{offset:08X} {encoding:<8} {text}\n"
+    if r.get('strings_truncated'):
+        line += f"{indent}    … more strings not shown\n"
+    for member in r.get('members', ()):
+        line += _report_line(member, depth + 1)
+    return line
+
+
+# ---------- HEX VIEWER ----------
+def generate_hex_dump(path, bytes_per_line=16, limit=HEX_DUMP_LIMIT):
+    """Short hex dump for display; use hexview.write_hex_dump for whole files."""
+    with open(path, 'rb') as f:
+        # Lines are emitted until the offset passes `limit`
+        lines_wanted = limit // bytes_per_line + 1
+        data = f.read(lines_wanted * bytes_per_line)
+        truncated = bool(f.read(1))
+    lines = hexview.format_hex_lines(data, 0, bytes_per_line)
+    if truncated:
+        lines.append('... (file truncated)')
+    return '\n'.join(lines)
@@ -0,0 +1,299 @@
+import unittest
+import os
+import sys
+import shutil
+import hashlib
+import subprocess
+from unittest.mock import patch
+from PIL import Image, ExifTags
+import forensics_core as core
+
+
+class TestForensicsCore(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary environment and dummy files."""
+        cls.test_dir = "test_env_core"
+        os.makedirs(cls.test_dir, exist_ok=True)
+
+        cls.img_path = os.path.join(cls.test_dir, "test.png")
+        Image.new('RGB', (100, 100), color='red').save(cls.img_path)
+
+        cls.txt_path = os.path.join(cls.test_dir, "data.txt")
+        cls.file_content = b"ForensicData2026\n"
+        with open(cls.txt_path, "wb") as f:
+            f.write(cls.file_content)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_import_is_lightweight(self):
+        """Importing the core must not pull in Tk or any format parser."""
+        code = ("import sys, forensics_core; "
+                "heavy = {'tkinter', 'PIL', 'numpy', 'PyPDF2', 'docx', 'openpyxl', 'exifread'}; "
+                "print(sorted(heavy & set(sys.modules)))")
+        out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(core.__file__)))
+        self.assertEqual(out.stdout.strip(), '[]')
+
+    def test_hashing_logic(self):
+        hashes = core.compute_hashes(self.txt_path)
+        self.assertEqual(hashes['MD5'], hashlib.md5(self.file_content).hexdigest())
+        self.assertEqual(hashes['SHA-256'], hashlib.sha256(self.file_content).hexdigest())
+
+    def test_steganography_cycle(self):
+        new_img, stats = core.encode_message(self.img_path, "Classified_Info")
+        save_path = os.path.join(self.test_dir, "stego_output.png")
+        new_img.save(save_path, 'PNG')
+        self.assertEqual(core.decode_message(save_path), "Classified_Info")
+        streamed_path = os.path.join(self.test_dir, "stego_streamed.png")
+        core.encode_message_to_file(self.img_path, "Classified_Info", streamed_path)
+        self.assertEqual(core.decode_message(streamed_path), "Classified_Info")
+
+    def test_metadata_extraction(self):
+        meta = core.extract_all_metadata(self.img_path)
+        self.assertEqual(meta['Image Properties']['Width'], 100)
+        self.assertEqual(meta['Image Properties']['Height'], 100)
+        self.assertIn('SHA-1', meta['Hashes'])
+
+    def test_metadata_single_open(self):
+        exif = Image.Exif()
+        exif[ExifTags.Base.Make] = "TestCam"
+        exif.get_ifd(ExifTags.IFD.Exif)[ExifTags.Base.ExposureTime] = 0.01
+        exif.get_ifd(ExifTags.IFD.GPSInfo)[ExifTags.GPS.GPSLatitudeRef] = "N"
+        jpg_path = os.path.join(self.test_dir, "gps.jpg")
+        Image.new('RGB', (32, 16), color='blue').save(jpg_path, exif=exif)
+
+        real_open = open
+        opened = []
+
+        def counting_open(file, *args, **kwargs):
+            opened.append(file)
+            return real_open(file, *args, **kwargs)
+
+        with patch('builtins.open', counting_open):
+            meta = core.extract_all_metadata(jpg_path)
+        self.assertEqual(opened.count(jpg_path), 1)
+        with open(jpg_path, 'rb') as f:
+            self.assertEqual(meta['Hashes']['SHA-256'], hashlib.sha256(f.read()).hexdigest())
+        self.assertEqual(meta['Image Properties']['Width'], 32)
+        self.assertEqual(meta['EXIF']['Make'], "TestCam")
+        self.assertIn('ExposureTime', meta['EXIF'])
+        self.assertEqual(meta['GPS'], {'GPS GPSLatitudeRef': 'N'})
+
+    def test_pdf_metadata_fast_path_and_fallback(self):
+        from PyPDF2 import PdfWriter
+        plain, locked = (os.path.join(self.test_dir, name) for name in ("plain.pdf", "locked.pdf"))
+        for path, password in ((plain, None), (locked, "secret")):
+            writer = PdfWriter()
+            for _ in range(3):
+                writer.add_blank_page(100, 100)
+            writer.add_metadata({'/Author': 'Examiner'})
+            if password:
+                writer.encrypt(password)
+            with open(path, 'wb') as f:
+                writer.write(f)
+        meta = core.extract_pdf_metadata(plain)
+        self.assertEqual(meta['PDF Metadata']['/Author'], 'Examiner')
+        self.assertEqual(meta['PDF Info']['Number of Pages'], 3)
+        self.assertEqual(meta['PDF Info']['Revisions'], 1)
+        # Encrypted files still report their structure
+        locked_info = core.extract_pdf_metadata(locked)['PDF Info']
+        self.assertEqual((locked_info['Encrypted'], locked_info['Number of Pages']), (True, 3))
+
+    def test_image_header_and_thumbnail(self):
+        info = core.image_header(self.img_path)
+        self.assertEqual((info['format'], info['width'], info['height']), ('PNG', 100, 100))
+        self.assertEqual(info['capacity'], (100 * 100 * 3 - 32) // 8)
+        thumb = core.preview_thumbnail(self.img_path, (40, 40))
+        self.assertEqual(thumb.size, (40, 40))
+        self.assertIs(core.preview_thumbnail(self.img_path, (40, 40)), thumb)
+
+    def test_analysis_report(self):
+        result = core.analyze_image(self.img_path)
+        self.assertEqual(result['total_values'], 100 * 100 * 3)
+        self.assertIn("LSB distribution not uniform (potential stego)", result['suspicious'])
+        self.assertEqual(set(result['embedding_rates']), {'Red', 'Green', 'Blue'})
+        self.assertEqual(len(result['heatmap']), 100 // result['heatmap_tile'])
+        self.assertEqual(core.heatmap_overlay(self.img_path, result['heatmap'], result['heatmap_tile']).size,
+                         (100, 100))
+        self.assertIn("STEGANOGRAPHY ANALYSIS REPORT", core.format_analysis_report(result))
+
+    def test_every_detected_type_has_an_icon(self):
+        detected = [core.filetype.FileType(ext, description, category, extensions)
+                    for ext, description, category, extensions, _ in core.filetype.SIGNATURES]
+        detected += [refined for _, refined in core.filetype._ZIP_MARKERS] + [core.filetype._PE_DLL]
+        for ftype in detected:
+            self.assertNotEqual(core.file_type_icon(ftype.ext, ftype), '📁', ftype.ext)
+        self.assertEqual(core.file_type_icon('.xyz', None), '📁')
+        with open(os.path.join(self.test_dir, "tool.elf"), 'wb') as f:
+            f.write(b'\x7fELF' + bytes(60))
+        self.assertEqual(core.file_type_label(f.name), "⚙️ ELF")
+
+    def test_batch_entry(self):
+        entry = core.batch_entry(self.txt_path)
+        self.assertEqual(entry['type'], '.txt')
+        self.assertEqual(entry['status'], "✅ Clean")
+
+    def test_content_detection_drives_dispatch_and_status(self):
+        disguised = os.path.join(self.test_dir, "holiday.png")
+        Image.new('RGB', (20, 10)).save(disguised, 'JPEG')
+        meta = core.extract_all_metadata(disguised)
+        self.assertEqual(meta['Image Properties']['Format'], 'JPEG')
+        self.assertIn('Extension Mismatch', meta['Basic Info'])
+        entry = core.batch_entry(disguised)
+        self.assertEqual((entry['type'], entry['status']), ('.jpg', "⚠️ Mismatch"))
+        self.assertIn("(as .png)", core.file_type_label(disguised))
+
+        renamed_pe = os.path.join(self.test_dir, "invoice.txt")
+        with open(renamed_pe, 'wb') as f:
+            f.write(b'MZ' + bytes(200))
+        self.assertEqual(core.batch_entry(renamed_pe)['status'], "🔴 Executable")
+        self.assertIn(self.txt_path, core.list_folder(self.test_dir))
+
+    def test_carving_flags_appended_data(self):
+        stuffed = os.path.join(self.test_dir, "stuffed.png")
+        with open(self.img_path, 'rb') as f, open(stuffed, 'wb') as out:
+            image = f.read()
+            out.write(image + b'PK\x03\x04\x14\x00\x00\x00\x08\x00' + bytes(40))
+        result = core.carve_file(stuffed)
+        self.assertEqual((result['logical_end'], result['overlay']), (len(image), 50))
+        self.assertEqual(result['embedded'][0]['ext'], '.zip')
+        self.assertIn("Hidden data likely", core.format_carve_report(result))
+        self.assertFalse(core.carve_file(self.img_path)['suspicious'])
+        entry = core.batch_entry(stuffed, carve=True)
+        self.assertEqual((entry['status'], entry['overlay'], entry['embedded']), ("🟣 Hidden Data", 50, 1))
+        self.assertEqual(core.batch_entry(self.img_path, carve=True)['status'], "✅ Clean")
+
+    def test_entropy_profile_and_batch_summary(self):
+        packed = os.path.join(self.test_dir, "packed.bin")
+        with open(packed, 'wb') as f:
+            f.write(bytes(8192) + os.urandom(8192))
+        profile = core.entropy_profile(packed)
+        self.assertEqual(len(profile), 4)
+        self.assertEqual(float(profile[0]), 0.0)
+        entry = core.batch_entry(packed, entropy=True)
+        self.assertGreater(entry['max_entropy'], 7.5)
+        self.assertEqual((entry['max_entropy_offset'] >= 8192, entry['high_entropy_windows']), (True, 2))
+        self.assertIn("High-entropy files: 1 of 1", core.format_batch_report([entry], self.test_dir))
+
+    def test_strings_in_hex_view_and_batch(self):
+        first = list(core.iter_strings(self.txt_path))[0]
+        self.assertEqual(first[:2], (0, 'ascii'))
+        self.assertTrue(self.file_content.decode('ascii').startswith(first[2]))
+        entry = core.batch_entry(self.txt_path, strings=True)
+        self.assertEqual(entry['strings'][0], list(first))
+        self.assertFalse(entry['strings_truncated'])
+        self.assertNotIn('strings', core.batch_entry(self.txt_path))
+        self.assertIn("    0x00000000 ascii    " + first[2], core.format_batch_report([entry], self.test_dir))
+
+    def test_near_duplicate_images_in_batch(self):
+        import perceptual_hash
+        stego_copy = os.path.join(self.test_dir, "stego_copy.png")
+        core.encode_message_to_file(self.img_path, "hidden", stego_copy)
+        entries = [core.batch_entry(path, perceptual=True) for path in (self.img_path, stego_copy, self.txt_path)]
+        self.assertEqual(entries[0]['phash'], core.perceptual_hashes(self.img_path)['phash'])
+        self.assertNotIn('phash', entries[2])
+        self.assertNotIn('phash', core.batch_entry(self.img_path))
+        (distance, a, b), = core.near_duplicates(entries)
+        self.assertEqual((distance, a['file'], b['file']), (0, self.img_path, stego_copy))
+        report = core.format_batch_report(entries, self.test_dir)
+        self.assertIn(f"Near-duplicate image pairs: 1 (pHash within {perceptual_hash.NEAR_DISTANCE} bits)", report)
+        self.assertIn(f"{self.img_path} ≈ {stego_copy} - distance 0 - content differs", report)
+
+    def test_archive_members_as_child_rows(self):
+        import zipfile
+        case = os.path.join(self.test_dir, "case.zip")
+        with zipfile.ZipFile(case, 'w') as zf:
+            zf.write(self.txt_path, "notes/data.txt")
+            zf.writestr("invoice.pdf", b"MZ" + bytes(100))
+        before = sorted(os.listdir(self.test_dir))
+        entry = core.batch_entry(case, archive_depth=1)
+        self.assertEqual(sorted(os.listdir(self.test_dir)), before)
+        data, invoice = entry['members']
+        self.assertEqual(data['file'], case + "!/notes/data.txt")
+        self.assertEqual(data['md5'], hashlib.md5(self.file_content).hexdigest()[:8] + '...')
+        self.assertEqual((invoice['type'], invoice['status']), ('.exe', "🔴 Executable"))
+        self.assertNotIn('members', core.batch_entry(case))
+        report = core.format_batch_report([entry], self.test_dir)
+        self.assertIn("Archive members: 2 (1 flagged)", report)
+        self.assertIn("    ↳ " + case + "!/invoice.pdf", report)
+
+    def test_truncated_archives_keep_their_members(self):
+        import io
+        import tarfile
+        import zipfile
+        buf = io.BytesIO()
+        with tarfile.open(fileobj=buf, mode='w') as tf:
+            for i in range(6):
+                info = tarfile.TarInfo(f"part{i}.bin")
+                info.size = 5000
+                tf.addfile(info, io.BytesIO(bytes([i]) * 5000))
+        tar_path = os.path.join(self.test_dir, "cut.tar")
+        with open(tar_path, 'wb') as f:
+            f.write(buf.getvalue()[:len(buf.getvalue()) // 2])
+        members = core.batch_entry(tar_path, archive_depth=1)['members']
+        self.assertEqual([m['file'] for m in members[:3]],
+                         [tar_path + f"!/part{i}.bin" for i in range(3)])
+        self.assertEqual([m['status'] for m in members[3:]], ["⚠️ Unreadable"])
+
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+            for i in range(6):
+                zf.writestr(f"part{i}.txt", f"part {i} " * 1000)
+        zip_path = os.path.join(self.test_dir, "cut.zip")
+        with open(zip_path, 'wb') as f:
+            f.write(buf.getvalue()[:len(buf.getvalue()) // 2])
+        members = core.batch_entry(zip_path, archive_depth=1)['members']
+        self.assertEqual(len(members), 1)
+        self.assertIn("damaged container", members[0]['error'])
+
+    def test_docx_with_large_first_member(self):
+        import zipfile
+        docx = os.path.join(self.test_dir, "thumbnail_first.docx")
+        with zipfile.ZipFile(docx, 'w') as zf:
+            zf.writestr("docProps/thumbnail.jpeg", os.urandom(2 * 4096))
+            zf.writestr("docProps/core.xml",
+                        '<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/'
+                        'core-properties" xmlns:dc="http://purl.org/dc/elements/1.1/">'
+                        '<dc:creator>Alice</dc:creator></cp:coreProperties>')
+            zf.writestr("word/document.xml", "<w:document/>")
+        self.assertEqual(core.sniff(docx).ext, '.zip')
+        self.assertEqual(core.content_ext(docx, core.sniff(docx)), '.docx')
+        self.assertEqual(core.extract_format_metadata(docx)['DOCX Properties']['Author'], 'Alice')
+        self.assertEqual(core.batch_entry(docx)['status'], "✅ Clean")
+
+    def test_cached_archive_members_follow_the_copy(self):
+        import io
+        import zipfile
+        import result_cache
+        nested = io.BytesIO()
+        with zipfile.ZipFile(nested, 'w') as zf:
+            zf.writestr("y.txt", b"inner")
+        first = os.path.join(self.test_dir, "first.zip")
+        with zipfile.ZipFile(first, 'w') as zf:
+            zf.write(self.txt_path, "x.txt")
+            zf.writestr("inner.zip", nested.getvalue())
+        second = os.path.join(self.test_dir, "second.zip")
+        shutil.copyfile(first, second)
+        cache = result_cache.ResultCache(':memory:')
+        try:
+            for path in (first, second):
+                for run in range(2):
+                    entry = core.batch_entry(path, cache=cache, archive_depth=2)
+                    x, inner = entry['members']
+                    self.assertEqual((x['file'], inner['file']), (path + "!/x.txt", path + "!/inner.zip"))
+                    self.assertEqual(inner['members'][0]['file'], path + "!/inner.zip!/y.txt")
+        finally:
+            cache.close()
+
+    def test_hex_dump(self):
+        dump = core.generate_hex_dump(self.txt_path)
+        self.assertTrue(dump.startswith("00000000: 46 6F 72"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+"""Multi-digest file hashing.
+
+Each requested digest runs on its own thread. hashlib and zlib release the
+GIL on large buffers, so MD5, SHA-1 and SHA-256 over the same data overlap
+instead of adding up. Large files are memory-mapped and every digest thread
+walks the mapping independently; smaller files are read in large blocks and
+fanned out to the digest threads.
+"""
+import os
+import mmap
+import time
+import zlib
+import queue
+import hashlib
+import threading
+
+
+DEFAULT_ALGORITHMS = ('MD5', 'SHA-1', 'SHA-256')
+DEFAULT_BLOCKSIZE = 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Below this size thread hand-off costs more than it saves
+THREAD_THRESHOLD = 4 * 1024 * 1024
+
+
+class _CRC32:
+    """hashlib-style wrapper around zlib.crc32."""
+    def __init__(self):
+        self.value = 0
+
+    def update(self, data):
+        self.value = zlib.crc32(data, self.value)
+
+    def hexdigest(self):
+        return f'{self.value & 0xFFFFFFFF:08x}'
+
+
+ALGORITHMS = {
+    'MD5': hashlib.md5,
+    'SHA-1': hashlib.sha1,
+    'SHA-256': hashlib.sha256,
+    'SHA-512': hashlib.sha512,
+    'SHA3-256': hashlib.sha3_256,
+    'BLAKE2b': hashlib.blake2b,
+    'BLAKE2s': hashlib.blake2s,
+    'CRC32': _CRC32,
+}
+
+
+def new_hashers(algorithms):
+    unknown = [a for a in algorithms if a not in ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unsupported hash algorithm(s): {', '.join(unknown)}")
+    return {name: ALGORITHMS[name]() for name in algorithms}
+
+
+def _hash_serial(f, hashers, blocksize):
+    while chunk := f.read(blocksize):
+        for h in hashers.values():
+            h.update(chunk)
+
+
+def _start_threads(target, args_list, errors, stop):
+    """Start one thread per args tuple; an exception is appended to `errors` and sets `stop`."""
+    def guarded(*args):
+        try:
+            target(*args)
+        except BaseException as e:
+            errors.append(e)
+            stop.set()
+
+    threads = [threading.Thread(target=guarded, args=args) for args in args_list]
+    for t in threads:
+        t.start()
+    return threads
+
+
+def _hash_mapped(mm, hashers, blocksize, threaded):
+    """Hash a memory map or buffer; with threads, each digest walks all of it."""
+    view = memoryview(mm)
+    try:
+        if not threaded:
+            for start in range(0, len(view), blocksize):
+                with view[start:start + blocksize] as block:
+                    for h in hashers.values():
+                        h.update(block)
+            return
+
+        def run(h):
+            for start in range(0, len(view), blocksize):
+                if stop.is_set():
+                    return
+                with view[start:start + blocksize] as block:
+                    h.update(block)
+
+        errors, stop = [], threading.Event()
+        threads = _start_threads(run, [(h,) for h in hashers.values()], errors, stop)
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+    finally:
+        view.release()
+
+
+def _hash_fanout(f, hashers, blocksize):
+    """Read blocks once and hand each block to one thread per digest."""
+    queues = [queue.Queue(maxsize=8) for _ in hashers]
+
+    def run(h, q):
+        try:
+            while (chunk := q.get()) is not None:
+                h.update(chunk)
+        except BaseException:
+            # Stop the reader, and keep draining so it never blocks on a full queue
+            stop.set()
+            while q.get() is not None:
+                pass
+            raise
+
+    errors, stop = [], threading.Event()
+    threads = _start_threads(run, list(zip(hashers.values(), queues)), errors, stop)
+    try:
+        while not stop.is_set() and (chunk := f.read(blocksize)):
+            for q in queues:
+                q.put(chunk)
+    finally:
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+
+
+def hash_file_with_stats(path, algorithms=DEFAULT_ALGORITHMS, blocksize=DEFAULT_BLOCKSIZE,
+                         use_mmap=None, threaded=None):
+    """Hash `path` with every algorithm in `algorithms`.
+
+    `use_mmap` and `threaded` default to automatic choices based on file
+    size. Returns (digests, stats) where stats holds bytes, seconds and MB/s.
+    """
+    hashers = new_hashers(algorithms)
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap is None:
+            use_mmap = size >= MMAP_THRESHOLD
+        if threaded is None:
+            threaded = size >= THREAD_THRESHOLD
+        threaded = threaded and len(hashers) > 1
+
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                _hash_mapped(mm, hashers, blocksize, threaded)
+        elif threaded:
+            _hash_fanout(f, hashers, blocksize)
+        else:
+            _hash_serial(f, hashers, blocksize)
+    elapsed = time.perf_counter() - start
+
+    digests = {name: h.hexdigest() for name, h in hashers.items()}
+    stats = {
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf'),
+    }
+    return digests, stats
+
+
+def hash_buffer(buffer, algorithms=DEFAULT_ALGORITHMS, blocksize=DEFAULT_BLOCKSIZE, threaded=None):
+    """Return {algorithm: hexdigest} for an in-memory or memory-mapped buffer.
+
+    Lets callers that already hold a file's bytes hash them without
+    reading the file again.
+    """
+    hashers = new_hashers(algorithms)
+    if threaded is None:
+        threaded = len(buffer) >= THREAD_THRESHOLD
+    _hash_mapped(buffer, hashers, blocksize, threaded and len(hashers) > 1)
+    return {name: h.hexdigest() for name, h in hashers.items()}
+
+
+def hash_file(path, algorithms=DEFAULT_ALGORITHMS, blocksize=DEFAULT_BLOCKSIZE,
+              use_mmap=None, threaded=None):
+    """Return {algorithm: hexdigest} for `path`."""
+    return hash_file_with_stats(path, algorithms, blocksize, use_mmap, threaded)[0]
@@ -0,0 +1,106 @@
+import unittest
+import os
+import shutil
+import zlib
+import hashlib
+import io
+from unittest.mock import patch
+import hashing
+
+
+class _Broken:
+    """A digest whose update fails after the first block."""
+    def __init__(self):
+        self.blocks = 0
+
+    def update(self, data):
+        self.blocks += 1
+        if self.blocks > 1:
+            raise OSError("read failed")
+
+    def hexdigest(self):
+        return 'broken'
+
+
+class TestHashing(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_hashing"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        cls.data = os.urandom(3 * 1024 * 1024 + 123)
+        cls.path = os.path.join(cls.test_dir, "blob.bin")
+        with open(cls.path, "wb") as f:
+            f.write(cls.data)
+        cls.empty = os.path.join(cls.test_dir, "empty.bin")
+        open(cls.empty, "wb").close()
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def expected(self, data):
+        return {
+            'MD5': hashlib.md5(data).hexdigest(),
+            'SHA-1': hashlib.sha1(data).hexdigest(),
+            'SHA-256': hashlib.sha256(data).hexdigest(),
+            'BLAKE2b': hashlib.blake2b(data).hexdigest(),
+            'CRC32': f'{zlib.crc32(data):08x}',
+        }
+
+    def test_all_strategies_agree(self):
+        algorithms = ('MD5', 'SHA-1', 'SHA-256', 'BLAKE2b', 'CRC32')
+        expected = self.expected(self.data)
+        for use_mmap in (False, True):
+            for threaded in (False, True):
+                digests = hashing.hash_file(self.path, algorithms, blocksize=256 * 1024,
+                                            use_mmap=use_mmap, threaded=threaded)
+                self.assertEqual(digests, expected, (use_mmap, threaded))
+
+    def test_empty_file(self):
+        digests = hashing.hash_file(self.empty, ('MD5', 'CRC32'), use_mmap=True, threaded=True)
+        self.assertEqual(digests, {'MD5': hashlib.md5(b'').hexdigest(), 'CRC32': '00000000'})
+
+    def test_hash_buffer(self):
+        algorithms = ('MD5', 'SHA-256', 'CRC32')
+        expected = {k: v for k, v in self.expected(self.data).items() if k in algorithms}
+        for threaded in (False, True):
+            self.assertEqual(hashing.hash_buffer(self.data, algorithms, threaded=threaded), expected)
+        self.assertEqual(hashing.hash_buffer(b'', ('MD5',)), {'MD5': hashlib.md5(b'').hexdigest()})
+
+    def test_stats(self):
+        digests, stats = hashing.hash_file_with_stats(self.path, ('SHA-256',))
+        self.assertEqual(stats['bytes'], len(self.data))
+        self.assertGreater(stats['mb_per_sec'], 0)
+
+    def test_digest_thread_errors_reach_the_caller(self):
+        with patch.dict(hashing.ALGORITHMS, {'BROKEN': _Broken}):
+            for use_mmap in (True, False):
+                with self.assertRaises(OSError):
+                    hashing.hash_file(self.path, ('MD5', 'BROKEN'), blocksize=4096,
+                                      use_mmap=use_mmap, threaded=True)
+            with self.assertRaises(OSError):
+                hashing.hash_buffer(self.data, ('BROKEN', 'SHA-1'), blocksize=4096, threaded=True)
+
+    def test_failed_digest_stops_the_reader(self):
+        reads = []
+
+        class Counted(io.BytesIO):
+            def read(self, size=-1):
+                reads.append(size)
+                return super().read(size)
+
+        with patch.dict(hashing.ALGORITHMS, {'BROKEN': _Broken}):
+            with self.assertRaises(OSError):
+                hashing._hash_fanout(Counted(self.data), hashing.new_hashers(('MD5', 'BROKEN')), 1024)
+        # 3 MiB in 1 KiB blocks; the reader quits within a queue's worth of the failure
+        self.assertLess(len(reads), 100)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            hashing.hash_file(self.path, ('MD4-ish',))
+
+
+if __name__ == '__main__':
+    unittest.main()
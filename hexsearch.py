@@ -0,0 +1,126 @@
+"""Search a memory-mapped file for byte patterns, text and regular expressions.
+
+The file is scanned in large chunks. Literal patterns are found with
+mmap.find directly on the mapping (no copies); regular expressions run on
+the mapping too, each chunk extended by an overlap so that matches which
+cross a chunk boundary are still found. Between chunks the search checks
+for cancellation and reports progress.
+"""
+import os
+import re
+import mmap
+from collections import namedtuple
+
+
+CHUNK_BYTES = 64 * 1024 * 1024
+# Regex matches longer than this may be cut short at a chunk boundary
+MAX_MATCH = 4096
+MAX_HITS = 10000
+MODES = ('hex', 'ascii', 'utf16', 'regex')
+
+# `needle` is a literal (lower-cased when `fold`), otherwise `regex` is set
+SearchPattern = namedtuple('SearchPattern', 'needle regex fold')
+
+
+def parse_pattern(text, mode='hex', ignore_case=False):
+    """Compile the user's search text into a SearchPattern.
+
+    `mode` is 'hex' (pairs of hex digits, spaces allowed, '??' matches any
+    byte), 'ascii' or 'utf16' (UTF-16LE) text, or 'regex' (a bytes regular
+    expression). `ignore_case` applies to ASCII letters in text and regex
+    modes. Raises ValueError for an empty or malformed pattern.
+    """
+    if not text:
+        raise ValueError("empty search pattern")
+    if mode == 'hex':
+        digits = ''.join(text.split())
+        if digits[:2].lower() == '0x':
+            digits = digits[2:]
+        if not digits or len(digits) % 2:
+            raise ValueError("hex pattern needs whole bytes (pairs of hex digits)")
+        pairs = [digits[i:i + 2] for i in range(0, len(digits), 2)]
+        try:
+            parts = [None if pair == '??' else bytes.fromhex(pair) for pair in pairs]
+        except ValueError:
+            raise ValueError(f"invalid hex pattern: {text}") from None
+        if None not in parts:
+            return SearchPattern(b''.join(parts), None, False)
+        regex = b''.join(b'.' if part is None else re.escape(part) for part in parts)
+        return SearchPattern(None, re.compile(regex, re.DOTALL), False)
+    if mode in ('ascii', 'utf16'):
+        needle = text.encode('utf-8' if mode == 'ascii' else 'utf-16-le')
+        return SearchPattern(needle.lower() if ignore_case else needle, None, ignore_case)
+    if mode == 'regex':
+        flags = re.DOTALL | (re.IGNORECASE if ignore_case else 0)
+        try:
+            return SearchPattern(None, re.compile(text.encode('utf-8'), flags), False)
+        except re.error as e:
+            raise ValueError(f"invalid regular expression: {e}") from None
+    raise ValueError(f"unknown search mode: {mode}")
+
+
+def search(buffer, pattern, start=0, max_hits=MAX_HITS, chunk_bytes=CHUNK_BYTES,
+           cancel=None, progress=None):
+    """Yield (offset, length) for each match of `pattern` in `buffer`.
+
+    `buffer` is bytes or an mmap. Matches are yielded in offset order and
+    do not overlap for regular expressions. `cancel` is an object with
+    is_set() (e.g. threading.Event) checked between chunks, and `progress`
+    is called with the fraction of the buffer searched after each chunk.
+    The search stops after `max_hits` matches.
+    """
+    size = len(buffer)
+    hits = 0
+    resume = start  # regex matches found in one chunk's overlap are not reported twice
+    for chunk_start in range(start, size, chunk_bytes):
+        if cancel is not None and cancel.is_set():
+            return
+        chunk_end = min(chunk_start + chunk_bytes, size)
+        for offset, length in _search_chunk(buffer, pattern, chunk_start, chunk_end, size):
+            if offset < resume:
+                continue
+            yield offset, length
+            hits += 1
+            if hits >= max_hits:
+                return
+            if pattern.regex is not None:
+                resume = offset + length
+        if progress is not None:
+            progress((chunk_end - start) / max(1, size - start))
+
+
+def _search_chunk(buffer, pattern, chunk_start, chunk_end, size):
+    """Matches starting in [chunk_start, chunk_end), reading past the end as needed."""
+    if pattern.regex is not None:
+        for match in pattern.regex.finditer(buffer, chunk_start, min(size, chunk_end + MAX_MATCH)):
+            if match.start() >= chunk_end:
+                break
+            if match.end() > match.start():
+                yield match.start(), match.end() - match.start()
+        return
+    needle = pattern.needle
+    stop = min(size, chunk_end + len(needle) - 1)
+    if pattern.fold:
+        haystack, base = buffer[chunk_start:stop].lower(), chunk_start
+        pos = haystack.find(needle)
+        while pos != -1:
+            yield base + pos, len(needle)
+            pos = haystack.find(needle, pos + 1)
+        return
+    pos = buffer.find(needle, chunk_start, stop)
+    while pos != -1:
+        yield pos, len(needle)
+        pos = buffer.find(needle, pos + 1, stop)
+
+
+def search_file(path, pattern, **kwargs):
+    """Yield (offset, length) matches of `pattern` in the file at `path`.
+
+    The file is mapped read-only for the duration of the search; keyword
+    arguments are passed to `search`.
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from search(mm, pattern, **kwargs)
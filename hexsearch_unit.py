@@ -0,0 +1,71 @@
+import unittest
+import os
+import shutil
+import threading
+import hexsearch
+
+
+class TestHexSearch(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_hexsearch"
+        os.makedirs(cls.test_dir, exist_ok=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def find(self, data, text, mode='hex', ignore_case=False, **kwargs):
+        return list(hexsearch.search(data, hexsearch.parse_pattern(text, mode, ignore_case), **kwargs))
+
+    def test_hex_patterns(self):
+        data = b'\x00MZ\x90\x00--MZ\x00\x00'
+        self.assertEqual(self.find(data, '4D 5A'), [(1, 2), (7, 2)])
+        self.assertEqual(self.find(data, '0x4d5a'), [(1, 2), (7, 2)])
+        self.assertEqual(self.find(data, '4D 5A ?? 00'), [(1, 4), (7, 4)])
+        for bad in ('4D5', 'ZZ', ''):
+            with self.assertRaises(ValueError):
+                hexsearch.parse_pattern(bad, 'hex')
+
+    def test_text_and_regex(self):
+        data = b'Password=1 PASSWORD=2 ' + 'Pass'.encode('utf-16-le')
+        self.assertEqual(self.find(data, 'Password', 'ascii'), [(0, 8)])
+        self.assertEqual(self.find(data, 'password', 'ascii', ignore_case=True), [(0, 8), (11, 8)])
+        self.assertEqual(self.find(data, 'Pass', 'utf16'), [(22, 8)])
+        self.assertEqual(self.find(data, r'=\d', 'regex'), [(8, 2), (19, 2)])
+        with self.assertRaises(ValueError):
+            hexsearch.parse_pattern('(unclosed', 'regex')
+
+    def test_matches_across_chunk_boundaries(self):
+        data = b'.' * 95 + b'SIGNATURE' + b'.' * 200 + b'aaaaaaaa' + b'.' * 10
+        for chunk_bytes in (7, 100, 4096):
+            self.assertEqual(self.find(data, 'SIGNATURE', 'ascii', chunk_bytes=chunk_bytes), [(95, 9)])
+            self.assertEqual(self.find(data, 'signature', 'ascii', True, chunk_bytes=chunk_bytes), [(95, 9)])
+            # A regex match found in one chunk's overlap is not reported again
+            self.assertEqual(self.find(data, 'a+', 'regex', chunk_bytes=chunk_bytes), [(304, 8)])
+
+    def test_limit_cancel_and_progress(self):
+        data = b'ab' * 100
+        self.assertEqual(len(self.find(data, 'ab', 'ascii', max_hits=5)), 5)
+        cancel = threading.Event()
+        cancel.set()
+        self.assertEqual(self.find(data, 'ab', 'ascii', cancel=cancel), [])
+        seen = []
+        self.find(data, 'ab', 'ascii', chunk_bytes=50, progress=seen.append)
+        self.assertEqual(seen, [0.25, 0.5, 0.75, 1.0])
+
+    def test_search_file(self):
+        path = os.path.join(self.test_dir, "disk.img")
+        with open(path, 'wb') as f:
+            f.write(bytes(5000) + b'PK\x03\x04' + bytes(100))
+        pattern = hexsearch.parse_pattern('504B0304')
+        self.assertEqual(list(hexsearch.search_file(path, pattern, chunk_bytes=1024)), [(5000, 4)])
+        empty = os.path.join(self.test_dir, "empty.img")
+        open(empty, 'wb').close()
+        self.assertEqual(list(hexsearch.search_file(empty, pattern)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,168 @@
+"""Memory-mapped, windowed hex rendering and full-file hex dump export."""
+import os
+import mmap
+import time
+
+
+# Printable ASCII (32..126) maps to itself, everything else to '.'
+ASCII_TABLE = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+
+
+def format_hex_lines(data, start_offset=0, bytes_per_line=16):
+    """Format `data` as `offset: hex  ascii` lines starting at `start_offset`."""
+    lines = []
+    width = bytes_per_line * 3
+    for pos in range(0, len(data), bytes_per_line):
+        chunk = data[pos:pos + bytes_per_line]
+        hex_str = chunk.hex(' ').upper()
+        ascii_str = chunk.translate(ASCII_TABLE).decode('ascii')
+        lines.append(f'{start_offset + pos:08X}: {hex_str:<{width}} {ascii_str}')
+    return lines
+
+
+class HexFile:
+    """Read-only memory map of a file that renders any window of lines on demand.
+
+    Only the bytes of the requested window are touched, so memory use and
+    render time do not depend on the file size.
+    """
+
+    def __init__(self, path, bytes_per_line=16):
+        self.path = path
+        self.bytes_per_line = bytes_per_line
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap cannot map an empty file
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    @property
+    def line_count(self):
+        return (self.size + self.bytes_per_line - 1) // self.bytes_per_line
+
+    def line_of(self, offset):
+        """Line index containing byte `offset` (clamped to the file)."""
+        offset = min(max(0, offset), max(0, self.size - 1))
+        return offset // self.bytes_per_line
+
+    def read(self, offset, length):
+        if self._map is None:
+            return b''
+        return self._map[offset:offset + length]
+
+    def render(self, first_line, line_count):
+        """Return the text for `line_count` lines starting at `first_line`."""
+        first_line = max(0, min(first_line, max(0, self.line_count - 1)))
+        offset = first_line * self.bytes_per_line
+        data = self.read(offset, line_count * self.bytes_per_line)
+        return '\n'.join(format_hex_lines(data, offset, self.bytes_per_line))
+
+
+# 'XX ' for every byte value, used to gather the hex column in one pass
+HEX_TRIPLES = bytes(ord(c) for b in range(256) for c in f'{b:02X} ')
+
+_tables = {}
+
+
+def _lookup_tables(np):
+    """Build (once) the lookup tables used by the bulk formatter."""
+    if not _tables:
+        digits = np.frombuffer(b'0123456789ABCDEF', dtype=np.uint8)
+        values = np.arange(65536)
+        # Four hex characters for every 16-bit value, packed as uint32
+        quads = np.stack([digits[(values >> shift) & 0xF] for shift in (12, 8, 4, 0)], axis=1)
+        _tables['quads'] = np.ascontiguousarray(quads, dtype=np.uint8).view(np.uint32).ravel()
+        _tables['triples'] = np.frombuffer(HEX_TRIPLES, dtype=np.uint8).reshape(256, 3)
+        _tables['ascii'] = np.frombuffer(ASCII_TABLE, dtype=np.uint8)
+    return _tables
+
+
+def _format_block(np, block, start_offset, bytes_per_line, offset_digits):
+    """Format whole lines of `block` at once with table lookups.
+
+    `block` must hold a multiple of `bytes_per_line` bytes. Returns the
+    encoded text (one line per row, each ending in a newline).
+    """
+    tables = _lookup_tables(np)
+    data = np.frombuffer(block, dtype=np.uint8).reshape(-1, bytes_per_line)
+    rows = data.shape[0]
+
+    hex_start = offset_digits + 2
+    hex_width = bytes_per_line * 3
+    ascii_start = hex_start + hex_width + 1
+    out = np.empty((rows, ascii_start + bytes_per_line + 1), dtype=np.uint8)
+
+    # Offsets: four hex digits per 16-bit group, then keep the rightmost digits
+    offsets = start_offset + np.arange(rows, dtype=np.uint64) * np.uint64(bytes_per_line)
+    groups = -(-offset_digits // 4)
+    digits = np.empty((rows, groups * 4), dtype=np.uint8)
+    for g in range(groups):
+        shift = np.uint64(16 * (groups - 1 - g))
+        quad = np.take(tables['quads'], (offsets >> shift) & np.uint64(0xFFFF))
+        digits[:, g * 4:g * 4 + 4] = quad.view(np.uint8).reshape(rows, 4)
+    out[:, :offset_digits] = digits[:, groups * 4 - offset_digits:]
+    out[:, offset_digits] = ord(':')
+    out[:, offset_digits + 1] = ord(' ')
+
+    # np.take is considerably faster than fancy indexing for table lookups
+    out[:, hex_start:hex_start + hex_width] = np.take(tables['triples'], data, axis=0).reshape(rows, hex_width)
+    out[:, hex_start + hex_width] = ord(' ')
+    out[:, ascii_start:ascii_start + bytes_per_line] = np.take(tables['ascii'], data)
+    out[:, -1] = ord('\n')
+    return out.tobytes()
+
+
+def write_hex_dump(path, out, bytes_per_line=16, block_lines=65536):
+    """Stream a complete `offset: hex  ascii` dump of `path` to `out`.
+
+    `out` is a file path or a binary file-like object (e.g. a pipe). The file
+    is processed in blocks of `block_lines` lines formatted in bulk, so
+    memory use is constant. Offsets use 8 hex digits, widened for files
+    past 4 GiB so every line keeps the same width. Returns a stats dict
+    with bytes, seconds and MB/s.
+    """
+    import numpy as np
+
+    start = time.perf_counter()
+    size = os.path.getsize(path)
+    offset_digits = max(8, len(f'{max(0, size - 1):X}'))
+    block_size = block_lines * bytes_per_line
+
+    own_output = isinstance(out, (str, os.PathLike))
+    dest = open(out, 'wb') if own_output else out
+    try:
+        with open(path, 'rb') as f:
+            offset = 0
+            while block := f.read(block_size):
+                full = len(block) - len(block) % bytes_per_line
+                if full:
+                    dest.write(_format_block(np, block[:full], offset, bytes_per_line, offset_digits))
+                if full < len(block):
+                    tail = block[full:]
+                    hex_str = tail.hex(' ').upper()
+                    ascii_str = tail.translate(ASCII_TABLE).decode('ascii')
+                    line = (f'{offset + full:0{offset_digits}X}: '
+                            f'{hex_str:<{bytes_per_line * 3}} {ascii_str}\n')
+                    dest.write(line.encode('ascii'))
+                offset += len(block)
+    finally:
+        if own_output:
+            dest.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'bytes': size,
+        'seconds': elapsed,
+        'mb_per_sec': size / (1024 * 1024) / elapsed if elapsed > 0 else float('inf'),
+    }
@@ -0,0 +1,65 @@
+import unittest
+import io
+import os
+import shutil
+import forensics_core as core
+import hexview
+
+
+class TestHexView(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_hex"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        cls.data = bytes(range(256)) * 40 + b"TRAILER!"
+        cls.path = os.path.join(cls.test_dir, "blob.bin")
+        with open(cls.path, "wb") as f:
+            f.write(cls.data)
+        cls.empty = os.path.join(cls.test_dir, "empty.bin")
+        open(cls.empty, "wb").close()
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_format_matches_classic_layout(self):
+        lines = hexview.format_hex_lines(b"HideU\x00\x01", 0x20)
+        self.assertEqual(lines, ["00000020: 48 69 64 65 55 00 01" + " " * 29 + "HideU.."])
+
+    def test_short_dump_truncates(self):
+        dump = core.generate_hex_dump(self.path).split('\n')
+        self.assertEqual(dump[-1], '... (file truncated)')
+        self.assertEqual(dump[:-1], hexview.format_hex_lines(self.data[:2064]))
+
+    def test_render_window_deep_in_file(self):
+        with hexview.HexFile(self.path) as hf:
+            self.assertEqual(hf.line_count, (len(self.data) + 15) // 16)
+            last = hf.render(hf.line_of(len(self.data) - 1), 5)
+        self.assertEqual(last.split('\n'), [f"{len(self.data) - 8:08X}: 54 52 41 49 4C 45 52 21"
+                                            + " " * 24 + "  TRAILER!"])
+
+    def test_full_dump_matches_line_formatter(self):
+        """Bulk export must be byte-identical to line-by-line formatting."""
+        for bytes_per_line in (16, 8, 32):
+            out = io.BytesIO()
+            stats = hexview.write_hex_dump(self.path, out, bytes_per_line, block_lines=7)
+            expected = ''.join(line + '\n' for line in
+                               hexview.format_hex_lines(self.data, 0, bytes_per_line))
+            self.assertEqual(out.getvalue().decode('ascii'), expected)
+            self.assertEqual(stats['bytes'], len(self.data))
+
+    def test_full_dump_to_path(self):
+        target = os.path.join(self.test_dir, "dump.txt")
+        hexview.write_hex_dump(self.empty, target)
+        self.assertEqual(os.path.getsize(target), 0)
+
+    def test_empty_file(self):
+        with hexview.HexFile(self.empty) as hf:
+            self.assertEqual(hf.line_count, 0)
+            self.assertEqual(hf.render(0, 10), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
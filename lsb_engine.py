@@ -0,0 +1,231 @@
+import os
+import struct
+import time
+from PIL import Image
+import numpy as np
+import png_stream
+
+
+# Every payload starts with a big-endian 32-bit length header
+HEADER_BITS = 32
+# Working memory allowed for one strip in the streaming functions
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Bytes of working memory per RGB byte of a strip (copies, PNG filter
+# candidates, zlib and Pillow buffers), measured on large images
+STRIP_WORK_FACTOR = 80
+
+
+def build_payload(message_bytes):
+    """Prefix the message with its 32-bit length header."""
+    return struct.pack('>I', len(message_bytes)) + message_bytes
+
+
+def payload_to_bits(payload):
+    """Unpack a byte payload into a uint8 array of 0/1 values (MSB first)."""
+    return np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+
+
+def capacity_bytes(shape):
+    """Maximum message size (excluding header) an RGB array of this shape can carry."""
+    values = int(np.prod(shape))
+    return max(0, (values - HEADER_BITS) // 8)
+
+
+def _rgb_array(img):
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    arr = np.asarray(img)
+    if arr.dtype != np.uint8:
+        arr = arr.astype(np.uint8)
+    return arr
+
+
+def load_rgb_array(path):
+    """Open an image and return it as an RGB uint8 array."""
+    return _rgb_array(Image.open(path))
+
+
+def image_size(path):
+    """(width, height) of the image at `path`, read from its header only."""
+    with Image.open(path) as img:
+        return img.size
+
+
+def strip_rows(width, budget=DEFAULT_MEMORY_BUDGET, multiple=1):
+    """Rows per strip so that one strip's working set fits in `budget` bytes.
+
+    The result is a multiple of `multiple`, and never less than it.
+    """
+    rows = budget // max(1, width * 3 * STRIP_WORK_FACTOR)
+    return max(multiple, rows - rows % multiple)
+
+
+def iter_rgb_strips(path, rows):
+    """Yield (first_row, RGB uint8 array) for consecutive strips of `path`.
+
+    Non-interlaced 8-bit PNGs are decoded strip by strip, so memory does not
+    grow with the image. Other formats are decoded whole by Pillow first
+    and then handed out in strips.
+    """
+    try:
+        reader = png_stream.PNGStripReader(path)
+    except ValueError:
+        reader = None
+    if reader is not None:
+        with reader:
+            if reader.streamable:
+                for top, img in reader.iter_strips(rows):
+                    yield top, _rgb_array(img)
+                return
+
+    with Image.open(path) as img:
+        for top in range(0, img.height, rows):
+            yield top, _rgb_array(img.crop((0, top, img.width, min(img.height, top + rows))))
+
+
+def embed_lsb(arr, payload):
+    """Return a copy of `arr` with `payload` written into the LSB plane.
+
+    Bits are written sequentially in flattened (row, column, channel) order,
+    matching the layout read back by the decoder.
+    """
+    bits = payload_to_bits(payload)
+    out = np.array(arr, dtype=np.uint8, copy=True)
+    flat = out.reshape(-1)
+
+    if bits.size > flat.size:
+        raise ValueError(f"Image too small. Need {bits.size} bits, have {flat.size}.")
+
+    _write_bits(flat, bits)
+    return out
+
+
+def _write_bits(flat, bits):
+    """Replace the LSBs of the first len(bits) values of `flat` in place."""
+    prefix = flat[:bits.size]
+    prefix &= 0xFE
+    prefix |= bits
+
+
+def _payload_bits(payload, start, count):
+    """Bits [start, start + count) of `payload`, unpacking only those bytes."""
+    first, last = start // 8, (start + count + 7) // 8
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8, count=last - first, offset=first))
+    return bits[start - first * 8:start - first * 8 + count]
+
+
+def embed_message(path, message_bytes):
+    """Embed `message_bytes` into the image at `path`.
+
+    Returns the encoded PIL image and a stats dict with the number of bytes
+    embedded, elapsed seconds and throughput in bytes per second.
+    """
+    start = time.perf_counter()
+    arr = load_rgb_array(path)
+    payload = build_payload(message_bytes)
+    new_arr = embed_lsb(arr, payload)
+    new_img = Image.fromarray(new_arr, 'RGB')
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        'bytes': len(payload),
+        'seconds': elapsed,
+        'bytes_per_sec': len(payload) / elapsed if elapsed > 0 else float('inf'),
+    }
+    return new_img, stats
+
+
+def embed_message_to_file(path, out_path, message_bytes, budget=DEFAULT_MEMORY_BUDGET):
+    """Embed `message_bytes` into the image at `path` and write a PNG to `out_path`.
+
+    The image is read, embedded and written one strip at a time, so peak
+    memory follows `budget` rather than the image size (for PNG input; other
+    formats are decoded whole first). Returns the same stats as
+    embed_message.
+    """
+    start = time.perf_counter()
+    width, height = image_size(path)
+    payload = build_payload(message_bytes)
+    total_bits = len(payload) * 8
+    if total_bits > width * height * 3:
+        raise ValueError(f"Image too small. Need {total_bits} bits, have {width * height * 3}.")
+
+    written = 0
+    try:
+        with png_stream.PNGStripWriter(out_path, width, height) as writer:
+            for _, strip in iter_rgb_strips(path, strip_rows(width, budget)):
+                if written < total_bits:
+                    strip = np.array(strip)
+                    flat = strip.reshape(-1)
+                    count = min(flat.size, total_bits - written)
+                    _write_bits(flat, _payload_bits(payload, written, count))
+                    written += count
+                writer.write(strip)
+    except Exception:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        raise
+    elapsed = time.perf_counter() - start
+
+    return {
+        'bytes': len(payload),
+        'seconds': elapsed,
+        'bytes_per_sec': len(payload) / elapsed if elapsed > 0 else float('inf'),
+    }
+
+
+def read_header(flat):
+    """Decode the 32-bit length header from the first LSBs of a flat array."""
+    if flat.size < HEADER_BITS:
+        raise ValueError("No valid message header found.")
+    header = np.packbits(flat[:HEADER_BITS] & 1).tobytes()
+    return struct.unpack('>I', header)[0]
+
+
+def extract_lsb(arr):
+    """Return the payload bytes hidden in the LSB plane of `arr`."""
+    flat = arr.reshape(-1)
+    length = read_header(flat)
+    capacity = max(0, (flat.size - HEADER_BITS) // 8)
+    if length <= 0 or length > capacity:
+        raise ValueError("No valid message header found.")
+    end = HEADER_BITS + length * 8
+    return np.packbits(flat[HEADER_BITS:end] & 1).tobytes()
+
+
+def extract_message(path, budget=DEFAULT_MEMORY_BUDGET):
+    """Read the hidden payload from the image at `path`.
+
+    Strips are read only until the header, and then the payload it
+    announces, are complete, so decode cost follows the message size
+    rather than the image size, and memory follows `budget`.
+    """
+    width, height = image_size(path)
+    if width == 0 or height == 0:
+        raise ValueError("No valid message header found.")
+    capacity = capacity_bytes((height, width, 3))
+
+    length = None
+    pending = np.zeros(0, dtype=np.uint8)
+    chunks = []
+    remaining = 0
+    for _, strip in iter_rgb_strips(path, strip_rows(width, budget)):
+        bits = np.concatenate([pending, strip.reshape(-1) & 1])
+        if length is None:
+            if bits.size < HEADER_BITS:
+                pending = bits
+                continue
+            length = read_header(bits)
+            if length <= 0 or length > capacity:
+                raise ValueError("No valid message header found.")
+            remaining = length * 8
+            bits = bits[HEADER_BITS:]
+
+        take = min(bits.size, remaining)
+        whole = take - take % 8
+        chunks.append(np.packbits(bits[:whole]).tobytes())
+        remaining -= whole
+        pending = bits[whole:take]
+        if remaining == 0:
+            return b''.join(chunks)
+    raise ValueError("No valid message header found.")
@@ -0,0 +1,127 @@
+import unittest
+import os
+import gc
+import warnings
+import shutil
+import numpy as np
+from PIL import Image
+import lsb_engine
+
+
+class TestLSBEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Create a temporary folder with a noisy cover image."""
+        cls.test_dir = "test_env_lsb"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        rng = np.random.default_rng(7)
+        cls.cover = rng.integers(0, 256, size=(40, 50, 3), dtype=np.uint8)
+        cls.img_path = os.path.join(cls.test_dir, "cover.png")
+        Image.fromarray(cls.cover, 'RGB').save(cls.img_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_embed_matches_reference_bits(self):
+        """Vectorized embedding must match the original bit-string layout."""
+        payload = lsb_engine.build_payload("Classified_Info".encode('utf-8'))
+        out = lsb_engine.embed_lsb(self.cover, payload)
+
+        bits = ''.join(format(b, '08b') for b in payload)
+        flat = self.cover.flatten()
+        for i, bit in enumerate(bits):
+            flat[i] = (flat[i] & 0xFE) | int(bit)
+
+        np.testing.assert_array_equal(out, flat.reshape(self.cover.shape))
+
+    def test_cover_is_not_modified(self):
+        before = self.cover.copy()
+        lsb_engine.embed_lsb(self.cover, b'\xff' * 16)
+        np.testing.assert_array_equal(self.cover, before)
+
+    def test_too_small(self):
+        payload = b'x' * (lsb_engine.capacity_bytes(self.cover.shape) + 5)
+        with self.assertRaises(ValueError):
+            lsb_engine.embed_lsb(self.cover, payload)
+
+    def test_embed_message_reports_throughput(self):
+        new_img, stats = lsb_engine.embed_message(self.img_path, b"hello")
+        self.assertEqual(new_img.size, (50, 40))
+        self.assertEqual(stats['bytes'], 4 + 5)
+        self.assertGreater(stats['bytes_per_sec'], 0)
+
+    def test_extract_roundtrip(self):
+        message = "Classified_Info".encode('utf-8')
+        out = lsb_engine.embed_lsb(self.cover, lsb_engine.build_payload(message))
+        self.assertEqual(lsb_engine.extract_lsb(out), message)
+
+    def test_extract_message_large_payload(self):
+        """Payloads beyond the old 10,000 byte limit must decode from file."""
+        cover = np.zeros((200, 200, 3), dtype=np.uint8)
+        message = os.urandom(12_000)
+        out = lsb_engine.embed_lsb(cover, lsb_engine.build_payload(message))
+        path = os.path.join(self.test_dir, "large.png")
+        Image.fromarray(out, 'RGB').save(path)
+        self.assertEqual(lsb_engine.extract_message(path), message)
+
+    def test_streamed_embed_matches_in_memory(self):
+        """Strip-by-strip encoding must write exactly what embed_lsb does."""
+        message = os.urandom(600)
+        out_path = os.path.join(self.test_dir, "streamed.png")
+        # A tiny budget forces one-row strips
+        stats = lsb_engine.embed_message_to_file(self.img_path, out_path, message, budget=1)
+        self.assertEqual(stats['bytes'], 4 + 600)
+        expected = lsb_engine.embed_lsb(self.cover, lsb_engine.build_payload(message))
+        np.testing.assert_array_equal(np.asarray(Image.open(out_path)), expected)
+        self.assertEqual(lsb_engine.extract_message(out_path, budget=1), message)
+
+    def test_streamed_embed_from_bmp(self):
+        bmp_path = os.path.join(self.test_dir, "cover.bmp")
+        Image.fromarray(self.cover, 'RGB').save(bmp_path)
+        out_path = os.path.join(self.test_dir, "from_bmp.png")
+        lsb_engine.embed_message_to_file(bmp_path, out_path, b"bitmap", budget=1)
+        self.assertEqual(lsb_engine.extract_message(out_path), b"bitmap")
+
+    def test_fallback_strips_close_the_file(self):
+        # Pillow keeps multi-frame files open after decoding the first frame
+        gif_path = os.path.join(self.test_dir, "strips.gif")
+        frames = [Image.new('RGB', (50, 40), color) for color in ('red', 'blue')]
+        frames[0].save(gif_path, save_all=True, append_images=frames[1:])
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always', ResourceWarning)
+            strips = list(lsb_engine.iter_rgb_strips(gif_path, 16))
+            gc.collect()
+        self.assertEqual([top for top, _ in strips], [0, 16, 32])
+        self.assertEqual(tuple(strips[0][1][0, 0]), (255, 0, 0))
+        self.assertFalse([w for w in caught if issubclass(w.category, ResourceWarning)])
+
+    def test_malformed_png_header_falls_back_to_pillow(self):
+        path = os.path.join(self.test_dir, "bad_ihdr.png")
+        with open(path, 'wb') as f:
+            f.write(lsb_engine.png_stream.PNG_SIGNATURE + lsb_engine.png_stream._chunk(b'IHDR', b'\x00\x00\x01'))
+        # Pillow rejects the file in its own terms; struct errors must not escape
+        with self.assertRaises((ValueError, OSError, SyntaxError)):
+            list(lsb_engine.iter_rgb_strips(path, 64))
+
+    def test_streamed_embed_too_small(self):
+        out_path = os.path.join(self.test_dir, "too_small.png")
+        with self.assertRaises(ValueError):
+            lsb_engine.embed_message_to_file(self.img_path, out_path, b'x' * 1000)
+        self.assertFalse(os.path.exists(out_path))
+
+    def test_strip_rows(self):
+        self.assertEqual(lsb_engine.strip_rows(1000, budget=1), 1)
+        self.assertEqual(lsb_engine.strip_rows(1000, budget=1, multiple=64), 64)
+        self.assertEqual(lsb_engine.strip_rows(1000, budget=10 ** 9, multiple=64) % 64, 0)
+
+    def test_extract_rejects_bad_header(self):
+        arr = np.full((10, 10, 3), 0xFF, dtype=np.uint8)
+        with self.assertRaises(ValueError):
+            lsb_engine.extract_lsb(arr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Read Office Open XML (DOCX, XLSX, PPTX) properties straight from the zip.
+
+Only the package relationships, docProps/core.xml, docProps/app.xml and the
+workbook part are inflated, so the cost does not grow with the size of the
+document body. Parts are located through _rels/.rels, falling back to the
+conventional names, and each one is capped in size so a hostile archive
+cannot balloon memory.
+"""
+import zipfile
+import posixpath
+from datetime import datetime
+import xml.etree.ElementTree as ET
+
+
+# Largest property part we are willing to inflate
+MAX_PART_BYTES = 4 * 1024 * 1024
+
+_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+_REL_TYPES = {
+    'core': 'http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties',
+    'app': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties',
+    'main': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument',
+}
+_DEFAULT_PARTS = {'core': 'docProps/core.xml', 'app': 'docProps/app.xml', 'main': None}
+# core.xml elements holding W3CDTF timestamps
+_DATE_FIELDS = ('created', 'modified', 'lastPrinted')
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _read_part(zf, name):
+    """Parse part `name`, or return None when it is missing or too large."""
+    try:
+        info = zf.getinfo(name)
+    except KeyError:
+        return None
+    if info.file_size > MAX_PART_BYTES:
+        return None
+    return ET.fromstring(zf.read(info))
+
+
+def _part_names(zf):
+    """Map 'core', 'app' and 'main' to part names using the package rels."""
+    parts = dict(_DEFAULT_PARTS)
+    rels = _read_part(zf, '_rels/.rels')
+    if rels is None:
+        return parts
+    for rel in rels.iter(f'{_REL_NS}Relationship'):
+        for key, rel_type in _REL_TYPES.items():
+            if rel.get('Type') == rel_type and rel.get('Target'):
+                parts[key] = rel.get('Target').lstrip('/')
+    return parts
+
+
+def _parse_date(text):
+    try:
+        return str(datetime.fromisoformat(text))
+    except ValueError:
+        return text
+
+
+def _core_properties(root):
+    props = {}
+    for el in root:
+        name = _local(el.tag)
+        text = (el.text or '').strip()
+        if text:
+            props[name] = _parse_date(text) if name in _DATE_FIELDS else text
+    return props
+
+
+def _app_properties(root):
+    # Only simple elements; HeadingPairs / TitlesOfParts are vectors
+    return {_local(el.tag): el.text.strip() for el in root
+            if len(el) == 0 and el.text and el.text.strip()}
+
+
+def _sheet_names(zf, main):
+    root = _read_part(zf, main) if main else None
+    if root is None:
+        return []
+    return [el.get('name') for el in root.iter() if _local(el.tag) == 'sheet']
+
+
+def read_properties(source):
+    """Return {'core', 'app', 'sheets'} for an OOXML package.
+
+    `source` is a path or a seekable file object. 'core' and 'app' map
+    element names (creator, lastModifiedBy, Words, Pages, ...) to strings;
+    'sheets' lists worksheet names for workbooks and is empty otherwise.
+    Raises zipfile.BadZipFile for anything that is not a zip.
+    """
+    with zipfile.ZipFile(source) as zf:
+        parts = _part_names(zf)
+        core = _read_part(zf, parts['core'])
+        app = _read_part(zf, parts['app'])
+        main = parts['main']
+        sheets = _sheet_names(zf, main) if main and posixpath.basename(main) == 'workbook.xml' else []
+        return {
+            'core': _core_properties(core) if core is not None else {},
+            'app': _app_properties(app) if app is not None else {},
+            'sheets': sheets,
+        }
@@ -0,0 +1,80 @@
+import unittest
+import io
+import zipfile
+import ooxml
+
+
+RELS = """<?xml version="1.0" encoding="UTF-8"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="{main}"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="props/core.xml"/>
+<Relationship Id="rId3" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/extended-properties" Target="props/app.xml"/>
+</Relationships>"""
+
+CORE = """<?xml version="1.0" encoding="UTF-8"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties"
+ xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:dcterms="http://purl.org/dc/terms/"
+ xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">
+<dc:title>Quarterly Report</dc:title><dc:creator>Alice</dc:creator>
+<cp:lastModifiedBy>Bob</cp:lastModifiedBy><cp:revision>7</cp:revision>
+<dcterms:created xsi:type="dcterms:W3CDTF">2024-01-02T03:04:05Z</dcterms:created>
+<cp:keywords></cp:keywords>
+</cp:coreProperties>"""
+
+APP = """<?xml version="1.0" encoding="UTF-8"?>
+<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties"
+ xmlns:vt="http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes">
+<Application>Microsoft Office Word</Application><Pages>12</Pages><Words>3456</Words>
+<Characters>19876</Characters><TitlesOfParts><vt:vector size="1" baseType="lpstr">
+<vt:lpstr>Sheet1</vt:lpstr></vt:vector></TitlesOfParts>
+</Properties>"""
+
+WORKBOOK = """<?xml version="1.0" encoding="UTF-8"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+ xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Summary" sheetId="1" r:id="rId1"/><sheet name="Raw Data" sheetId="2" r:id="rId2"/></sheets>
+</workbook>"""
+
+
+def build_package(main, body_name, body):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr('_rels/.rels', RELS.format(main=main))
+        zf.writestr('props/core.xml', CORE)
+        zf.writestr('props/app.xml', APP)
+        zf.writestr(body_name, body)
+    buf.seek(0)
+    return buf
+
+
+class TestOOXML(unittest.TestCase):
+
+    def test_docx_properties_without_body(self):
+        # The body is not even well-formed XML; it must never be parsed
+        pkg = build_package('word/document.xml', 'word/document.xml', b'<w:document' * 100_000)
+        props = ooxml.read_properties(pkg)
+        self.assertEqual(props['core']['creator'], 'Alice')
+        self.assertEqual(props['core']['lastModifiedBy'], 'Bob')
+        self.assertEqual(props['core']['created'], '2024-01-02 03:04:05+00:00')
+        self.assertNotIn('keywords', props['core'])
+        self.assertEqual((props['app']['Pages'], props['app']['Words']), ('12', '3456'))
+        self.assertNotIn('TitlesOfParts', props['app'])
+        self.assertEqual(props['sheets'], [])
+
+    def test_workbook_sheet_names(self):
+        pkg = build_package('xl/workbook.xml', 'xl/workbook.xml', WORKBOOK)
+        self.assertEqual(ooxml.read_properties(pkg)['sheets'], ['Summary', 'Raw Data'])
+
+    def test_default_part_names_without_rels(self):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, 'w') as zf:
+            zf.writestr('docProps/core.xml', CORE)
+        self.assertEqual(ooxml.read_properties(buf)['core']['title'], 'Quarterly Report')
+
+    def test_not_a_zip(self):
+        with self.assertRaises(zipfile.BadZipFile):
+            ooxml.read_properties(io.BytesIO(b'plain text'))
+
+
+if __name__ == '__main__':
+    unittest.main()
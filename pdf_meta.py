@@ -0,0 +1,601 @@
+"""PDF metadata from the trailer and cross-reference data alone.
+
+Starting from `startxref` at the end of the file, every cross-reference
+section is visited through its /Prev link. Each one is either a classic
+xref table or a (PDF 1.5+) xref stream. Each section marks one incremental
+update, so the chain gives the revision history. Objects are located through
+the xref entries and read with small bounded reads, so only the trailer,
+the Info and XMP objects, the catalog and the page tree root are ever
+touched. The page count comes from the root's /Count, not from a walk of
+the tree.
+
+For encrypted files only the structure is reported: page count and
+revisions, but not the Info and XMP contents, which are encrypted. Anything
+this reader does not handle raises ValueError, e.g. non-Flate filters or
+damaged offsets. Callers are expected to fall back to a full parser in that
+case.
+"""
+import re
+import zlib
+from collections import namedtuple
+import xml.etree.ElementTree as ET
+
+
+# How far from the end of the file to look for `startxref`
+TAIL_BYTES = 4096
+# Bounded read window for one object, and the most it may grow to
+OBJECT_WINDOW = 4096
+MAX_OBJECT_BYTES = 1024 * 1024
+# Largest stream (xref, object stream, XMP) we are willing to inflate
+MAX_STREAM_BYTES = 32 * 1024 * 1024
+# Guards against /Prev loops in hostile files
+MAX_SECTIONS = 1000
+
+Ref = namedtuple('Ref', 'num gen')
+
+
+class Name(str):
+    """A PDF name object, kept with its leading slash ('/Author')."""
+
+
+_WS = b' \t\r\n\f\x00'
+_DELIMS = b'()<>[]{}/%'
+_NUMBER = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)')
+_REF_TAIL = re.compile(rb'\s+(\d+)\s+R(?=[\s/\[\]<>()%]|$)')
+_KEYWORD = re.compile(rb'[A-Za-z]+')
+_OBJ_HEADER = re.compile(rb'\s*(\d+)\s+(\d+)\s+obj')
+_XREF_SUBSECTION = re.compile(rb'\s*(\d+)[ \t]+(\d+)[ \t]*(?:\r\n|\r|\n)')
+_XREF_ENTRY = re.compile(rb'\d{10} \d{5} [fn]')
+_ESCAPES = {ord('n'): b'\n', ord('r'): b'\r', ord('t'): b'\t', ord('b'): b'\b', ord('f'): b'\f',
+            ord('('): b'(', ord(')'): b')', ord('\\'): b'\\'}
+
+
+class _Truncated(ValueError):
+    """The read window ended inside an object; a larger window may help."""
+
+
+class _Lexer:
+    """Parse PDF objects out of a bytes window."""
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def skip(self):
+        data = self.data
+        while self.pos < len(data):
+            c = data[self.pos]
+            if c in _WS:
+                self.pos += 1
+            elif c == 0x25:  # '%' comment runs to end of line
+                end = re.compile(rb'[\r\n]').search(data, self.pos)
+                self.pos = end.end() if end else len(data)
+            else:
+                break
+
+    def value(self):
+        self.skip()
+        data, pos = self.data, self.pos
+        if pos >= len(data):
+            raise _Truncated("Unexpected end of PDF object")
+        c = data[pos]
+        if data.startswith(b'<<', pos):
+            self.pos += 2
+            return self._dict()
+        if c == 0x3C:  # '<'
+            end = data.find(b'>', pos)
+            if end < 0:
+                raise _Truncated("Unterminated hex string")
+            digits = re.sub(rb'\s', b'', data[pos + 1:end])
+            self.pos = end + 1
+            return bytes.fromhex((digits + b'0' * (len(digits) % 2)).decode('ascii'))
+        if c == 0x5B:  # '['
+            self.pos += 1
+            items = []
+            while True:
+                self.skip()
+                if self.pos >= len(data):
+                    raise _Truncated("Unterminated array")
+                if data[self.pos] == 0x5D:
+                    self.pos += 1
+                    return items
+                items.append(self.value())
+        if c == 0x28:  # '('
+            return self._literal()
+        if c == 0x2F:  # '/'
+            return self._name()
+        m = _NUMBER.match(data, pos)
+        if m:
+            self.pos = m.end()
+            text = m.group()
+            if b'.' in text:
+                return float(text)
+            ref = _REF_TAIL.match(data, self.pos)
+            if ref:
+                self.pos = ref.end()
+                return Ref(int(text), int(ref.group(1)))
+            return int(text)
+        m = _KEYWORD.match(data, pos)
+        if m and m.group() in (b'true', b'false', b'null'):
+            self.pos = m.end()
+            return {b'true': True, b'false': False, b'null': None}[m.group()]
+        raise ValueError(f"Unexpected PDF token at offset {pos}")
+
+    def _dict(self):
+        result = {}
+        while True:
+            self.skip()
+            if self.pos >= len(self.data):
+                raise _Truncated("Unterminated dictionary")
+            if self.data.startswith(b'>>', self.pos):
+                self.pos += 2
+                return result
+            key = self.value()
+            if not isinstance(key, Name):
+                raise ValueError("PDF dictionary key is not a name")
+            result[key] = self.value()
+
+    def _name(self):
+        data = self.data
+        end = self.pos + 1
+        while end < len(data) and data[end] not in _WS and data[end] not in _DELIMS:
+            end += 1
+        raw = data[self.pos:end]
+        self.pos = end
+        name = re.sub(rb'#([0-9A-Fa-f]{2})', lambda m: bytes([int(m.group(1), 16)]), raw)
+        return Name(name.decode('latin-1'))
+
+    def _literal(self):
+        data = self.data
+        out = bytearray()
+        depth = 0
+        pos = self.pos + 1
+        while pos < len(data):
+            c = data[pos]
+            if c == 0x5C:  # backslash
+                nxt = data[pos + 1:pos + 2]
+                if not nxt:
+                    break
+                if nxt[0] in _ESCAPES:
+                    out += _ESCAPES[nxt[0]]
+                    pos += 2
+                elif nxt in b'01234567':
+                    m = re.compile(rb'[0-7]{1,3}').match(data, pos + 1)
+                    out.append(int(m.group(), 8) & 0xFF)
+                    pos = m.end()
+                elif nxt == b'\r':
+                    pos += 3 if data[pos + 2:pos + 3] == b'\n' else 2
+                elif nxt == b'\n':
+                    pos += 2
+                else:
+                    out += nxt
+                    pos += 2
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                if depth == 0:
+                    self.pos = pos + 1
+                    return bytes(out)
+                depth -= 1
+            out.append(c)
+            pos += 1
+        raise _Truncated("Unterminated string")
+
+
+def decode_text(value):
+    """Decode a PDF text string (UTF-16BE or UTF-8 with BOM, else PDFDocEncoding)."""
+    if isinstance(value, bytes):
+        if value.startswith(b'\xfe\xff'):
+            return value[2:].decode('utf-16-be', 'replace')
+        if value.startswith(b'\xef\xbb\xbf'):
+            return value[3:].decode('utf-8', 'replace')
+        # PDFDocEncoding matches Latin-1 for everything metadata normally uses
+        return value.decode('latin-1')
+    if isinstance(value, Name):
+        return value[1:]
+    return str(value)
+
+
+def _inflate(data):
+    inflater = zlib.decompressobj()
+    try:
+        out = inflater.decompress(data, MAX_STREAM_BYTES)
+    except zlib.error as e:
+        raise ValueError(f"Corrupt Flate stream: {e}") from None
+    if inflater.unconsumed_tail:
+        raise ValueError("PDF stream exceeds the size limit")
+    return out
+
+
+def _unpredict(data, params):
+    """Undo a PNG predictor (/Predictor >= 10) on 8-bit single-sample rows."""
+    predictor = params.get('/Predictor', 1) if params else 1
+    if predictor < 10:
+        if predictor != 1:
+            raise ValueError("TIFF predictors are not supported")
+        return data
+    if params.get('/Colors', 1) != 1 or params.get('/BitsPerComponent', 8) != 8:
+        raise ValueError("Unsupported predictor parameters")
+    columns = params.get('/Columns', 1)
+    prior = bytes(columns)
+    out = bytearray()
+    for start in range(0, len(data) - columns, columns + 1):
+        kind, row = data[start], bytearray(data[start + 1:start + 1 + columns])
+        for i in range(len(row)):
+            left = row[i - 1] if i else 0
+            up = prior[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                up_left = prior[i - 1] if i else 0
+                p = left + up - up_left
+                pa, pb, pc = abs(p - left), abs(p - up), abs(p - up_left)
+                row[i] = (row[i] + (left if pa <= pb and pa <= pc else up if pb <= pc else up_left)) & 0xFF
+        out += row
+        prior = row
+    return bytes(out)
+
+
+def decode_stream(stream_dict, raw):
+    """Apply the stream's filters; only FlateDecode (plus predictors) is supported."""
+    filters = stream_dict.get('/Filter') or []
+    params = stream_dict.get('/DecodeParms') or []
+    if not isinstance(filters, list):
+        filters, params = [filters], [params]
+    data = raw
+    for i, name in enumerate(filters):
+        if name not in ('/FlateDecode', '/Fl'):
+            raise ValueError(f"Unsupported PDF filter {name}")
+        data = _unpredict(_inflate(data), params[i] if i < len(params) else None)
+    return data
+
+
+class _Section:
+    """One cross-reference section: its trailer and an object lookup."""
+
+    def __init__(self, offset, trailer, lookups):
+        self.offset = offset
+        self.trailer = trailer
+        self._lookups = lookups
+
+    def lookup(self, num):
+        """Return ('n', offset), ('c', stream_num, index), ('f',) or None."""
+        for lookup in self._lookups:
+            entry = lookup(num)
+            if entry is not None:
+                return entry
+        return None
+
+
+class PDFMetadataReader:
+    """Bounded-read access to a PDF's trailer chain and a handful of objects."""
+
+    def __init__(self, f):
+        self.f = f
+        f.seek(0, 2)
+        self.size = f.tell()
+        self._object_streams = {}
+        self.sections = self._read_chain(self._startxref())
+        self.revisions = self._group_revisions()
+
+    def read_at(self, offset, size):
+        self.f.seek(offset)
+        return self.f.read(size)
+
+    # ---------- Cross-reference chain ----------
+    def _startxref(self):
+        start = max(0, self.size - TAIL_BYTES)
+        tail = self.read_at(start, TAIL_BYTES)
+        idx = tail.rfind(b'startxref')
+        m = re.compile(rb'startxref\s+(\d+)').match(tail, idx) if idx >= 0 else None
+        if not m:
+            raise ValueError("No startxref near the end of the file")
+        return int(m.group(1))
+
+    def _read_chain(self, offset):
+        sections, seen = [], set()
+        while offset is not None:
+            if offset in seen or len(sections) >= MAX_SECTIONS:
+                raise ValueError("Cross-reference chain loops")
+            seen.add(offset)
+            section = self._read_section(offset)
+            sections.append(section)
+            prev = section.trailer.get('/Prev')
+            offset = prev if isinstance(prev, int) else None
+        return sections
+
+    def _read_section(self, offset):
+        if offset >= self.size:
+            raise ValueError("Cross-reference offset past end of file")
+        head = self.read_at(offset, 32)
+        body = head.lstrip(_WS)
+        if body.startswith(b'xref'):
+            trailer, lookup = self._read_table(offset + len(head) - len(body) + 4)
+            lookups = [lookup]
+            # Hybrid files keep compressed objects in an extra xref stream
+            if isinstance(trailer.get('/XRefStm'), int):
+                lookups.append(self._read_xref_stream(trailer['/XRefStm'])[1])
+            return _Section(offset, trailer, lookups)
+        trailer, lookup = self._read_xref_stream(offset)
+        return _Section(offset, trailer, [lookup])
+
+    def _read_table(self, pos):
+        """Index a classic xref table by its subsection headers only."""
+        subsections = []
+        while True:
+            window = self.read_at(pos, 64)
+            m = _XREF_SUBSECTION.match(window)
+            if not m:
+                trailer = re.compile(rb'\s*trailer').match(window)
+                if not trailer:
+                    raise ValueError("Malformed xref table")
+                return self._parse_at(pos + trailer.end()), self._table_lookup(subsections)
+            first, count = int(m.group(1)), int(m.group(2))
+            entries = pos + m.end()
+            entry_len = 20
+            if count:
+                sample = self.read_at(entries, 20)
+                if not _XREF_ENTRY.match(sample):
+                    raise ValueError("Malformed xref entry")
+                # The spec says 20 bytes; some writers end entries with a single EOL byte
+                if sample[18:20] not in (b' \n', b' \r', b'\r\n'):
+                    entry_len = 19
+            subsections.append((first, count, entries, entry_len))
+            pos = entries + count * entry_len
+
+    def _table_lookup(self, subsections):
+        def lookup(num):
+            for first, count, entries, entry_len in subsections:
+                if first <= num < first + count:
+                    entry = self.read_at(entries + (num - first) * entry_len, 18)
+                    if entry[17:18] == b'n':
+                        return ('n', int(entry[:10]))
+                    return ('f',)
+            return None
+        return lookup
+
+    def _read_xref_stream(self, offset):
+        """Read an xref stream; entries are decoded on demand, not up front."""
+        _, _, obj, raw = self._object_at(offset, None)
+        if not isinstance(obj, dict) or obj.get('/Type') != '/XRef' or raw is None:
+            raise ValueError("startxref does not point at cross-reference data")
+        data = decode_stream(obj, raw)
+        widths = obj.get('/W')
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise ValueError("Malformed xref stream /W")
+        index = obj.get('/Index') or [0, obj.get('/Size', 0)]
+        row = sum(widths)
+        ranges, start = [], 0
+        for first, count in zip(index[0::2], index[1::2]):
+            ranges.append((first, count, start))
+            start += count * row
+
+        def field(record, at, width, default):
+            return int.from_bytes(record[at:at + width], 'big') if width else default
+
+        def lookup(num):
+            for first, count, base in ranges:
+                if first <= num < first + count:
+                    record = data[base + (num - first) * row:base + (num - first + 1) * row]
+                    if len(record) < row:
+                        return None
+                    kind = field(record, 0, widths[0], 1)
+                    second = field(record, widths[0], widths[1], 0)
+                    third = field(record, widths[0] + widths[1], widths[2], 0)
+                    if kind == 1:
+                        return ('n', second)
+                    if kind == 2:
+                        return ('c', second, third)
+                    return ('f',)
+            return None
+        return obj, lookup
+
+    def _group_revisions(self):
+        """Group sections into revisions, newest first.
+
+        A linearized file's first-page table points *forward* to the main
+        table with /Prev; the two together describe one revision.
+        """
+        groups, i = [], 0
+        while i < len(self.sections):
+            section = self.sections[i]
+            prev = section.trailer.get('/Prev')
+            span = 2 if isinstance(prev, int) and prev > section.offset else 1
+            groups.append(i)
+            i += span
+        return groups
+
+    # ---------- Objects ----------
+    def _parse_at(self, offset, window=OBJECT_WINDOW):
+        while True:
+            data = self.read_at(offset, window)
+            try:
+                return _Lexer(data).value()
+            except _Truncated:
+                if len(data) < window or window >= MAX_OBJECT_BYTES:
+                    raise ValueError(f"Unreadable PDF object at offset {offset}") from None
+                window *= 4
+
+    def _object_at(self, offset, start):
+        """Return (num, gen, value, raw stream bytes or None) for the object at `offset`."""
+        window = OBJECT_WINDOW
+        while True:
+            data = self.read_at(offset, window)
+            header = _OBJ_HEADER.match(data)
+            if not header:
+                raise ValueError(f"No object at offset {offset}")
+            lexer = _Lexer(data, header.end())
+            try:
+                value = lexer.value()
+                lexer.skip()
+                break
+            except _Truncated:
+                if len(data) < window or window >= MAX_OBJECT_BYTES:
+                    raise ValueError(f"Unreadable PDF object at offset {offset}") from None
+                window *= 4
+        raw = None
+        if isinstance(value, dict) and data.startswith(b'stream', lexer.pos):
+            pos = lexer.pos + 6
+            pos += 2 if data[pos:pos + 2] == b'\r\n' else 1
+            length = self.resolve(value.get('/Length'), start) if start is not None else value.get('/Length')
+            if not isinstance(length, int) or length < 0 or length > MAX_STREAM_BYTES:
+                raise ValueError(f"Bad stream length at offset {offset}")
+            raw = self.read_at(offset + pos, length)
+        return int(header.group(1)), int(header.group(2)), value, raw
+
+    def _entry(self, num, start):
+        for section in self.sections[start:]:
+            entry = section.lookup(num)
+            if entry is not None:
+                return entry
+        return None
+
+    def _fetch(self, num, start):
+        """Return (value, raw stream) for object `num` as of revision `start`."""
+        entry = self._entry(num, start)
+        if entry is None or entry[0] == 'f':
+            return None, None
+        if entry[0] == 'n':
+            found, _, value, raw = self._object_at(entry[1], start)
+            if found != num:
+                raise ValueError(f"xref entry for object {num} points at object {found}")
+            return value, raw
+        return self._from_object_stream(entry[1], entry[2], start), None
+
+    def _from_object_stream(self, stream_num, index, start):
+        key = (stream_num, start)
+        if key not in self._object_streams:
+            obj, raw = self._fetch(stream_num, start)
+            if not isinstance(obj, dict) or raw is None:
+                raise ValueError(f"Object stream {stream_num} is missing")
+            data = decode_stream(obj, raw)
+            header = _Lexer(data)
+            offsets = [header.value() for _ in range(2 * obj.get('/N', 0))][1::2]
+            self._object_streams[key] = (data, obj.get('/First', 0), offsets)
+        data, first, offsets = self._object_streams[key]
+        if index >= len(offsets):
+            raise ValueError(f"Object stream {stream_num} has no entry {index}")
+        return _Lexer(data, first + offsets[index]).value()
+
+    def resolve(self, value, start=0):
+        """Follow an indirect reference, seen as of the revision at `start`."""
+        if isinstance(value, Ref):
+            return self._fetch(value.num, start)[0]
+        return value
+
+    # ---------- Metadata ----------
+    def trailer(self, revision=0):
+        """Merged trailer of a revision (index into self.revisions)."""
+        start = self.revisions[revision]
+        end = self.revisions[revision + 1] if revision + 1 < len(self.revisions) else len(self.sections)
+        merged = {}
+        for section in reversed(self.sections[start:end]):
+            merged.update(section.trailer)
+        return merged
+
+    def info(self, revision=0):
+        """Decoded Info dictionary of a revision ({'/Author': ..., ...})."""
+        start = self.revisions[revision]
+        info = self.resolve(self.trailer(revision).get('/Info'), start)
+        if not isinstance(info, dict):
+            return {}
+        return {key: decode_text(self.resolve(value, start)) for key, value in info.items()}
+
+    def catalog(self):
+        catalog = self.resolve(self.trailer().get('/Root'))
+        if not isinstance(catalog, dict):
+            raise ValueError("PDF catalog is missing")
+        return catalog
+
+    def page_count(self):
+        pages = self.resolve(self.catalog().get('/Pages'))
+        count = self.resolve(pages.get('/Count')) if isinstance(pages, dict) else None
+        if not isinstance(count, int):
+            raise ValueError("Page tree root has no /Count")
+        return count
+
+    def version(self):
+        m = re.compile(rb'%PDF-(\d+\.\d+)').search(self.read_at(0, 1024))
+        version = m.group(1).decode('ascii') if m else None
+        # An update may raise the version through the catalog
+        override = self.catalog().get('/Version')
+        if isinstance(override, Name) and (version is None or float(override[1:]) > float(version)):
+            version = override[1:]
+        return version
+
+    def xmp(self):
+        """Simple XMP properties ('xmp:CreatorTool', 'dc:title', ...) from the catalog."""
+        ref = self.catalog().get('/Metadata')
+        if not isinstance(ref, Ref):
+            return {}
+        obj, raw = self._fetch(ref.num, 0)
+        if not isinstance(obj, dict) or raw is None:
+            return {}
+        return parse_xmp(decode_stream(obj, raw))
+
+
+_XMP_PREFIXES = {
+    'http://purl.org/dc/elements/1.1/': 'dc',
+    'http://ns.adobe.com/xap/1.0/': 'xmp',
+    'http://ns.adobe.com/pdf/1.3/': 'pdf',
+    'http://ns.adobe.com/xap/1.0/mm/': 'xmpMM',
+    'http://ns.adobe.com/photoshop/1.0/': 'photoshop',
+}
+_RDF = '{http://www.w3.org/1999/02/22-rdf-syntax-ns#}'
+
+
+def _xmp_key(tag):
+    ns, _, local = tag[1:].partition('}') if tag.startswith('{') else ('', '', tag)
+    prefix = _XMP_PREFIXES.get(ns)
+    return f'{prefix}:{local}' if prefix else local
+
+
+def parse_xmp(data):
+    """Flatten the simple properties of an XMP packet into {key: text}."""
+    try:
+        root = ET.fromstring(data.strip(b'\x00 \t\r\n'))
+    except ET.ParseError:
+        return {}
+    props = {}
+    for desc in root.iter(f'{_RDF}Description'):
+        for attr, value in desc.attrib.items():
+            if not attr.startswith(_RDF) and value.strip():
+                props[_xmp_key(attr)] = value.strip()
+        for prop in desc:
+            items = [li.text.strip() for li in prop.iter(f'{_RDF}li') if li.text and li.text.strip()]
+            text = '; '.join(items) if items else (prop.text or '').strip()
+            if text:
+                props[_xmp_key(prop.tag)] = text
+    return props
+
+
+def read_metadata(source):
+    """Read Info, XMP, page count and per-revision Info from `source`.
+
+    `source` is a path or a seekable binary file object. Returns a dict
+    with 'version', 'pages', 'encrypted', 'info', 'xmp' and 'revisions'.
+    'revisions' is ordered oldest first, and each entry holds the offset of
+    its cross-reference section and its Info dictionary. Info and XMP are
+    left empty for encrypted files. Raises ValueError for damaged or
+    unsupported files.
+    """
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return read_metadata(f)
+    reader = PDFMetadataReader(source)
+    encrypted = '/Encrypt' in reader.trailer()
+    return {
+        'version': reader.version(),
+        'pages': reader.page_count(),
+        'encrypted': encrypted,
+        'info': {} if encrypted else reader.info(),
+        'xmp': {} if encrypted else reader.xmp(),
+        'revisions': [{'xref_offset': reader.sections[start].offset,
+                       'info': {} if encrypted else reader.info(i)}
+                      for i, start in reversed(list(enumerate(reader.revisions)))],
+    }
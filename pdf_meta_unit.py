@@ -0,0 +1,117 @@
+import unittest
+import io
+import zlib
+import struct
+import pdf_meta
+
+
+def build_pdf(objects, trailer, base=b'', prev=None):
+    """Append `objects` ({num: body}) and a classic xref table to `base`."""
+    out = bytearray(base or b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = {}
+    for num, body in objects.items():
+        offsets[num] = len(out)
+        out += b'%d 0 obj\n' % num + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n'
+    if not base:
+        out += b'0 1\n0000000000 65535 f \n'
+    for num in sorted(offsets):
+        out += b'%d 1\n%010d 00000 n \n' % (num, offsets[num])
+    extra = b' /Prev %d' % prev if prev is not None else b''
+    out += b'trailer\n<< ' + trailer + extra + b' >>\nstartxref\n%d\n%%%%EOF\n' % xref
+    return bytes(out), xref
+
+
+def build_xref_stream_pdf():
+    """PDF 1.5 layout: Info and catalog inside an object stream, xref stream with a PNG predictor."""
+    head = bytearray(b'%PDF-1.5\n')
+    pages_off = len(head)
+    head += b'3 0 obj\n<< /Type /Pages /Kids [] /Count 4200 >>\nendobj\n'
+    packed = [b'<< /Type /Catalog /Pages 3 0 R >>', b'<< /Title (Packed \\(title\\)) /Author <FEFF00C5006B0065> >>']
+    table, body = b'', b''
+    for num, obj in zip((1, 2), packed):
+        table += b'%d %d ' % (num, len(body))
+        body += obj + b' '
+    data = zlib.compress(table + body)
+    stm_off = len(head)
+    head += (b'4 0 obj\n<< /Type /ObjStm /N 2 /First %d /Filter /FlateDecode /Length %d >>\nstream\n'
+             % (len(table), len(data)) + data + b'\nendstream\nendobj\n')
+    xref_off = len(head)
+    rows = [(0, 0, 255), (2, 4, 0), (2, 4, 1), (1, pages_off, 0), (1, stm_off, 0), (1, xref_off, 0)]
+    raw, prior = b'', bytes(4)
+    for row in rows:
+        cur = struct.pack('>BHB', *row)
+        raw += b'\x02' + bytes((c - p) & 0xFF for c, p in zip(cur, prior))
+        prior = cur
+    data = zlib.compress(raw)
+    head += (b'5 0 obj\n<< /Type /XRef /Size 6 /W [1 2 1] /Root 1 0 R /Info 2 0 R /Filter /FlateDecode '
+             b'/DecodeParms << /Predictor 12 /Columns 4 >> /Length %d >>\nstream\n' % len(data) +
+             data + b'\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n' % xref_off)
+    return bytes(head)
+
+
+XMP = (b'<?xpacket begin="" id="W5M0MpCehiHzreSzNTczkc9d"?><x:xmpmeta xmlns:x="adobe:ns:meta/">'
+       b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#">'
+       b'<rdf:Description xmlns:xmp="http://ns.adobe.com/xap/1.0/" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+       b'xmp:CreatorTool="Writer 9"><dc:creator><rdf:Seq><rdf:li>Alice</rdf:li></rdf:Seq></dc:creator>'
+       b'</rdf:Description></rdf:RDF></x:xmpmeta><?xpacket end="w"?>')
+
+
+class TestPDFMeta(unittest.TestCase):
+
+    def original(self):
+        return build_pdf({
+            1: b'<< /Type /Catalog /Pages 2 0 R /Metadata 4 0 R >>',
+            2: b'<< /Type /Pages /Kids [] /Count 3 >>',
+            3: b'<< /Author (Alice) /Producer (Writer 9) /CreationDate (D:20240101120000Z) >>',
+            4: b'<< /Type /Metadata /Subtype /XML /Length %d >>\nstream\n' % len(XMP) + XMP + b'\nendstream',
+        }, b'/Size 5 /Root 1 0 R /Info 3 0 R')
+
+    def test_classic_table(self):
+        data, _ = self.original()
+        meta = pdf_meta.read_metadata(io.BytesIO(data))
+        self.assertEqual(meta['version'], '1.4')
+        self.assertEqual(meta['pages'], 3)
+        self.assertEqual(meta['info']['/Author'], 'Alice')
+        self.assertEqual(meta['xmp'], {'xmp:CreatorTool': 'Writer 9', 'dc:creator': 'Alice'})
+        self.assertEqual(len(meta['revisions']), 1)
+
+    def test_incremental_updates_keep_each_revision(self):
+        data, xref = self.original()
+        data, _ = build_pdf({3: b'<< /Author (Mallory) /Producer (Editor 2) >>'},
+                            b'/Size 5 /Root 1 0 R /Info 3 0 R', base=data, prev=xref)
+        meta = pdf_meta.read_metadata(io.BytesIO(data))
+        self.assertEqual(meta['info']['/Author'], 'Mallory')
+        self.assertEqual([r['info']['/Author'] for r in meta['revisions']], ['Alice', 'Mallory'])
+        self.assertEqual(meta['revisions'][0]['xref_offset'], xref)
+
+    def test_xref_and_object_streams(self):
+        meta = pdf_meta.read_metadata(io.BytesIO(build_xref_stream_pdf()))
+        self.assertEqual(meta['pages'], 4200)
+        self.assertEqual(meta['info'], {'/Title': 'Packed (title)', '/Author': 'Åke'})
+
+    def test_unsupported_files_raise(self):
+        with self.assertRaises(ValueError):
+            pdf_meta.read_metadata(io.BytesIO(b'%PDF-1.4\nno trailer here'))
+        # startxref pointing into the middle of an object
+        data, xref = self.original()
+        with self.assertRaises(ValueError):
+            pdf_meta.read_metadata(io.BytesIO(data.replace(b'startxref\n%d' % xref, b'startxref\n20')))
+
+    def test_encrypted_reports_structure_only(self):
+        data, _ = build_pdf({1: b'<< /Type /Catalog /Pages 2 0 R >>', 2: b'<< /Type /Pages /Kids [] /Count 2 >>',
+                             3: b'<< /Author (\223\001garbled) >>'},
+                            b'/Size 4 /Root 1 0 R /Info 3 0 R /Encrypt << /V 1 >>')
+        meta = pdf_meta.read_metadata(io.BytesIO(data))
+        self.assertTrue(meta['encrypted'])
+        self.assertEqual((meta['pages'], meta['info']), (2, {}))
+
+    def test_lexer_literals(self):
+        lexer = pdf_meta._Lexer(b'<< /A#20B (x\\051(y)\\\nz) /N [1 2 0 R -3.5 true null] /H <48 6>>>')
+        self.assertEqual(lexer.value(), {'/A B': b'x)(y)z', '/N': [1, pdf_meta.Ref(2, 0), -3.5, True, None],
+                                         '/H': b'H`'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""Perceptual image hashes and a multi-index table for near-duplicate search.
+
+aHash, dHash and pHash are 64-bit fingerprints of a small grayscale copy of
+an image, so a re-saved, re-encoded or LSB-modified copy lands within a few
+bits of its original while unrelated images differ in about half the bits.
+Images are decoded at reduced resolution: JPEG scales in the decoder (draft
+mode) and other formats are reduced before the final resample.
+
+HashIndex finds every hash within Hamming distance k without comparing the
+query against all of them. The hashes are split into INDEX_CHUNKS parts,
+each with its own table; two hashes at most k bits apart differ by at most
+k // INDEX_CHUNKS bits in at least one part, so a query only probes the
+buckets of part values that close to its own.
+"""
+import functools
+from itertools import combinations
+import numpy as np
+from PIL import Image
+
+
+ALGORITHMS = ('ahash', 'dhash', 'phash')
+HASH_BITS = 64
+# Side of the grayscale image the pHash DCT runs on
+PHASH_SIZE = 32
+INDEX_CHUNKS = 4
+# pHash distance at or below which two images are reported as near-duplicates
+NEAR_DISTANCE = 8
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_rows(n, k):
+    """The first `k` rows of the n-point DCT-II matrix."""
+    rows = np.arange(k)[:, None]
+    cols = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * cols + 1) * rows / (2 * n))
+
+
+def _to_hex(bits):
+    return f"{int.from_bytes(np.packbits(bits.ravel()).tobytes(), 'big'):016x}"
+
+
+def _gray(source):
+    """PHASH_SIZE x PHASH_SIZE grayscale copy of the image as float64."""
+    with Image.open(source) as img:
+        img.draft('RGB', (PHASH_SIZE, PHASH_SIZE))
+        if img.mode not in ('RGB', 'L'):
+            img = img.convert('RGB')
+        small = img.resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return np.asarray(small.convert('L'), dtype=np.float64)
+
+
+def hashes_of_gray(gray):
+    """aHash, dHash and pHash of a square grayscale array, as 16-digit hex strings."""
+    size = len(gray)
+    # 8x8 block means for aHash; 9 columns for the 8 horizontal differences of dHash
+    blocks = gray.reshape(8, size // 8, 8, size // 8).mean(axis=(1, 3))
+    columns = np.linspace(0, size, 10).astype(np.intp)
+    rows = gray.reshape(8, size // 8, size).mean(axis=1)
+    strips = np.add.reduceat(rows, columns[:-1], axis=1) / np.diff(columns)
+    # pHash: the 63 lowest AC coefficients against their median. The DC term
+    # is only the mean brightness, so its bit stays 0; rounding keeps
+    # floating-point noise of flat images from setting bits.
+    low = (_dct_rows(size, 8) @ gray @ _dct_rows(size, 8).T).ravel()
+    ac = np.round(low[1:], 6)
+    phash = np.zeros(64, dtype=bool)
+    phash[1:] = ac > np.median(ac)
+    return {
+        'ahash': _to_hex(blocks > blocks.mean()),
+        'dhash': _to_hex(strips[:, 1:] > strips[:, :-1]),
+        'phash': _to_hex(phash),
+    }
+
+
+def image_hashes(source):
+    """aHash, dHash and pHash of the image at `source` (a path or file object)."""
+    return hashes_of_gray(_gray(source))
+
+
+def hamming(a, b):
+    """Number of differing bits between two hashes given as ints or hex strings."""
+    if isinstance(a, str):
+        a, b = int(a, 16), int(b, 16)
+    return (a ^ b).bit_count()
+
+
+@functools.lru_cache(maxsize=None)
+def _flips(width, radius):
+    """XOR masks of every `width`-bit value within `radius` bits of zero."""
+    masks = [0]
+    for n in range(1, min(radius, width) + 1):
+        for bits in combinations(range(width), n):
+            masks.append(sum(1 << bit for bit in bits))
+    return masks
+
+
+class HashIndex:
+    """Hashes with an item each, searchable by Hamming distance."""
+
+    def __init__(self, bits=HASH_BITS, chunks=INDEX_CHUNKS):
+        self.width = bits // chunks
+        self.mask = (1 << self.width) - 1
+        self.tables = [{} for _ in range(chunks)]
+        self.values = []
+        self.items = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def add(self, value, item=None):
+        index = len(self.values)
+        self.values.append(value)
+        self.items.append(item)
+        for i, table in enumerate(self.tables):
+            table.setdefault((value >> (i * self.width)) & self.mask, []).append(index)
+
+    def search(self, value, distance=NEAR_DISTANCE):
+        """Return [(distance, item)] for the hashes within `distance` bits, nearest first."""
+        flips = _flips(self.width, distance // len(self.tables))
+        seen, found = set(), []
+        for i, table in enumerate(self.tables):
+            part = (value >> (i * self.width)) & self.mask
+            for flip in flips:
+                for index in table.get(part ^ flip, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    d = (self.values[index] ^ value).bit_count()
+                    if d <= distance:
+                        found.append((d, index))
+        found.sort()
+        return [(d, self.items[index]) for d, index in found]
+
+
+def near_duplicates(hashed, distance=NEAR_DISTANCE):
+    """Pairs (distance, earlier item, item) among `hashed`, an iterable of (value, item)."""
+    index = HashIndex()
+    pairs = []
+    for value, item in hashed:
+        pairs.extend((d, other, item) for d, other in index.search(value, distance))
+        index.add(value, item)
+    return pairs
@@ -0,0 +1,82 @@
+import unittest
+import os
+import random
+import shutil
+import numpy as np
+from PIL import Image
+import perceptual_hash
+
+
+class TestPerceptualHash(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_perceptual"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        y, x = np.mgrid[0:240, 0:320]
+        pixels = np.stack([x * 255 // 320, y * 255 // 240, (x + y) % 256], axis=-1).astype(np.uint8)
+        pixels[80:160, 120:200] = (200, 30, 30)
+        cls.original = os.path.join(cls.test_dir, "original.png")
+        Image.fromarray(pixels).save(cls.original)
+        cls.copies = []
+        for name, img, kwargs in (("resaved.jpg", Image.fromarray(pixels), {'quality': 60}),
+                                  ("small.png", Image.fromarray(pixels).resize((160, 120)), {}),
+                                  ("lsb.png", Image.fromarray(pixels ^ np.uint8(1)), {})):
+            path = os.path.join(cls.test_dir, name)
+            img.save(path, **kwargs)
+            cls.copies.append(path)
+        cls.unrelated = os.path.join(cls.test_dir, "noise.png")
+        Image.fromarray(np.random.default_rng(0).integers(0, 256, (240, 320, 3), dtype=np.uint8)).save(cls.unrelated)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_copies_are_close_and_others_far(self):
+        original = perceptual_hash.image_hashes(self.original)
+        self.assertEqual(sorted(original), sorted(perceptual_hash.ALGORITHMS))
+        self.assertTrue(all(len(h) == 16 for h in original.values()))
+        for path in self.copies:
+            copy = perceptual_hash.image_hashes(path)
+            for name in perceptual_hash.ALGORITHMS:
+                self.assertLessEqual(perceptual_hash.hamming(original[name], copy[name]), 4, (path, name))
+        noise = perceptual_hash.image_hashes(self.unrelated)
+        self.assertGreater(perceptual_hash.hamming(original['phash'], noise['phash']),
+                           perceptual_hash.NEAR_DISTANCE)
+        with open(self.original, 'rb') as f:
+            self.assertEqual(perceptual_hash.image_hashes(f), original)
+
+    def test_phash_ignores_dc_term(self):
+        flat = perceptual_hash.hashes_of_gray(np.full((32, 32), 137.0))
+        self.assertEqual(flat['phash'], '0' * 16)
+        for path in [self.original, self.unrelated] + self.copies:
+            phash = int(perceptual_hash.image_hashes(path)['phash'], 16)
+            self.assertFalse(phash >> 63)
+            self.assertGreater(phash.bit_count(), 20)
+
+    def test_index_matches_linear_scan(self):
+        rng = random.Random(5)
+        values = []
+        for _ in range(300):
+            base = rng.getrandbits(64)
+            values.append(base)
+            for _ in range(3):
+                values.append(base ^ sum(1 << rng.randrange(64) for _ in range(rng.randint(1, 10))))
+        index = perceptual_hash.HashIndex()
+        for i, value in enumerate(values):
+            index.add(value, i)
+        self.assertEqual(len(index), len(values))
+        for distance in (0, 3, 8, 13):
+            for query in values[:40]:
+                expected = sorted(((value ^ query).bit_count(), i) for i, value in enumerate(values)
+                                  if (value ^ query).bit_count() <= distance)
+                self.assertEqual(index.search(query, distance), expected)
+
+    def test_near_duplicate_pairs(self):
+        pairs = perceptual_hash.near_duplicates([(0b1011, 'a'), (1 << 40, 'b'), (0b1001, 'c')], distance=2)
+        self.assertEqual(pairs, [(1, 'a', 'c')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+"""Strip-by-strip PNG reading and writing with bounded memory.
+
+PNGStripReader inflates the IDAT stream incrementally and hands each strip
+of filtered rows to Pillow as a tiny stored PNG, seeded with the previous
+strip's last row so Up/Average/Paeth filters resolve correctly. Pillow's C
+decoder does the unfiltering and colour handling, but never holds more
+than one strip. PNGStripWriter filters rows with NumPy, picking the best of
+the five PNG filters per row, and deflates them into IDAT chunks as strips
+arrive.
+"""
+import io
+import zlib
+import struct
+import numpy as np
+from PIL import Image
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# Samples per pixel for each 8-bit PNG colour type
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+# Chunks that must travel with each strip for Pillow to decode it
+_STRIP_CHUNKS = (b'PLTE', b'tRNS')
+# Inflate / deflate in pieces of this size
+_IO_BLOCK = 1 << 20
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data +
+            struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def _ihdr(width, height, depth, color_type):
+    return _chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, depth, color_type, 0, 0, 0))
+
+
+class PNGStripReader:
+    """Read a non-interlaced 8-bit PNG one strip of rows at a time."""
+
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._parse_header()
+        except Exception:
+            self._file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def _read_chunk_header(self):
+        head = self._file.read(8)
+        if len(head) < 8:
+            raise ValueError("Truncated PNG file")
+        length, kind = struct.unpack('>I4s', head)
+        return length, kind
+
+    def _parse_header(self):
+        if self._file.read(8) != PNG_SIGNATURE:
+            raise ValueError("Not a PNG file")
+        length, kind = self._read_chunk_header()
+        if kind != b'IHDR':
+            raise ValueError("PNG is missing its IHDR chunk")
+        header = self._file.read(length)
+        if length != 13 or len(header) != 13:
+            raise ValueError("Malformed IHDR")
+        self._file.read(4)
+        (self.width, self.height, self.depth, self.color_type,
+         _, _, self.interlace) = struct.unpack('>IIBBBBB', header)
+        if not self.streamable:
+            return
+
+        self._extra = b''
+        while True:
+            length, kind = self._read_chunk_header()
+            if kind == b'IDAT':
+                self._idat_left = length
+                return
+            data = self._file.read(length)
+            self._file.read(4)
+            if kind in _STRIP_CHUNKS:
+                self._extra += _chunk(kind, data)
+            elif kind == b'IEND':
+                raise ValueError("PNG has no image data")
+
+    @property
+    def streamable(self):
+        """Whether this file can be read in strips (8-bit, not interlaced)."""
+        return self.depth == 8 and self.interlace == 0 and self.color_type in _CHANNELS
+
+    @property
+    def row_bytes(self):
+        return self.width * _CHANNELS[self.color_type]
+
+    def _idat_data(self):
+        """Yield the compressed image data, IDAT chunk by IDAT chunk."""
+        while True:
+            while self._idat_left:
+                block = self._file.read(min(self._idat_left, _IO_BLOCK))
+                if not block:
+                    raise ValueError("Truncated PNG file")
+                self._idat_left -= len(block)
+                yield block
+            self._file.read(4)
+            length, kind = self._read_chunk_header()
+            if kind != b'IDAT':
+                return
+            self._idat_left = length
+
+    def iter_strips(self, rows):
+        """Yield (first_row, PIL image) for consecutive strips of `rows` rows."""
+        if not self.streamable:
+            raise ValueError("Only non-interlaced 8-bit PNGs can be read in strips")
+        rows = max(1, rows)
+        inflater = zlib.decompressobj()
+        compressed = self._idat_data()
+        seed = b''
+        for top in range(0, self.height, rows):
+            count = min(rows, self.height - top)
+            need = count * (self.row_bytes + 1)
+            raw = bytearray()
+            while len(raw) < need:
+                data = inflater.unconsumed_tail or next(compressed, None)
+                if data is None:
+                    raise ValueError("Truncated PNG image data")
+                raw += inflater.decompress(data, need - len(raw))
+
+            # A stored (level 0) PNG holding the previous row plus this strip
+            body = zlib.compress(seed + raw, 0)
+            strip_png = (PNG_SIGNATURE + _ihdr(self.width, count + (1 if seed else 0),
+                                               self.depth, self.color_type) +
+                         self._extra + _chunk(b'IDAT', body) + _chunk(b'IEND', b''))
+            img = Image.open(io.BytesIO(strip_png))
+            img.load()
+            if seed:
+                img = img.crop((0, 1, self.width, count + 1))
+            seed = b'\x00' + img.crop((0, count - 1, self.width, count)).tobytes()
+            yield top, img
+
+
+# |signed byte| for every byte value, to score filter output
+_ABS_SIGNED = np.abs(np.arange(256, dtype=np.int16) - (np.arange(256) >= 128) * 256).astype(np.uint8)
+
+
+def _filter_rows(rows, prior, bpp):
+    """Filter (h, n) uint8 `rows` given the row above the first one.
+
+    Every row gets the PNG filter whose output has the smallest sum of
+    absolute signed bytes (the usual libpng heuristic). Arithmetic is done
+    in uint8 wherever PNG's modulo-256 rules allow. Returns (h, n + 1)
+    uint8 with the filter type byte first.
+    """
+    x = rows
+    up = np.concatenate([prior[np.newaxis], x[:-1]])
+    left = np.zeros_like(x)
+    left[:, bpp:] = x[:, :-bpp]
+    up_left = np.zeros_like(x)
+    up_left[:, bpp:] = up[:, :-bpp]
+
+    candidates = np.empty((5,) + x.shape, dtype=np.uint8)
+    candidates[0] = x
+    np.subtract(x, left, out=candidates[1])
+    np.subtract(x, up, out=candidates[2])
+    np.subtract(x, (left >> 1) + (up >> 1) + (left & up & 1), out=candidates[3])
+
+    a, b, c = left.astype(np.int16), up.astype(np.int16), up_left.astype(np.int16)
+    pa, pb, pc = np.abs(b - c), np.abs(a - c), np.abs(a + b - 2 * c)
+    paeth = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+    np.subtract(x, paeth, out=candidates[4])
+
+    scores = np.take(_ABS_SIGNED, candidates).sum(axis=2, dtype=np.int64)
+    best = scores.argmin(axis=0)
+
+    out = np.empty((x.shape[0], x.shape[1] + 1), dtype=np.uint8)
+    out[:, 0] = best
+    out[:, 1:] = np.take_along_axis(candidates, best[np.newaxis, :, np.newaxis], axis=0)[0]
+    return out
+
+
+class PNGStripWriter:
+    """Write an RGB PNG from consecutive (rows, width, 3) uint8 strips."""
+
+    def __init__(self, out, width, height, compress_level=6):
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._own = isinstance(out, str)
+        self._file = open(out, 'wb') if self._own else out
+        self._deflater = zlib.compressobj(compress_level)
+        self._prior = np.zeros(width * 3, dtype=np.uint8)
+        self._file.write(PNG_SIGNATURE + _ihdr(width, height, 8, 2))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        elif self._own:
+            self._file.close()
+
+    def _write_idat(self, data):
+        if data:
+            self._file.write(_chunk(b'IDAT', data))
+
+    def write(self, strip):
+        strip = np.asarray(strip, dtype=np.uint8)
+        if strip.shape[1:] != (self.width, 3):
+            raise ValueError(f"Strip must be (rows, {self.width}, 3), got {strip.shape}")
+        if self.rows_written + strip.shape[0] > self.height:
+            raise ValueError("More rows written than the image height")
+        rows = strip.reshape(strip.shape[0], -1)
+        filtered = _filter_rows(rows, self._prior, 3)
+        self._prior = rows[-1].copy()
+        self._write_idat(self._deflater.compress(filtered.tobytes()))
+        self.rows_written += strip.shape[0]
+
+    def close(self):
+        """Finish the stream; raises if fewer rows than the height were written."""
+        try:
+            if self.rows_written != self.height:
+                raise ValueError(f"Wrote {self.rows_written} of {self.height} rows")
+            self._write_idat(self._deflater.flush())
+            self._file.write(_chunk(b'IEND', b''))
+        finally:
+            if self._own:
+                self._file.close()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import io
+import shutil
+import struct
+from unittest.mock import patch
+import numpy as np
+from PIL import Image
+import png_stream
+
+
+class TestPNGStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_dir = "test_env_png"
+        os.makedirs(cls.test_dir, exist_ok=True)
+        rng = np.random.default_rng(3)
+        # Smooth gradients plus noise, so every PNG filter type gets used
+        y, x = np.mgrid[0:90, 0:70]
+        base = np.stack([y * 2, x * 3, y + x], axis=2) + rng.integers(0, 6, (90, 70, 3))
+        cls.arr = (base % 256).astype(np.uint8)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def test_reader_matches_pillow(self):
+        img = Image.fromarray(self.arr)
+        for mode, converted in (('RGB', img), ('RGBA', img.convert('RGBA')), ('L', img.convert('L')),
+                                ('P', img.quantize(32))):
+            path = os.path.join(self.test_dir, f"{mode}.png")
+            converted.save(path)
+            with png_stream.PNGStripReader(path) as reader:
+                self.assertTrue(reader.streamable)
+                strips = list(reader.iter_strips(13))
+            self.assertEqual([top for top, _ in strips], list(range(0, 90, 13)))
+            joined = np.concatenate([np.asarray(s.convert('RGB')) for _, s in strips])
+            np.testing.assert_array_equal(joined, np.asarray(Image.open(path).convert('RGB')), err_msg=mode)
+
+    def test_interlaced_is_not_streamable(self):
+        # Pillow cannot write Adam7 PNGs, so build just the header
+        path = os.path.join(self.test_dir, "interlaced.png")
+        header = struct.pack('>IIBBBBB', 70, 90, 8, 2, 0, 0, 1)
+        with open(path, 'wb') as f:
+            f.write(png_stream.PNG_SIGNATURE + png_stream._chunk(b'IHDR', header) +
+                    png_stream._chunk(b'IEND', b''))
+        with png_stream.PNGStripReader(path) as reader:
+            self.assertFalse(reader.streamable)
+
+    def test_not_png(self):
+        path = os.path.join(self.test_dir, "image.bmp")
+        Image.fromarray(self.arr).save(path)
+        with self.assertRaises(ValueError):
+            png_stream.PNGStripReader(path)
+
+    def test_malformed_ihdr(self):
+        path = os.path.join(self.test_dir, "bad_ihdr.png")
+        with open(path, 'wb') as f:
+            f.write(png_stream.PNG_SIGNATURE + png_stream._chunk(b'IHDR', b'\x00\x00\x01') +
+                    png_stream._chunk(b'IEND', b''))
+        opened = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            opened.append(real_open(*args, **kwargs))
+            return opened[-1]
+
+        with patch('builtins.open', tracking_open):
+            with self.assertRaisesRegex(ValueError, "Malformed IHDR"):
+                png_stream.PNGStripReader(path)
+        self.assertTrue(opened[0].closed)
+
+    def test_writer_roundtrip(self):
+        path = os.path.join(self.test_dir, "written.png")
+        with png_stream.PNGStripWriter(path, 70, 90) as writer:
+            for top in range(0, 90, 16):
+                writer.write(self.arr[top:top + 16])
+        np.testing.assert_array_equal(np.asarray(Image.open(path)), self.arr)
+
+    def test_writer_requires_every_row(self):
+        writer = png_stream.PNGStripWriter(io.BytesIO(), 70, 90)
+        writer.write(self.arr[:50])
+        with self.assertRaises(ValueError):
+            writer.close()
+        with self.assertRaises(ValueError):
+            writer.write(self.arr[:, :10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+"""Persistent, content-addressed cache for hashes, metadata and analysis results.
+
+Results are stored per SHA-256 of the file content. A second table maps a
+file's (device, inode, size, mtime_ns) to that SHA-256, so an unchanged file
+is recognised from a stat alone. When the stat key is unknown (copied or
+touched file) the content is hashed once and any results already stored for
+that content are reused. The cache is a local SQLite database.
+
+Lookups do not write: refreshing an entry's LRU time is skipped while it is
+recent, and otherwise queued and written in batches, so parallel workers
+re-reading an unchanged tree do not queue up for the SQLite write lock.
+"""
+import os
+import json
+import time
+import sqlite3
+import threading
+import forensics_core as core
+
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.hideu', 'cache.sqlite3')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# A hit refreshes an entry's LRU time only when it is older than this (seconds)
+TOUCH_INTERVAL = 3600
+# Pending LRU refreshes are written in batches of this many
+TOUCH_BATCH = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    dev INTEGER, ino INTEGER, size INTEGER, mtime_ns INTEGER,
+    sha256 TEXT NOT NULL,
+    PRIMARY KEY (dev, ino, size, mtime_ns)
+);
+CREATE TABLE IF NOT EXISTS results (
+    sha256 TEXT, kind TEXT, value TEXT NOT NULL,
+    nbytes INTEGER NOT NULL, last_used REAL NOT NULL,
+    PRIMARY KEY (sha256, kind)
+);
+CREATE INDEX IF NOT EXISTS results_lru ON results (last_used);
+CREATE INDEX IF NOT EXISTS files_sha ON files (sha256);
+"""
+
+_open_caches = {}
+_open_lock = threading.Lock()
+
+
+def open_cache(path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """Return the shared ResultCache for `path` in this process."""
+    with _open_lock:
+        cache = _open_caches.get(path)
+        if cache is None:
+            cache = ResultCache(path, max_bytes)
+            _open_caches[path] = cache
+        return cache
+
+
+def _stat_key(stat):
+    return (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+class ResultCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # One connection per cache object; the lock serialises worker threads
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+        self.lock = threading.Lock()
+        self._touches = []
+        # Last resolved stat key, so the kinds of one file share a single lookup
+        self._last_key = None
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM results').fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self._flush_touches()
+            self.conn.commit()
+            self.conn.close()
+
+    # ---------- Lookup ----------
+    def content_key(self, path, stat=None, data=None):
+        """Return (sha256, hashes); `hashes` is set only if it had to be computed.
+
+        `data` is the file's content when the caller already holds it open.
+        """
+        stat = stat or os.stat(path)
+        key = _stat_key(stat)
+        with self.lock:
+            sha = self._known_sha(key)
+        if sha is not None:
+            return sha, None
+
+        # Fallback: hash the content; this also fills the 'hashes' entry
+        hashes = core.compute_hashes(path, data=data)
+        sha = hashes['SHA-256']
+        with self.lock:
+            self.conn.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)', key + (sha,))
+            self._put(sha, 'hashes', hashes)
+            self.conn.commit()
+            self._last_key = (key, sha)
+        return sha, hashes
+
+    def lookup(self, stat, kinds):
+        """Return {kind: value} for a file from its stat alone, or None.
+
+        None unless the stat key is known and every one of `kinds` is
+        cached; the file itself is never opened.
+        """
+        kinds = list(dict.fromkeys(kinds))
+        with self.lock:
+            sha = self._known_sha(_stat_key(stat))
+            if sha is None:
+                return None
+            marks = ','.join('?' * len(kinds))
+            rows = self.conn.execute(
+                f'SELECT kind, value, last_used FROM results WHERE sha256=? AND kind IN ({marks})',
+                [sha] + kinds).fetchall()
+            if len(rows) < len(kinds):
+                return None
+            for kind, _, last_used in rows:
+                self._touch(sha, kind, last_used)
+        return {kind: json.loads(value) for kind, value, _ in rows}
+
+    def get_or_compute(self, path, kind, compute, stat=None, data=None):
+        """Return the cached `kind` result for `path`, computing it on a miss."""
+        sha, hashes = self.content_key(path, stat, data)
+        if kind == 'hashes' and hashes is not None:
+            return hashes
+
+        with self.lock:
+            value = self._get(sha, kind)
+        if value is not None:
+            return value
+
+        value = compute(path)
+        with self.lock:
+            self._put(sha, kind, value)
+            self.conn.commit()
+        return value
+
+    def hashes(self, path, stat=None, data=None):
+        return self.get_or_compute(path, 'hashes', lambda p: core.compute_hashes(p, data=data), stat, data)
+
+    # ---------- Invalidation ----------
+    def invalidate(self, path=None):
+        """Forget cached results for `path`, or everything when path is None."""
+        with self.lock:
+            self._last_key = None
+            if path is None:
+                self.conn.execute('DELETE FROM files')
+                self.conn.execute('DELETE FROM results')
+                self.total_bytes = 0
+            else:
+                stat = os.stat(path)
+                shas = [r[0] for r in self.conn.execute(
+                    'SELECT sha256 FROM files WHERE dev=? AND ino=?', (stat.st_dev, stat.st_ino))]
+                self.conn.execute('DELETE FROM files WHERE dev=? AND ino=?', (stat.st_dev, stat.st_ino))
+                for sha in shas:
+                    self.conn.execute('DELETE FROM results WHERE sha256=?', (sha,))
+                self.total_bytes = self.conn.execute(
+                    'SELECT COALESCE(SUM(nbytes), 0) FROM results').fetchone()[0]
+            self.conn.commit()
+
+    # ---------- Internals (caller holds self.lock) ----------
+    def _known_sha(self, key):
+        if self._last_key is not None and self._last_key[0] == key:
+            return self._last_key[1]
+        row = self.conn.execute(
+            'SELECT sha256 FROM files WHERE dev=? AND ino=? AND size=? AND mtime_ns=?', key).fetchone()
+        if row is None:
+            return None
+        self._last_key = (key, row[0])
+        return row[0]
+
+    def _get(self, sha, kind):
+        row = self.conn.execute('SELECT value, last_used FROM results WHERE sha256=? AND kind=?',
+                                (sha, kind)).fetchone()
+        if row is None:
+            return None
+        self._touch(sha, kind, row[1])
+        return json.loads(row[0])
+
+    def _touch(self, sha, kind, last_used):
+        """Queue an LRU refresh for an entry that has not been used recently."""
+        now = time.time()
+        if now - last_used < TOUCH_INTERVAL:
+            return
+        self._touches.append((now, sha, kind))
+        if len(self._touches) >= TOUCH_BATCH:
+            self._flush_touches()
+            self.conn.commit()
+
+    def _flush_touches(self):
+        if self._touches:
+            self.conn.executemany('UPDATE results SET last_used=? WHERE sha256=? AND kind=?', self._touches)
+            self._touches = []
+
+    def _put(self, sha, kind, value):
+        data = json.dumps(value, default=str)
+        old = self.conn.execute('SELECT nbytes FROM results WHERE sha256=? AND kind=?',
+                                (sha, kind)).fetchone()
+        self.conn.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)',
+                          (sha, kind, data, len(data), time.time()))
+        self.total_bytes += len(data) - (old[0] if old else 0)
+        if self.total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used results until the cache is under 90% of its budget."""
+        self._flush_touches()
+        self._last_key = None
+        self.total_bytes = self.conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM results').fetchone()[0]
+        target = int(self.max_bytes * 0.9)
+        rows = self.conn.execute('SELECT sha256, kind, nbytes FROM results ORDER BY last_used')
+        doomed = []
+        for sha, kind, nbytes in rows:
+            if self.total_bytes <= target:
+                break
+            doomed.append((sha, kind))
+            self.total_bytes -= nbytes
+        self.conn.executemany('DELETE FROM results WHERE sha256=? AND kind=?', doomed)
+        self.conn.execute('DELETE FROM files WHERE sha256 NOT IN (SELECT sha256 FROM results)')
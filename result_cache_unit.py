@@ -0,0 +1,102 @@
+import unittest
+import os
+import shutil
+import hashlib
+from unittest.mock import patch
+import forensics_core as core
+import result_cache
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = "test_env_cache"
+        os.makedirs(self.test_dir, exist_ok=True)
+        self.path = os.path.join(self.test_dir, "evidence.bin")
+        with open(self.path, "wb") as f:
+            f.write(b"evidence" * 100)
+        self.cache = result_cache.ResultCache(os.path.join(self.test_dir, "cache.sqlite3"))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_stat_hit_skips_hashing(self):
+        first = self.cache.hashes(self.path)
+        self.assertEqual(first['SHA-256'], hashlib.sha256(b"evidence" * 100).hexdigest())
+        with patch('forensics_core.compute_hashes', side_effect=AssertionError("re-hashed")):
+            self.assertEqual(self.cache.hashes(self.path), first)
+
+    def test_content_fallback_after_touch(self):
+        calls = []
+        compute = lambda p: calls.append(p) or {'value': 1}
+        self.cache.get_or_compute(self.path, 'custom', compute)
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertEqual(self.cache.get_or_compute(self.path, 'custom', compute), {'value': 1})
+        self.assertEqual(len(calls), 1)
+
+    def test_changed_content_recomputes(self):
+        self.cache.hashes(self.path)
+        with open(self.path, "ab") as f:
+            f.write(b"tampered")
+        self.assertEqual(self.cache.hashes(self.path)['MD5'],
+                         hashlib.md5(b"evidence" * 100 + b"tampered").hexdigest())
+
+    def test_invalidate(self):
+        calls = []
+        compute = lambda p: calls.append(p) or [1, 2]
+        self.cache.get_or_compute(self.path, 'custom', compute)
+        self.cache.invalidate(self.path)
+        self.cache.get_or_compute(self.path, 'custom', compute)
+        self.assertEqual(len(calls), 2)
+
+    def test_lru_eviction_respects_budget(self):
+        self.cache.max_bytes = 2000
+        for i in range(20):
+            self.cache.get_or_compute(self.path, f'kind{i}', lambda p: 'x' * 200)
+        self.assertLessEqual(self.cache.total_bytes, 2000)
+        # Most recent entry survives, oldest does not
+        sha, _ = self.cache.content_key(self.path)
+        with self.cache.lock:
+            self.assertIsNotNone(self.cache._get(sha, 'kind19'))
+            self.assertIsNone(self.cache._get(sha, 'kind0'))
+
+    def test_lookup_by_stat_without_writes(self):
+        st = os.stat(self.path)
+        self.assertIsNone(self.cache.lookup(st, ['hashes']))
+        self.cache.get_or_compute(self.path, 'custom', lambda p: {'value': 1})
+        self.assertIsNone(self.cache.lookup(st, ['hashes', 'custom', 'missing']))
+        changes = self.cache.conn.total_changes
+        with patch('forensics_core.compute_hashes', side_effect=AssertionError("re-hashed")):
+            for _ in range(50):
+                found = self.cache.lookup(st, ['hashes', 'custom'])
+        self.assertEqual(found['custom'], {'value': 1})
+        # Recently used entries are not rewritten on every hit
+        self.assertEqual(self.cache.conn.total_changes, changes)
+
+    def test_stale_entries_are_touched_in_batches(self):
+        self.cache.get_or_compute(self.path, 'custom', lambda p: 1)
+        with self.cache.lock:
+            self.cache.conn.execute('UPDATE results SET last_used=0')
+        self.cache.get_or_compute(self.path, 'custom', lambda p: 2)
+        self.assertEqual(len(self.cache._touches), 1)
+        self.cache.close()
+        self.cache = result_cache.ResultCache(os.path.join(self.test_dir, "cache.sqlite3"))
+        used = self.cache.conn.execute("SELECT last_used FROM results WHERE kind='custom'").fetchone()[0]
+        self.assertGreater(used, 0)
+
+    def test_batch_rerun_does_not_open_files(self):
+        first = core.batch_entry(self.path, cache=self.cache, carve=True, entropy=True, strings=True)
+        with patch('forensics_core.open_shared', side_effect=AssertionError("opened")):
+            again = core.batch_entry(self.path, cache=self.cache, carve=True, entropy=True, strings=True)
+        self.assertEqual(again, first)
+
+    def test_core_metadata_uses_cache(self):
+        meta = core.extract_all_metadata(self.path, cache=self.cache)
+        self.assertEqual(meta['Hashes'], core.compute_hashes(self.path))
+        self.assertEqual(meta['Basic Info']['File Name'], "evidence.bin")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"""Bounded producer/consumer channel between worker threads and the GUI."""
+import time
+import queue
+
+
+_DONE = object()
+
+
+class ResultChannel:
+    """A bounded queue that the GUI drains in frame-sized chunks.
+
+    Workers `put` results and block when the GUI falls behind, so memory
+    stays bounded by `maxsize` however fast the producer is. The GUI calls
+    `drain` from a timer and gets back at most `max_items` results, stopping
+    early once its time budget for the frame is spent.
+    """
+
+    def __init__(self, maxsize=2000):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.error = None
+        self.done = False
+        self.cancelled = False
+
+    def put(self, item):
+        """Queue `item`; returns False without queueing once the channel is cancelled."""
+        while not self.cancelled:
+            try:
+                self.queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def cancel(self):
+        """Abandon the stream: the consumer stops and a blocked producer is released."""
+        self.cancelled = True
+        self.done = True
+
+    def close(self, error=None):
+        """Signal the end of the stream (optionally with the error that ended it)."""
+        self.error = error
+        self.put(_DONE)
+
+    def drain(self, max_items=500, budget=0.012):
+        """Return up to `max_items` queued results without blocking."""
+        items = []
+        deadline = time.perf_counter() + budget
+        while len(items) < max_items and not self.done:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _DONE:
+                self.done = True
+                break
+            items.append(item)
+            # Checking the clock every item is wasteful; every 64 is plenty
+            if len(items) % 64 == 0 and time.perf_counter() > deadline:
+                break
+        return items
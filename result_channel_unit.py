@@ -0,0 +1,72 @@
+import unittest
+import threading
+from result_channel import ResultChannel
+
+
+class TestResultChannel(unittest.TestCase):
+
+    def test_drain_in_chunks_until_done(self):
+        channel = ResultChannel(maxsize=100)
+        for i in range(10):
+            channel.put(i)
+        channel.close()
+        self.assertEqual(channel.drain(max_items=4), [0, 1, 2, 3])
+        self.assertFalse(channel.done)
+        self.assertEqual(channel.drain(max_items=100), [4, 5, 6, 7, 8, 9])
+        self.assertTrue(channel.done)
+        self.assertEqual(channel.drain(), [])
+
+    def test_producer_is_bounded(self):
+        """A fast producer blocks instead of growing the queue without limit."""
+        channel = ResultChannel(maxsize=5)
+        produced = []
+
+        def producer():
+            for i in range(50):
+                channel.put(i)
+                produced.append(i)
+            channel.close()
+
+        t = threading.Thread(target=producer, daemon=True)
+        t.start()
+        t.join(0.2)
+        self.assertLessEqual(len(produced), 6)
+
+        received = []
+        while not channel.done:
+            received.extend(channel.drain(max_items=7))
+        t.join(1)
+        self.assertEqual(received, list(range(50)))
+
+    def test_error_is_reported(self):
+        channel = ResultChannel()
+        channel.close(RuntimeError("disk gone"))
+        self.assertEqual(channel.drain(), [])
+        self.assertTrue(channel.done)
+        self.assertEqual(str(channel.error), "disk gone")
+
+    def test_cancel_releases_a_blocked_producer(self):
+        channel = ResultChannel(maxsize=2)
+        sent = []
+
+        def producer():
+            for i in range(10):
+                if not channel.put(i):
+                    break
+                sent.append(i)
+            channel.close()
+
+        t = threading.Thread(target=producer, daemon=True)
+        t.start()
+        t.join(0.2)
+        self.assertTrue(t.is_alive())
+        channel.cancel()
+        t.join(1)
+        self.assertFalse(t.is_alive())
+        self.assertEqual(sent, [0, 1])
+        self.assertTrue(channel.done)
+        self.assertEqual(channel.drain(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Streaming folder scanner built on os.scandir."""
+import os
+from fnmatch import fnmatch
+
+
+def _split_patterns(patterns):
+    """Accept None, a list, or a comma/space separated string of globs."""
+    if not patterns:
+        return ()
+    if isinstance(patterns, str):
+        patterns = patterns.replace(',', ' ').split()
+    return tuple(patterns)
+
+
+def _matches(name, rel_path, patterns):
+    return any(fnmatch(name, p) or fnmatch(rel_path, p) for p in patterns)
+
+
+def iter_files(root, max_depth=None, include=None, exclude=None, follow_symlinks=False):
+    """Yield (path, stat_result) for every file under `root`, as it is found.
+
+    `max_depth` counts directory levels below `root`: 0 scans only `root`
+    itself, None descends without limit. `include` globs restrict which
+    files are yielded; `exclude` globs drop files and prune whole
+    directories. Patterns match either the entry name or its path relative
+    to `root` (with '/' separators). Entries within a directory are visited
+    in name order so results are deterministic. The stat result comes from
+    the DirEntry, so callers need not stat the file again.
+    """
+    include = _split_patterns(include)
+    exclude = _split_patterns(exclude)
+    stack = [(root, '', 0)]
+    seen_dirs = set()
+
+    while stack:
+        directory, rel_dir, depth = stack.pop()
+        try:
+            if follow_symlinks:
+                # Guard against symlink loops when links are followed
+                st = os.stat(directory)
+                if (st.st_dev, st.st_ino) in seen_dirs:
+                    continue
+                seen_dirs.add((st.st_dev, st.st_ino))
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}{entry.name}"
+            if exclude and _matches(entry.name, rel_path, exclude):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=follow_symlinks):
+                    if max_depth is None or depth < max_depth:
+                        subdirs.append((entry.path, rel_path + '/', depth + 1))
+                    continue
+                if not entry.is_file(follow_symlinks=follow_symlinks):
+                    continue
+                if include and not _matches(entry.name, rel_path, include):
+                    continue
+                yield entry.path, entry.stat(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+
+        # Reverse so the stack pops subdirectories in name order
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,52 @@
+import unittest
+import os
+import shutil
+import scanner
+
+
+class TestScanner(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Build a small nested evidence tree."""
+        cls.test_dir = "test_env_scan"
+        layout = ["a.txt", "b.png", "sub/c.txt", "sub/deeper/d.txt", "skip/e.txt"]
+        for rel in layout:
+            path = os.path.join(cls.test_dir, *rel.split('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(rel.encode())
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.test_dir):
+            shutil.rmtree(cls.test_dir)
+
+    def rel(self, items):
+        return [os.path.relpath(p, self.test_dir).replace(os.sep, '/') for p, _ in items]
+
+    def test_top_level_only(self):
+        self.assertEqual(self.rel(scanner.iter_files(self.test_dir, max_depth=0)), ["a.txt", "b.png"])
+
+    def test_recursive_order_and_depth(self):
+        self.assertEqual(self.rel(scanner.iter_files(self.test_dir)),
+                         ["a.txt", "b.png", "skip/e.txt", "sub/c.txt", "sub/deeper/d.txt"])
+        self.assertEqual(self.rel(scanner.iter_files(self.test_dir, max_depth=1)),
+                         ["a.txt", "b.png", "skip/e.txt", "sub/c.txt"])
+
+    def test_include_exclude(self):
+        found = self.rel(scanner.iter_files(self.test_dir, include="*.txt", exclude="skip, deeper"))
+        self.assertEqual(found, ["a.txt", "sub/c.txt"])
+
+    def test_stat_is_reused(self):
+        path, stat = next(scanner.iter_files(self.test_dir))
+        self.assertEqual(stat.st_size, os.path.getsize(path))
+
+    def test_is_lazy(self):
+        it = scanner.iter_files(self.test_dir)
+        self.assertFalse(isinstance(it, list))
+        self.assertTrue(next(it)[0].endswith("a.txt"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,439 @@
+"""Vectorized statistical steganalysis for LSB replacement.
+
+Each detector takes one 2-D uint8 channel and returns an estimated
+embedding rate in [0, 1] (fraction of samples carrying payload bits):
+
+* chi_square_attack - Westfeld & Pfitzmann pairs-of-values test, run over
+  growing prefixes of the channel so sequential embedding (as written by
+  lsb_engine) shows up as the prefix length where the test stops firing.
+* rs_analysis       - Fridrich, Goljan & Du regular/singular groups.
+* sample_pair_analysis - Dumitrescu, Wu & Wang sample pair analysis.
+"""
+import math
+import numpy as np
+
+
+CHANNEL_NAMES = ('Red', 'Green', 'Blue')
+# RS and SPA run on at most this many samples per channel
+DEFAULT_MAX_SAMPLES = 1 << 20
+# Row segments for the growing-prefix chi-square test
+CHI_SEGMENTS = 100
+# Tile heatmap: LSB ratio this far from 0.5 scores 1, tiles below this
+# entropy (bits) are treated as flat
+LSB_BIAS_FULL = 0.05
+MIN_TILE_ENTROPY = 2.0
+
+
+# ---------- Histogram kernel ----------
+# BIT_TABLE[v, b] is bit b of value v
+BIT_TABLE = (np.arange(256)[:, np.newaxis] >> np.arange(8)) & 1
+
+
+def histograms(arr, segments=1):
+    """Count the values of every channel in one pass over `arr`.
+
+    `arr` is (H, W, C) or (H, W) uint8. Returns (segments, C, 256) counts
+    where segment s covers a contiguous run of rows, so a cumulative sum
+    over segments gives the histograms of growing prefixes in embedding
+    order. LSB and bit-plane ratios, entropy and the pairs-of-values
+    statistics all derive from these counts.
+    """
+    arr = np.asarray(arr)
+    if arr.ndim == 2:
+        arr = arr[:, :, np.newaxis]
+    height, _, depth = arr.shape
+    segments = max(1, min(segments, height))
+    bounds = (np.arange(segments + 1) * height) // segments
+    offsets = np.arange(depth, dtype=np.uint16) * 256
+    counts = np.zeros((segments, depth, 256), dtype=np.int64)
+    for segment, (lo, hi) in enumerate(zip(bounds[:-1], bounds[1:])):
+        index = (arr[lo:hi] + offsets).reshape(-1)
+        counts[segment] = np.bincount(index, minlength=depth * 256).reshape(depth, 256)
+    return counts
+
+
+def histogram_entropy(hist):
+    """Shannon entropy in bits of the histogram(s) along the last axis."""
+    hist = np.asarray(hist, dtype=np.float64)
+    total = hist.sum(axis=-1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probs = np.where(total > 0, hist / total, 0)
+        return -np.where(probs > 0, probs * np.log2(probs), 0).sum(axis=-1)
+
+
+def histogram_summary(hist):
+    """Global statistics from per-channel histograms `hist` (C, 256).
+
+    Returns a dict with the value count, LSB ones and ratio and the entropy
+    of all channels together, plus per-channel LSB ratio, entropy and
+    bit-plane ratios (bit 0 first).
+    """
+    hist = np.asarray(hist)
+    per_channel = hist.sum(axis=1)
+    planes = hist @ BIT_TABLE
+    total = int(per_channel.sum())
+    lsb_ones = int(planes[:, 0].sum())
+    channels = {}
+    for idx, name in enumerate(CHANNEL_NAMES[:len(hist)]):
+        count = max(1, int(per_channel[idx]))
+        channels[name] = {
+            'lsb_ratio': planes[idx, 0] / count,
+            'entropy': float(histogram_entropy(hist[idx])),
+            'bit_planes': (planes[idx] / count).tolist(),
+        }
+    return {
+        'values': total,
+        'lsb_ones': lsb_ones,
+        'lsb_ratio': lsb_ones / total if total else 0.0,
+        'entropy': float(histogram_entropy(hist.sum(axis=0))),
+        'channels': channels,
+    }
+
+
+# ---------- Chi-square (pairs of values) ----------
+def _gamma_q(a, x):
+    """Regularised upper incomplete gamma function Q(a, x)."""
+    if x <= 0:
+        return 1.0
+    log_prefix = -x + a * math.log(x) - math.lgamma(a)
+    if x < a + 1:
+        # Series for P(a, x)
+        term = total = 1.0 / a
+        n = a
+        for _ in range(1000):
+            n += 1
+            term *= x / n
+            total += term
+            if abs(term) < abs(total) * 1e-12:
+                break
+        return max(0.0, 1.0 - total * math.exp(log_prefix))
+    # Continued fraction for Q(a, x) (modified Lentz)
+    tiny = 1e-300
+    b = x + 1 - a
+    c = 1 / tiny
+    d = 1 / b
+    h = d
+    for i in range(1, 1000):
+        an = -i * (i - a)
+        b += 2
+        d = an * d + b
+        d = tiny if abs(d) < tiny else d
+        c = b + an / c
+        c = tiny if abs(c) < tiny else c
+        d = 1 / d
+        delta = d * c
+        h *= delta
+        if abs(delta - 1) < 1e-12:
+            break
+    return min(1.0, math.exp(log_prefix) * h)
+
+
+def chi_square_p_value(hist, min_expected=4):
+    """Probability that a 256-bin histogram has equalised value pairs."""
+    hist = np.asarray(hist, dtype=np.float64)
+    even, odd = hist[0::2], hist[1::2]
+    expected = (even + odd) / 2
+    keep = expected > min_expected
+    dof = int(keep.sum()) - 1
+    if dof < 1:
+        return 0.0
+    chi2 = float((((even[keep] - expected[keep]) ** 2) / expected[keep]).sum())
+    return _gamma_q(dof / 2, chi2 / 2)
+
+
+def chi_square_from_counts(counts, threshold=0.5):
+    """Run the pairs-of-values test over growing prefixes.
+
+    `counts` holds one 256-bin histogram per segment, in embedding order.
+    The estimate is the longest prefix whose p-value is still above
+    `threshold`. Returns (rate, p_values).
+    """
+    counts = np.asarray(counts)
+    if counts.size == 0 or counts.sum() == 0:
+        return 0.0, np.zeros(0)
+    prefix = np.cumsum(counts, axis=0)
+    p_values = np.array([chi_square_p_value(h) for h in prefix])
+    # Tiny early prefixes give noisy p-values, so take the last one that fires
+    above = np.nonzero(p_values > threshold)[0]
+    embedded_segments = above[-1] + 1 if above.size else 0
+    return float(embedded_segments / len(counts)), p_values
+
+
+def chi_square_attack(channel, segments=CHI_SEGMENTS, threshold=0.5):
+    """Estimate the sequentially embedded fraction of a 2-D `channel`.
+
+    The channel is split into `segments` runs of rows; see
+    chi_square_from_counts. Returns (rate, p_values).
+    """
+    return chi_square_from_counts(histograms(channel, segments)[:, 0], threshold)
+
+
+# ---------- RS analysis ----------
+def _variation(values, deltas=None, mask=None):
+    """Sum of absolute neighbour differences within each group.
+
+    `values` holds groups with the group axis first, (k, ...), so each
+    position is one contiguous array. With `deltas`, position j is first
+    changed by mask[j] * deltas[j].
+    """
+    total = 0
+    previous = None
+    for j in range(len(values)):
+        current = values[j]
+        if deltas is not None and mask[j]:
+            current = current + mask[j] * deltas[j]
+        if previous is not None:
+            total = total + np.abs(current - previous)
+        previous = current
+    return total
+
+
+def _rs_signs(values, deltas, mask):
+    """Classify groups under masks +mask and -mask.
+
+    `deltas` is the change applied by the flip F1 (+1 for even values, -1
+    for odd); F-1 applies the opposite change. Returns two arrays with +1
+    for regular, -1 for singular and 0 for unusable groups.
+    """
+    base = _variation(values)
+    pos = _variation(values, deltas, mask)
+    neg = _variation(values, -deltas, mask)
+    return np.sign(pos - base), np.sign(neg - base)
+
+
+def _rs_statistics(values, mask, axis=None):
+    """Return (d0, n0, d1, n1): regular minus singular fractions for +mask and
+    -mask, before and after flipping every LSB, averaged over `axis`.
+
+    `values` is int16 with the group axis first, (k, ...); `axis` refers to
+    the remaining axes.
+    """
+    deltas = 1 - 2 * (values & 1)
+    pos, neg = _rs_signs(values, deltas, mask)
+    # Same statistics after flipping every LSB (F1 is x ^ 1)
+    pos_flipped, neg_flipped = _rs_signs(values ^ 1, -deltas, mask)
+    return tuple(s.mean(axis=axis) for s in (pos, neg, pos_flipped, neg_flipped))
+
+
+def _rs_rate(d0, n0, d1, n1):
+    """Solve the RS quadratic for the embedding rate (works on arrays)."""
+    d0, n0, d1, n1 = (np.asarray(s, dtype=np.float64) for s in (d0, n0, d1, n1))
+    a = 2 * (d1 + d0)
+    b = n0 - n1 - d1 - 3 * d0
+    c = d0 - n0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        linear = np.where(np.abs(b) < 1e-12, 0.0, -c / b)
+        disc = b * b - 4 * a * c
+        root = np.sqrt(np.maximum(disc, 0))
+        plus, minus = (-b + root) / (2 * a), (-b - root) / (2 * a)
+        quadratic = np.where(disc < 0, -b / (2 * a), np.where(np.abs(plus) < np.abs(minus), plus, minus))
+        x = np.where(np.abs(a) < 1e-12, linear, quadratic)
+        rate = np.where(np.abs(x - 0.5) < 1e-12, 1.0, x / (x - 0.5))
+    return np.clip(np.nan_to_num(rate), 0.0, 1.0)
+
+
+def rs_analysis(channel, mask=(0, 1, 1, 0)):
+    """Estimate the embedding rate of `channel` with RS analysis."""
+    channel = np.asarray(channel)
+    k = len(mask)
+    width = channel.shape[-1] - channel.shape[-1] % k
+    if width == 0 or channel.size == 0:
+        return 0.0
+    values = np.ascontiguousarray(channel[..., :width].reshape(-1, k).T, dtype=np.int16)
+    return float(_rs_rate(*_rs_statistics(values, mask)))
+
+
+# ---------- Sample pair analysis ----------
+def _pair_counts(u, v):
+    """Return (x, y, k, n) sample pair counts for adjacent samples u, v."""
+    even = (v & 1) == 0
+    x = np.count_nonzero(np.where(even, u < v, u > v))
+    y = np.count_nonzero(np.where(even, u > v, u < v))
+    k = np.count_nonzero(((u + 1) >> 1) == ((v + 1) >> 1))
+    return x, y, k, u.size
+
+
+def sample_pair_analysis(channel):
+    """Estimate the embedding rate of `channel` with sample pair analysis.
+
+    Uses horizontally and vertically adjacent pairs and solves the
+    Dumitrescu quadratic for the fraction of flipped LSBs; with random
+    message bits half the embedded samples are flipped, so the rate is
+    twice that fraction.
+    """
+    ch = np.asarray(channel).astype(np.int16)
+    x = y = k = n = 0
+    for u, v in ((ch[..., :, :-1], ch[..., :, 1:]), (ch[..., :-1, :], ch[..., 1:, :])):
+        counts = _pair_counts(u, v)
+        x, y, k, n = x + counts[0], y + counts[1], k + counts[2], n + counts[3]
+    if k == 0:
+        return 0.0
+
+    a = 2 * k
+    b = 2 * (2 * x - n)
+    c = y - x
+    disc = b * b - 4 * a * c
+    beta = -b / (2 * a) if disc < 0 else (-b - math.sqrt(disc)) / (2 * a)
+    return float(min(1.0, max(0.0, 2 * beta)))
+
+
+# ---------- Whole image ----------
+def band_picks(height, width, max_samples=DEFAULT_MAX_SAMPLES, band_rows=32):
+    """Indices of evenly spaced `band_rows`-row bands to sample, or None for all rows.
+
+    RS and SPA are statistical, so a million or so samples spread over the
+    whole image estimate the rate as well as every pixel would. Keeping
+    whole bands preserves the vertical neighbours SPA needs.
+    """
+    if height * width <= max_samples or height < band_rows * 2:
+        return None
+    total_bands = height // band_rows
+    wanted = max(1, min(total_bands, max_samples // (band_rows * width)))
+    return np.unique(np.linspace(0, total_bands - 1, wanted).astype(np.int64))
+
+
+def sample_bands(channel, max_samples=DEFAULT_MAX_SAMPLES, band_rows=32):
+    """Return the sampled bands of `channel` as (bands, rows, W); see band_picks."""
+    channel = np.asarray(channel)
+    height, width = channel.shape[:2]
+    picks = band_picks(height, width, max_samples, band_rows)
+    if picks is None:
+        return channel[np.newaxis]
+    total_bands = height // band_rows
+    bands = channel[:total_bands * band_rows].reshape(total_bands, band_rows, width, *channel.shape[2:])
+    return bands[picks]
+
+
+def _channel_rates(counts, samples):
+    """Per-channel estimates from segment `counts` (S, C, 256) and sampled
+    bands `samples` (bands, rows, W, C)."""
+    results = {}
+    for idx, name in enumerate(CHANNEL_NAMES[:counts.shape[1]]):
+        chi_rate, p_values = chi_square_from_counts(counts[:, idx])
+        sample = samples[..., idx]
+        results[name] = {
+            'chi_square': chi_rate,
+            'chi_square_p': float(p_values[-1]) if p_values.size else 1.0,
+            'rs': rs_analysis(sample),
+            'spa': sample_pair_analysis(sample),
+        }
+    return results
+
+
+def analyze_array(arr, max_samples=DEFAULT_MAX_SAMPLES, counts=None):
+    """Run every detector on each channel of an (H, W, 3) uint8 array.
+
+    The chi-square attack uses `counts` from histograms(arr, CHI_SEGMENTS),
+    computed here if not given; RS and SPA run on at most `max_samples`
+    samples per channel (see band_picks). Returns
+    {channel name: {'chi_square': rate, 'chi_square_p': p, 'rs': rate,
+    'spa': rate}}, where `chi_square_p` is the p-value of the whole channel;
+    a low value there means the equalised prefix is followed by clean data.
+    """
+    if counts is None:
+        counts = histograms(arr, CHI_SEGMENTS)
+    return _channel_rates(counts, sample_bands(arr, max_samples))
+
+
+# ---------- Tiles ----------
+def tile_statistics(arr, tile=64, mask=(0, 1, 1, 0)):
+    """Per-tile LSB ratio, entropy and RS embedding-rate estimate.
+
+    `arr` is an (H, W, C) uint8 array; partial tiles at the right and bottom
+    edges are ignored. Each strip of tiles is a reshaped view of the input,
+    so only one strip's worth of temporaries exists at a time. Returns a
+    dict with `tile` and (H // tile, W // tile) arrays `lsb_ratio`,
+    `entropy`, `rs` and `heatmap`.
+
+    The heatmap is the larger of the RS estimate and the LSB bias (distance
+    of the LSB ratio from one half, saturating at LSB_BIAS_FULL). Random
+    payloads show up in RS; text payloads such as the ones lsb_engine
+    writes skew the LSB ratio. Near-flat tiles get no LSB bias score since
+    saturated areas skew it naturally.
+    """
+    k = len(mask)
+    if tile % k:
+        raise ValueError(f"Tile size must be a multiple of {k}")
+    height, width, depth = arr.shape
+    rows, cols = height // tile, width // tile
+    lsb_ratio = np.zeros((rows, cols))
+    entropy = np.zeros((rows, cols))
+    stats = np.zeros((4, rows, cols))
+    offsets = (np.arange(cols, dtype=np.int32) * 256)[np.newaxis, :, np.newaxis, np.newaxis]
+    samples = tile * tile * depth
+
+    for row in range(rows):
+        # (y, tile column, x, channel) view of one strip of tiles
+        blocks = arr[row * tile:(row + 1) * tile, :cols * tile].reshape(tile, cols, tile, depth)
+        hist = np.bincount((blocks + offsets).ravel(), minlength=cols * 256).reshape(cols, 256)
+        lsb_ratio[row] = hist[:, 1::2].sum(axis=1) / samples
+        entropy[row] = histogram_entropy(hist)
+
+        # Horizontal groups of k values within each channel, grouped per tile
+        groups = blocks.transpose(1, 0, 3, 2).reshape(cols, -1, k)
+        values = np.ascontiguousarray(np.moveaxis(groups, 2, 0), dtype=np.int16)
+        stats[:, row] = _rs_statistics(values, mask, axis=1)
+
+    rs = _rs_rate(*stats)
+    bias = np.clip(np.abs(lsb_ratio - 0.5) / LSB_BIAS_FULL, 0.0, 1.0)
+    bias[entropy < MIN_TILE_ENTROPY] = 0.0
+    return {
+        'tile': tile,
+        'lsb_ratio': lsb_ratio,
+        'entropy': entropy,
+        'rs': rs,
+        'heatmap': np.maximum(rs, bias),
+    }
+
+
+# ---------- Streaming ----------
+def analyze_stream(strips, shape, tile=64, max_samples=DEFAULT_MAX_SAMPLES, band_rows=32):
+    """Run the whole-image and tile analyses over consecutive row strips.
+
+    `strips` yields (first_row, (rows, W, C) uint8 array) top to bottom, as
+    lsb_engine.iter_rgb_strips does; `shape` is the full (H, W, C). Every
+    strip except the last must be a multiple of `tile` (and so of
+    `band_rows`, which must divide `tile`) rows high. Only the
+    sampled RS/SPA bands are kept, so memory does not grow with the image.
+    Returns {'counts': segment histograms, 'rates': per-channel estimates
+    as analyze_array, 'tiles': tile_statistics output or None}.
+    """
+    height, width, depth = shape
+    segments = max(1, min(CHI_SEGMENTS, height))
+    bounds = (np.arange(segments + 1) * height) // segments
+    counts = np.zeros((segments, depth, 256), dtype=np.int64)
+    picks = band_picks(height, width, max_samples, band_rows)
+    kept = []
+    tile_parts = []
+
+    for top, strip in strips:
+        bottom = top + strip.shape[0]
+        if top % tile:
+            raise ValueError(f"Strips must start on a multiple of {tile} rows")
+        first = np.searchsorted(bounds, top, side='right') - 1
+        for segment in range(first, segments):
+            lo, hi = max(bounds[segment], top), min(bounds[segment + 1], bottom)
+            if lo >= hi:
+                break
+            counts[segment] += histograms(strip[lo - top:hi - top])[0]
+
+        if width >= tile and strip.shape[0] >= tile:
+            tile_parts.append(tile_statistics(strip, tile))
+
+        if picks is None:
+            kept.append(strip)
+        else:
+            for band in picks[(picks * band_rows >= top) & (picks * band_rows < bottom)]:
+                start = band * band_rows - top
+                kept.append(strip[start:start + band_rows])
+
+    if picks is None:
+        samples = (np.concatenate(kept) if kept else np.zeros((0, width, depth), np.uint8))[np.newaxis]
+    else:
+        samples = np.stack(kept)
+    tiles = None
+    if tile_parts:
+        tiles = {key: np.concatenate([part[key] for part in tile_parts])
+                 for key in ('lsb_ratio', 'entropy', 'rs', 'heatmap')}
+        tiles['tile'] = tile
+    return {'counts': counts, 'rates': _channel_rates(counts, samples), 'tiles': tiles}
@@ -0,0 +1,111 @@
+import unittest
+import numpy as np
+import steganalysis as sa
+
+
+def smooth_cover(rng, height=512, width=512):
+    """Box-blurred noise: smooth like a photo, with a little sensor noise."""
+    k = 8
+    c = np.cumsum(np.cumsum(rng.normal(size=(height + k, width + k)), 0), 1)
+    field = c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]
+    field = (field - field.min()) / (field.max() - field.min()) * 200 + 20
+    field += rng.normal(scale=2.0, size=field.shape)
+    return np.clip(field, 0, 255).astype(np.uint8)
+
+
+def embed_random(rng, channel, rate):
+    flat = channel.copy().ravel()
+    idx = rng.choice(flat.size, int(rate * flat.size), replace=False)
+    flat[idx] = (flat[idx] & 0xFE) | rng.integers(0, 2, idx.size, dtype=np.uint8)
+    return flat.reshape(channel.shape)
+
+
+class TestSteganalysis(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.cover = smooth_cover(self.rng)
+
+    def test_histograms_single_pass(self):
+        arr = self.rng.integers(0, 256, (50, 40, 3), dtype=np.uint8)
+        counts = sa.histograms(arr, segments=10)
+        self.assertEqual(counts.shape, (10, 3, 256))
+        for idx in range(3):
+            expected = np.bincount(arr[:, :, idx].ravel(), minlength=256)
+            np.testing.assert_array_equal(counts.sum(axis=0)[idx], expected)
+        # Segments are row runs in embedding order
+        np.testing.assert_array_equal(counts[0, 0], np.bincount(arr[:5, :, 0].ravel(), minlength=256))
+
+    def test_histogram_summary(self):
+        arr = self.rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+        summary = sa.histogram_summary(sa.histograms(arr).sum(axis=0))
+        self.assertEqual(summary['values'], arr.size)
+        self.assertEqual(summary['lsb_ones'], int(np.count_nonzero(arr & 1)))
+        values, counts = np.unique(arr, return_counts=True)
+        probs = counts / arr.size
+        self.assertAlmostEqual(summary['entropy'], float(-(probs * np.log2(probs)).sum()))
+        green = summary['channels']['Green']
+        self.assertAlmostEqual(green['bit_planes'][7], float(np.mean(arr[:, :, 1] >> 7)))
+
+    def test_chi_square_p_value(self):
+        self.assertGreater(sa.chi_square_p_value(np.full(256, 100)), 0.99)
+        even_only = np.zeros(256)
+        even_only[0::2] = 100
+        self.assertLess(sa.chi_square_p_value(even_only), 1e-6)
+
+    def test_chi_square_finds_sequential_prefix(self):
+        # An all-even cover fails the test everywhere outside the payload
+        channel = (self.cover & 0xFE).ravel()
+        n = int(channel.size * 0.4)
+        channel[:n] |= self.rng.integers(0, 2, n, dtype=np.uint8)
+        rate, p_values = sa.chi_square_attack(channel.reshape(self.cover.shape))
+        self.assertEqual(len(p_values), 100)
+        self.assertAlmostEqual(rate, 0.4, delta=0.05)
+
+    def test_rs_and_spa_track_embedding_rate(self):
+        self.assertLess(sa.rs_analysis(self.cover), 0.15)
+        self.assertLess(sa.sample_pair_analysis(self.cover), 0.15)
+        stego = embed_random(self.rng, self.cover, 0.5)
+        self.assertAlmostEqual(sa.rs_analysis(stego), 0.5, delta=0.2)
+        self.assertAlmostEqual(sa.sample_pair_analysis(stego), 0.5, delta=0.2)
+
+    def test_sample_bands(self):
+        channel = np.zeros((640, 100), dtype=np.uint8)
+        self.assertEqual(sa.sample_bands(channel, max_samples=10 ** 6).shape, (1, 640, 100))
+        self.assertEqual(sa.sample_bands(channel, max_samples=6400, band_rows=32).shape, (2, 32, 100))
+
+    def test_tile_heatmap_marks_sequential_payload(self):
+        arr = np.stack([self.cover] * 3, axis=2)
+        flat = arr.reshape(-1)
+        # ASCII text in the first quarter of the image, written the way lsb_engine does
+        message = b'The quick brown fox jumps over the lazy dog. '
+        text = np.frombuffer(message * (flat.size // 4 // 8 // len(message)), dtype=np.uint8)
+        bits = np.unpackbits(text)
+        flat[:bits.size] = (flat[:bits.size] & 0xFE) | bits
+        tiles = sa.tile_statistics(arr, tile=64)
+        self.assertEqual(tiles['heatmap'].shape, (8, 8))
+        self.assertGreater(tiles['heatmap'][:2].mean(), 0.8)
+        self.assertLess(tiles['heatmap'][3:].mean(), 0.4)
+        with self.assertRaises(ValueError):
+            sa.tile_statistics(arr, tile=30)
+
+    def test_analyze_stream_matches_in_memory(self):
+        arr = np.stack([self.cover] * 3, axis=2)
+        strips = ((top, arr[top:top + 128]) for top in range(0, arr.shape[0], 128))
+        stream = sa.analyze_stream(strips, arr.shape, tile=64, max_samples=50_000)
+        self.assertEqual(stream['rates'], sa.analyze_array(arr, max_samples=50_000))
+        np.testing.assert_array_equal(stream['counts'], sa.histograms(arr, sa.CHI_SEGMENTS))
+        np.testing.assert_allclose(stream['tiles']['heatmap'], sa.tile_statistics(arr, 64)['heatmap'])
+
+    def test_analyze_array(self):
+        arr = np.stack([self.cover] * 3, axis=2)
+        results = sa.analyze_array(arr)
+        self.assertEqual(list(results), list(sa.CHANNEL_NAMES))
+        for estimates in results.values():
+            self.assertEqual(set(estimates), {'chi_square', 'chi_square_p', 'rs', 'spa'})
+            for rate in estimates.values():
+                self.assertTrue(0.0 <= rate <= 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,17 +1,29 @@
 import os
-import hashlib
 import json
 import threading
-import struct
+import time
 from datetime import datetime
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
-from PIL import Image, ExifTags, ImageTk
-import PyPDF2
-import docx
-import openpyxl
-import exifread
-import numpy as np
+from tkinter import ttk, filedialog, messagebox, scrolledtext, font as tkfont
+import forensics_core as core
+import batch_engine
+import result_cache
+import hexview
+import hexsearch
+import archives
+from result_channel import ResultChannel
+
+
+# Batch view refresh: rows are inserted in chunks on a fixed frame budget
+BATCH_FRAME_MS = 16
+BATCH_FRAME_BUDGET = 0.010
+BATCH_ROWS_PER_FRAME = 200
+BATCH_STATUS_INTERVAL = 0.25
+BATCH_CHANNEL_SIZE = 5000
+# Wait this long after the last file selection before building a preview
+PREVIEW_DEBOUNCE_MS = 150
+# Height (pixels) of the entropy strip above the hex view
+ENTROPY_CHART_HEIGHT = 48
 
 
 class ModernForensicsTool:
@@ -39,7 +51,35 @@ class ModernForensicsTool:
         
         self.selected_file = tk.StringVar()
         self.selected_folder = tk.StringVar()
+        self.batch_workers = tk.IntVar(value=batch_engine.default_workers())
+        self.batch_recursive = tk.BooleanVar(value=False)
+        self.batch_max_depth = tk.StringVar(value="")
+        self.batch_include = tk.StringVar(value="")
+        self.batch_exclude = tk.StringVar(value="")
+        self.batch_carve = tk.BooleanVar(value=False)
+        self.batch_entropy = tk.BooleanVar(value=False)
+        self.batch_archive_depth = tk.IntVar(value=0)
+        self.batch_strings = tk.BooleanVar(value=False)
+        self.batch_perceptual = tk.BooleanVar(value=False)
+        # Perceptual hashes of the running batch, for near-duplicate matching
+        self.batch_hash_index = None
+        self.batch_channel = None
         self.secret_message = tk.StringVar()
+        self.use_cache = tk.BooleanVar(value=True)
+        self.hex_offset = tk.StringVar()
+        self.hex_file = None
+        self.hex_top_line = 0
+        self.hex_visible_lines = 40
+        self.hex_highlight = None
+        self.hex_entropy = None
+        self.hex_entropy_token = 0
+        self.hex_search_text = tk.StringVar()
+        self.hex_search_mode = tk.StringVar(value='hex')
+        self.hex_search_case = tk.BooleanVar(value=False)
+        self.hex_search_cancel = None
+        self.hex_hit_offsets = []
+        self.preview_pending = None
+        self.preview_token = 0
         self.current_file_type = tk.StringVar(value="📁 WAITING FOR INPUT...")
         
         self.current_metadata = {}
@@ -217,6 +257,7 @@ class ModernForensicsTool:
         
         # Action Button
         ttk.Button(file_card, text="⚡ EXTRACT METADATA", command=self.extract_single_file, style='Primary.TButton').pack(fill='x')
+        ttk.Checkbutton(file_card, text="Reuse cached results", variable=self.use_cache).pack(anchor='w', pady=(10,0))
 
         # Stego Card
         stego_card = ttk.LabelFrame(parent, text=" STEGO OPERATIONS ", style='Card.TLabelframe', padding=15)
@@ -231,12 +272,14 @@ class ModernForensicsTool:
         ttk.Button(row, text="🔓 REVEAL", command=self.decode_steganography, style='Success.TButton').pack(side='right', fill='x', expand=True, padx=(2,0))
         
         ttk.Button(stego_card, text="🔎 ANALYZE IMAGE", command=self.analyze_steganography, style='Accent.TButton').pack(fill='x', pady=(5,0))
+        ttk.Button(stego_card, text="🧲 CARVE HIDDEN DATA", command=self.carve_hidden_data, style='Accent.TButton').pack(fill='x', pady=(5,0))
 
         # Export Card
         export_card = ttk.LabelFrame(parent, text=" REPORTING ", style='Card.TLabelframe', padding=15)
         export_card.pack(fill='x')
         ttk.Button(export_card, text="💾 EXPORT JSON", command=self.export_to_json, style='Primary.TButton').pack(fill='x', pady=(0,5))
-        ttk.Button(export_card, text="🗑️ CLEAR SESSION", command=self.clear_results, style='Accent.TButton').pack(fill='x')
+        ttk.Button(export_card, text="🗑️ CLEAR SESSION", command=self.clear_results, style='Accent.TButton').pack(fill='x', pady=(0,5))
+        ttk.Button(export_card, text="🧹 CLEAR CACHE", command=self.clear_cache, style='Accent.TButton').pack(fill='x')
 
     # ---------- Metadata Tab ----------
     def setup_metadata_tab(self, parent):
@@ -322,14 +365,35 @@ class ModernForensicsTool:
         
         ttk.Button(controls, text="▶ START BATCH", command=self.process_batch, style='Success.TButton').pack(side='left', padx=5)
         ttk.Button(controls, text="📊 SAVE REPORT", command=self.generate_batch_report, style='Primary.TButton').pack(side='left', padx=5)
+        ttk.Label(controls, text="Workers:").pack(side='left', padx=(15, 5))
+        ttk.Spinbox(controls, from_=1, to=256, width=5, textvariable=self.batch_workers).pack(side='left')
         ttk.Button(controls, text="🗑️ CLEAR", command=lambda: self.batch_tree.delete(*self.batch_tree.get_children()), style='Accent.TButton').pack(side='right', padx=5)
 
+        # Scan options (recursion depth, include/exclude globs)
+        options = ttk.Frame(parent, style='TFrame')
+        options.pack(fill='x', padx=10, pady=(0, 10))
+        ttk.Checkbutton(options, text="Recursive", variable=self.batch_recursive).pack(side='left', padx=5)
+        ttk.Label(options, text="Max depth:").pack(side='left', padx=(10, 5))
+        ttk.Entry(options, textvariable=self.batch_max_depth, width=5, style='Modern.TEntry').pack(side='left')
+        ttk.Label(options, text="Include:").pack(side='left', padx=(10, 5))
+        ttk.Entry(options, textvariable=self.batch_include, width=18, style='Modern.TEntry').pack(side='left')
+        ttk.Label(options, text="Exclude:").pack(side='left', padx=(10, 5))
+        ttk.Entry(options, textvariable=self.batch_exclude, width=18, style='Modern.TEntry').pack(side='left')
+        ttk.Checkbutton(options, text="Carve appended data", variable=self.batch_carve).pack(side='left', padx=(10, 5))
+        ttk.Checkbutton(options, text="Entropy profile", variable=self.batch_entropy).pack(side='left', padx=5)
+        ttk.Checkbutton(options, text="Extract strings", variable=self.batch_strings).pack(side='left', padx=5)
+        ttk.Checkbutton(options, text="Near-duplicate images", variable=self.batch_perceptual).pack(side='left', padx=5)
+        ttk.Label(options, text="Archive depth:").pack(side='left', padx=(10, 5))
+        ttk.Spinbox(options, from_=0, to=8, width=3, textvariable=self.batch_archive_depth).pack(side='left')
+
         # Tree
         tree_frame = ttk.Frame(parent, style='TFrame')
         tree_frame.pack(fill='both', expand=True, padx=10, pady=(0,10))
 
-        cols = ('File', 'Type', 'Size', 'MD5', 'Status', 'Modified')
-        self.batch_tree = ttk.Treeview(tree_frame, columns=cols, show='headings', style='Modern.Treeview')
+        cols = ('File', 'Type', 'Size', 'MD5', 'Status', 'Modified', 'Entropy', 'Similar')
+        # The tree column only holds the expanders of archive member rows
+        self.batch_tree = ttk.Treeview(tree_frame, columns=cols, show='tree headings', style='Modern.Treeview')
+        self.batch_tree.column('#0', width=30, stretch=False)
         
         for col in cols:
             self.batch_tree.heading(col, text=col.upper())
@@ -346,16 +410,59 @@ class ModernForensicsTool:
         top_bar = ttk.Frame(parent, style='TFrame')
         top_bar.pack(fill='x', padx=10, pady=10)
         
-        ttk.Button(top_bar, text="LOAD HEX FOR CURRENT FILE", command=self.load_hex_view, style='Primary.TButton').pack(anchor='w')
+        ttk.Button(top_bar, text="LOAD HEX FOR CURRENT FILE", command=self.load_hex_view, style='Primary.TButton').pack(side='left')
+        ttk.Button(top_bar, text="💾 EXPORT FULL DUMP", command=self.export_hex_dump, style='Accent.TButton').pack(side='left', padx=5)
+        ttk.Button(top_bar, text="GO", command=self.hex_jump_to_offset, style='Accent.TButton').pack(side='right')
+        ttk.Entry(top_bar, textvariable=self.hex_offset, width=18, style='Modern.TEntry').pack(side='right', padx=5)
+        ttk.Label(top_bar, text="Offset (0x.. or decimal):").pack(side='right')
+
+        # Byte entropy strip: one bar per pixel column, click to jump there
+        self.entropy_canvas = tk.Canvas(parent, height=ENTROPY_CHART_HEIGHT, bg='#0f172a',
+                                        highlightthickness=0)
+        self.entropy_canvas.pack(fill='x', padx=10, pady=(0, 5))
+        self.entropy_canvas.bind('<Configure>', lambda e: self.draw_entropy_chart())
+        self.entropy_canvas.bind('<Button-1>', self.on_entropy_click)
+
+        # Search bar: hex bytes ('??' = any byte), ASCII, UTF-16LE or regex
+        search_bar = ttk.Frame(parent, style='TFrame')
+        search_bar.pack(fill='x', padx=10, pady=(0, 5))
+        ttk.Label(search_bar, text="Search:").pack(side='left')
+        ttk.Combobox(search_bar, textvariable=self.hex_search_mode, values=hexsearch.MODES,
+                     width=7, state='readonly').pack(side='left', padx=5)
+        search_entry = ttk.Entry(search_bar, textvariable=self.hex_search_text, width=40, style='Modern.TEntry')
+        search_entry.pack(side='left')
+        search_entry.bind('<Return>', lambda e: self.hex_search())
+        ttk.Checkbutton(search_bar, text="Ignore case", variable=self.hex_search_case).pack(side='left', padx=5)
+        ttk.Button(search_bar, text="🔍 FIND ALL", command=self.hex_search, style='Primary.TButton').pack(side='left', padx=5)
+        ttk.Button(search_bar, text="🔤 STRINGS", command=self.hex_strings, style='Primary.TButton').pack(side='left', padx=(0, 5))
+        ttk.Button(search_bar, text="✖ CANCEL", command=self.cancel_hex_search, style='Accent.TButton').pack(side='left')
 
         hex_frame = ttk.Frame(parent, style='TFrame')
         hex_frame.pack(fill='both', expand=True, padx=10, pady=(0,10))
 
-        self.hex_text = scrolledtext.ScrolledText(hex_frame, wrap=tk.NONE,
-                                                 bg='#0f172a', fg='#38bdf8',  # Dark BG, Cyan Text
-                                                 insertbackground='white',
-                                                 font=('Consolas', 10), borderwidth=0)
-        self.hex_text.pack(fill='both', expand=True)
+        # Virtualized view: the Text widget only ever holds the visible lines,
+        # the scrollbar is driven by line positions in the memory-mapped file.
+        self.hex_text = tk.Text(hex_frame, wrap=tk.NONE,
+                                bg='#0f172a', fg='#38bdf8',  # Dark BG, Cyan Text
+                                insertbackground='white',
+                                font=('Consolas', 10), borderwidth=0)
+        self.hex_text.tag_configure('hit', background=self.colors['accent'], foreground='#0f172a')
+        self.hex_scroll = ttk.Scrollbar(hex_frame, orient='vertical', command=self.on_hex_scroll,
+                                        style='Modern.Vertical.TScrollbar')
+        # Search hits or strings; selecting one jumps the view to it
+        self.hex_hits = tk.Listbox(hex_frame, width=36, bg='#1e293b', fg='#e2e8f0', font=('Consolas', 10),
+                                   borderwidth=0, highlightthickness=0, selectbackground=self.colors['accent'])
+        self.hex_hits.bind('<<ListboxSelect>>', self.on_hex_hit_select)
+        self.hex_hits.pack(side='right', fill='y', padx=(5, 0))
+        self.hex_scroll.pack(side='right', fill='y')
+        self.hex_text.pack(side='left', fill='both', expand=True)
+
+        self.hex_text.bind('<Configure>', self.on_hex_resize)
+        self.hex_text.bind('<MouseWheel>', lambda e: self.hex_scroll_lines(-3 if e.delta > 0 else 3))
+        self.hex_text.bind('<Button-4>', lambda e: self.hex_scroll_lines(-3))
+        self.hex_text.bind('<Button-5>', lambda e: self.hex_scroll_lines(3))
+        self.hex_text.bind('<Prior>', lambda e: self.hex_scroll_lines(-self.hex_visible_lines))
+        self.hex_text.bind('<Next>', lambda e: self.hex_scroll_lines(self.hex_visible_lines))
 
     # ---------- Utility Methods ----------
     def update_status(self, message, is_error=False):
@@ -379,12 +486,7 @@ class ModernForensicsTool:
             self.update_status(f"✅ Selected: {os.path.basename(f)}")
 
     def update_file_type(self, filename):
-        ext = os.path.splitext(filename)[1].lower()
-        icons = {'.jpg':'🖼️','.jpeg':'🖼️','.png':'🖼️','.gif':'🖼️','.bmp':'🖼️','.tiff':'🖼️',
-                '.pdf':'📄','.docx':'📝','.doc':'📝','.xlsx':'📊','.txt':'📃','.zip':'📦',
-                '.rar':'📦','.7z':'📦','.exe':'⚙️','.dll':'⚙️'}
-        icon = icons.get(ext, '📁')
-        self.current_file_type.set(f"{icon} {ext[1:].upper() if ext else 'UNKNOWN'}")
+        self.current_file_type.set(core.file_type_label(filename))
 
     def browse_folder(self):
         f = filedialog.askdirectory(title="Select Folder for Batch Processing")
@@ -394,46 +496,49 @@ class ModernForensicsTool:
 
     # ---------- Stego Preview (triggered on file selection) ----------
     def on_file_selected(self, *args):
-        self.update_stego_preview()
+        # Debounce: only the last selection within the window gets a preview
+        if self.preview_pending is not None:
+            self.root.after_cancel(self.preview_pending)
+        self.preview_pending = self.root.after(PREVIEW_DEBOUNCE_MS, self.update_stego_preview)
 
     def update_stego_preview(self):
-        """Update the preview panel with the currently selected image (if any)."""
+        """Start building the preview for the currently selected image (if any)."""
+        self.preview_pending = None
+        self.preview_token += 1
         path = self.selected_file.get()
         if not path or not os.path.exists(path):
-            self.preview_label.config(image='', text='NO IMAGE SELECTED')
+            self.show_stego_preview(self.preview_token, None, None)
+            return
+        self.preview_label.config(image='', text='LOADING PREVIEW...')
+        threading.Thread(target=self._preview_thread, args=(self.preview_token, path), daemon=True).start()
+
+    def _preview_thread(self, token, path):
+        try:
+            # Header only: dimensions and capacity without decoding pixels
+            info = core.image_header(path)
+            thumb = core.preview_thumbnail(path)
+        except Exception:
+            info, thumb = None, None
+        self.root.after(0, lambda: self.show_stego_preview(token, info, thumb))
+
+    def show_stego_preview(self, token, info, thumb):
+        if token != self.preview_token:
+            return  # a newer selection superseded this one
+        if info is None:
+            text = 'PREVIEW ERROR' if self.selected_file.get() else 'NO IMAGE SELECTED'
+            self.preview_label.config(image='', text=text)
             self.img_format_label.config(text="FORMAT: --")
             self.img_dimensions_label.config(text="SIZE: --")
             self.img_capacity_label.config(text="CAPACITY: --")
             return
 
-        try:
-            img = Image.open(path)
-            if img.mode not in ('RGB', 'L'):
-                img = img.convert('RGB')
-            
-            # Create thumbnail (max 300x300 for the new UI)
-            img_copy = img.copy()
-            img_copy.thumbnail((300, 300))
-            photo = ImageTk.PhotoImage(img_copy)
-            self.preview_label.config(image=photo, text='')
-            self.preview_label.image = photo 
-
-            ext = os.path.splitext(path)[1].upper()[1:] or 'UNKNOWN'
-            self.img_format_label.config(text=f"FORMAT: {ext}")
-            self.img_dimensions_label.config(text=f"SIZE: {img.width} × {img.height}")
-
-            if img.mode == 'RGB':
-                pixels = img.width * img.height
-                capacity_bits = pixels * 3
-            else:
-                pixels = img.width * img.height
-                capacity_bits = pixels * 3
-
-            capacity_bytes = capacity_bits // 8
-            self.img_capacity_label.config(text=f"CAPACITY: ~{capacity_bytes:,} BYTES")
-
-        except Exception as e:
-            self.preview_label.config(image='', text=f'PREVIEW ERROR')
+        from PIL import ImageTk
+        photo = ImageTk.PhotoImage(thumb)
+        self.preview_label.config(image=photo, text='')
+        self.preview_label.image = photo
+        self.img_format_label.config(text=f"FORMAT: {info['format']}")
+        self.img_dimensions_label.config(text=f"SIZE: {info['width']} × {info['height']}")
+        self.img_capacity_label.config(text=f"CAPACITY: ~{info['capacity']:,} BYTES")
 
     # ---------- METADATA EXTRACTION ----------
     def extract_single_file(self):
@@ -447,7 +552,7 @@ class ModernForensicsTool:
         self.update_status("📊 Extracting metadata...")
         try:
             path = self.selected_file.get()
-            metadata = self.extract_all_metadata(path)
+            metadata = self.extract_all_metadata(path, cache=self.active_cache())
             self.root.after(0, lambda: self.populate_metadata(metadata))
             self.current_metadata = metadata
         except Exception as e:
@@ -455,145 +560,14 @@ class ModernForensicsTool:
         finally:
             self.root.after(0, lambda: self.show_progress(False))
 
-    def extract_all_metadata(self, path):
-        meta = {}
-        stat = os.stat(path)
-        meta['Basic Info'] = {
-            'File Name': os.path.basename(path),
-            'File Size': f"{stat.st_size:,} bytes",
-            'Created': datetime.fromtimestamp(stat.st_ctime).strftime('%Y-%m-%d %H:%M:%S'),
-            'Modified': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
-            'Accessed': datetime.fromtimestamp(stat.st_atime).strftime('%Y-%m-%d %H:%M:%S'),
-            'Extension': os.path.splitext(path)[1],
-        }
-
-        meta['Hashes'] = self.compute_hashes(path)
-
-        ext = os.path.splitext(path)[1].lower()
-        if ext in ('.jpg','.jpeg','.png','.gif','.bmp','.tiff'):
-            meta.update(self.extract_image_metadata(path))
-        elif ext == '.pdf':
-            meta.update(self.extract_pdf_metadata(path))
-        elif ext == '.docx':
-            meta.update(self.extract_docx_metadata(path))
-        elif ext == '.xlsx':
-            meta.update(self.extract_xlsx_metadata(path))
-
-        return meta
-
-    def compute_hashes(self, path, blocksize=65536):
-        hashes = {}
-        md5 = hashlib.md5()
-        sha1 = hashlib.sha1()
-        sha256 = hashlib.sha256()
-        with open(path, 'rb') as f:
-            while chunk := f.read(blocksize):
-                md5.update(chunk)
-                sha1.update(chunk)
-                sha256.update(chunk)
-        hashes['MD5'] = md5.hexdigest()
-        hashes['SHA-1'] = sha1.hexdigest()
-        hashes['SHA-256'] = sha256.hexdigest()
-        return hashes
-
-    def extract_image_metadata(self, path):
-        meta = {}
-        try:
-            img = Image.open(path)
-            info = {
-                'Format': img.format,
-                'Mode': img.mode,
-                'Width': img.width,
-                'Height': img.height,
-                'Is Animated': getattr(img, 'is_animated', False),
-                 'Frames': getattr(img, 'n_frames', 1)
-            }
-            meta['Image Properties'] = info
-
-            # EXIF
-            exif_data = {}
-            if hasattr(img, '_getexif') and img._getexif():
-                exif = img._getexif()
-                for tag_id, value in exif.items():
-                    tag = ExifTags.TAGS.get(tag_id, tag_id)
-                    exif_data[tag] = str(value)
-            if exif_data:
-                meta['EXIF'] = exif_data
-
-            # Use exifread for more detailed EXIF
-            with open(path, 'rb') as f:
-                tags = exifread.process_file(f, details=False)
-                if tags:
-                    gps = {}
-                    for k, v in tags.items():
-                        if 'GPS' in k:
-                            gps[k] = str(v)
-                    if gps:
-                        meta['GPS'] = gps
-        except Exception as e:
-            meta['Image Error'] = str(e)
-        return meta
-
-    def extract_pdf_metadata(self, path):
-        meta = {}
-        try:
-            with open(path, 'rb') as f:
-                reader = PyPDF2.PdfReader(f)
-                info = reader.metadata
-                if info:
-                    meta['PDF Metadata'] = {k: str(v) for k, v in info.items()}
-                meta['PDF Info'] = {
-                    'Number of Pages': len(reader.pages),
-                    'Encrypted': reader.is_encrypted
-                }
-        except Exception as e:
-            meta['PDF Error'] = str(e)
-        return meta
-
-    def extract_docx_metadata(self, path):
-        meta = {}
-        try:
-            doc = docx.Document(path)
-            core_props = doc.core_properties
-            props = {
-                'Author': core_props.author,
-                'Title': core_props.title,
-                'Subject': core_props.subject,
-                'Keywords': core_props.keywords,
-                'Comments': core_props.comments,
-                'Category': core_props.category,
-                'Created': core_props.created,
-                'Modified': core_props.modified,
-                'Last Modified By': core_props.last_modified_by,
-                'Revision': core_props.revision,
-                'Word Count': len(doc.paragraphs) + len(doc.tables)
-            }
-            meta['DOCX Properties'] = {k: str(v) for k, v in props.items() if v}
-        except Exception as e:
-            meta['DOCX Error'] = str(e)
-        return meta
-
-    def extract_xlsx_metadata(self, path):
-        meta = {}
-        try:
-            wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
-            props = wb.properties
-            p = {
-                'Title': props.title,
-                'Subject': props.subject,
-                'Creator': props.creator,
-                'Keywords': props.keywords,
-                'Description': props.description,
-                'Created': props.created,
-                'Modified': props.modified,
-                'Last Modified By': props.lastModifiedBy,
-                'Category': props.category,
-                'Sheets': wb.sheetnames
-            }
-            meta['XLSX Properties'] = {k: str(v) for k, v in p.items() if v}
-        except Exception as e:
-            meta['XLSX Error'] = str(e)
-        return meta
+    # Headless operations live in forensics_core
+    extract_all_metadata = staticmethod(core.extract_all_metadata)
+    compute_hashes = staticmethod(core.compute_hashes)
+    extract_image_metadata = staticmethod(core.extract_image_metadata)
+    extract_pdf_metadata = staticmethod(core.extract_pdf_metadata)
+    extract_docx_metadata = staticmethod(core.extract_docx_metadata)
+    extract_xlsx_metadata = staticmethod(core.extract_xlsx_metadata)
+    generate_hex_dump = staticmethod(core.generate_hex_dump)
 
     def populate_metadata(self, metadata):
         self.clear_tree()
@@ -663,41 +637,20 @@ class ModernForensicsTool:
             path = self.selected_file.get()
             msg = self.secret_message.get()
 
-            msg_bytes = msg.encode('utf-8')
-            header = struct.pack('>I', len(msg_bytes))
-            payload = header + msg_bytes
-            bits = ''.join(format(b, '08b') for b in payload)
-
-            img = Image.open(path)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            arr = np.array(img)
-            
-            if arr.dtype != np.uint8:
-                arr = arr.astype(np.uint8)
-                
-            flat = arr.flatten()
-
-            if len(bits) > len(flat):
-                raise ValueError(f"Image too small. Need {len(bits)} bits, have {len(flat)}.")
-
-            for i, bit in enumerate(bits):
-                flat[i] = (flat[i] & 0xFE) | int(bit)
-
-            new_arr = flat.reshape(arr.shape)
-            new_img = Image.fromarray(new_arr, img.mode)
-
             save_path = filedialog.asksaveasfilename(
                 defaultextension=".png",
                 filetypes=[("PNG files", "*.png")],
                 title="Save encoded image as PNG"
             )
             if save_path:
-                new_img.save(save_path, 'PNG')
+                # Streams strip by strip, so large images stay within the memory budget
+                stats = core.encode_message_to_file(path, msg, save_path)
                 self.root.after(0, lambda: self.update_status(
                     f"✅ Saved to {os.path.basename(save_path)}"))
                 self.root.after(0, lambda: self.stego_display_success(
-                    "Encoding completed successfully."))
+                    f"Encoding completed successfully.\n"
+                    f"Embedded {stats['bytes']:,} bytes in {stats['seconds']:.3f}s "
+                    f"({stats['bytes_per_sec'] / 1024:,.1f} KB/s)"))
             else:
                 self.root.after(0, lambda: self.update_status("Encoding cancelled."))
 
@@ -719,30 +672,7 @@ class ModernForensicsTool:
         try:
             path = self.selected_file.get()
 
-            img = Image.open(path)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            arr = np.array(img)
-            if arr.dtype != np.uint8:
-                arr = arr.astype(np.uint8)
-            flat = arr.flatten()
-
-            length_bits = ''.join(str(flat[i] & 1) for i in range(32))
-            length = int(length_bits, 2)
-
-            if length <= 0 or length > 10000:
-                raise ValueError("No valid message header found.")
-
-            total_bits = 32 + length * 8
-            if total_bits > len(flat):
-                raise ValueError("Image does not contain enough bits.")
-            bits = ''.join(str(flat[i] & 1) for i in range(total_bits))
-
-            bytes_data = bytes(
-                int(bits[i:i+8], 2) for i in range(32, len(bits), 8)
-            )
-
-            msg = bytes_data.decode('utf-8', errors='replace')
+            msg = core.decode_message(path)
             self.root.after(0, lambda: self.stego_display_message(msg))
 
         except Exception as e:
@@ -774,64 +704,42 @@ class ModernForensicsTool:
         self.update_status("🔬 Analyzing for steganography...")
         try:
             path = self.selected_file.get()
-            img = Image.open(path)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            arr = np.array(img)
-            if arr.dtype != np.uint8:
-                arr = arr.astype(np.uint8)
-            flat = arr.flatten()
-            total_pixels = len(flat)
-            lsb_ones = int(np.sum(flat & 1))
-            lsb_ratio = lsb_ones / total_pixels
-            entropy = self._calculate_entropy(flat)
-            stat = os.stat(path)
-            file_size = stat.st_size
-            expected_size = arr.shape[0] * arr.shape[1] * 3 + 1000
-            size_ratio = file_size / expected_size if expected_size else 1
-
-            report = []
-            report.append("🔬 STEGANOGRAPHY ANALYSIS REPORT")
-            report.append("=" * 60)
-            report.append(f"File: {os.path.basename(path)}")
-            report.append(f"Size: {file_size:,} bytes")
-            report.append(f"Dimensions: {arr.shape[1]}×{arr.shape[0]}")
-            report.append(f"Mode: {img.mode}")
-            report.append("")
-            report.append("📊 STATISTICAL ANALYSIS:")
-            report.append(f"  LSB 1s: {lsb_ones:,} / {total_pixels:,} ({lsb_ratio:.2%})")
-            report.append(f"  Entropy: {entropy:.4f} bits")
-            report.append(f"  File size vs expected: {size_ratio:.2f}x")
-            report.append("")
-            report.append("⚠️  SUSPICION INDICATORS:")
-            suspicious = []
-            if abs(lsb_ratio - 0.5) > 0.1:
-                suspicious.append("LSB distribution not uniform (potential stego)")
-            if entropy > 7.9:
-                suspicious.append("High entropy (possible encrypted/carved data)")
-            if size_ratio > 1.2:
-                suspicious.append("File significantly larger than expected")
-            if suspicious:
-                for s in suspicious:
-                    report.append(f"  • {s}")
-            else:
-                report.append("  No obvious steganographic signs.")
-            
-            self.root.after(0, lambda: self.stego_display_report("\n".join(report)))
+            result = core.analyze_image(path, cache=self.active_cache())
+            report = core.format_analysis_report(result)
+            overlay = core.heatmap_overlay(path, result['heatmap'], result['heatmap_tile'])
+            self.root.after(0, lambda: self.stego_display_report(report, overlay))
         except Exception as e:
             self.root.after(0, lambda: self.update_status(f"❌ Analysis failed: {str(e)}", is_error=True))
         finally:
             self.root.after(0, lambda: self.show_progress(False))
 
-    def _calculate_entropy(self, data):
-        values, counts = np.unique(data, return_counts=True)
-        probs = counts / len(data)
-        entropy = -np.sum(probs * np.log2(probs))
-        return entropy
+    def carve_hidden_data(self):
+        if not self.selected_file.get():
+            messagebox.showwarning("No File", "Please select a file.", parent=self.root)
+            return
+        threading.Thread(target=self._carve_thread, daemon=True).start()
 
-    def stego_display_report(self, report):
+    def _carve_thread(self):
+        self.show_progress(True)
+        self.update_status("🧲 Searching for appended and embedded data...")
+        try:
+            result = core.carve_file(self.selected_file.get(), cache=self.active_cache())
+            report = core.format_carve_report(result)
+            self.root.after(0, lambda: self.stego_display_report(report))
+        except Exception as e:
+            self.root.after(0, lambda: self.update_status(f"❌ Carving failed: {str(e)}", is_error=True))
+        finally:
+            self.root.after(0, lambda: self.show_progress(False))
+
+    def stego_display_report(self, report, overlay=None):
         self.stego_text.delete(1.0, tk.END)
         self.stego_text.insert(tk.END, report)
+        if overlay is not None:
+            # Replace the plain preview with the suspicion heatmap overlay
+            from PIL import ImageTk
+            photo = ImageTk.PhotoImage(overlay)
+            self.preview_label.config(image=photo, text='')
+            self.preview_label.image = photo
         self.notebook.select(1)
         self.update_status("✅ Analysis complete.")
 
@@ -840,65 +748,143 @@ class ModernForensicsTool:
         if not self.selected_folder.get():
             messagebox.showwarning("No Folder", "Please select a folder first.", parent=self.root)
             return
-        threading.Thread(target=self._batch_thread, daemon=True).start()
-
-    def _batch_thread(self):
+        folder = self.selected_folder.get()
+        try:
+            workers = self.batch_worker_count()
+            max_depth = self.batch_scan_depth()
+            archive_depth = self.batch_archive_levels()
+        except ValueError as e:
+            messagebox.showwarning("Invalid Batch Option", str(e), parent=self.root)
+            return
+        options = {
+            'workers': workers,
+            'max_depth': max_depth,
+            'include': self.batch_include.get(),
+            'exclude': self.batch_exclude.get(),
+            'cache_path': self.active_cache_path(),
+            'carve': self.batch_carve.get(),
+            'entropy': self.batch_entropy.get(),
+            'archive_depth': archive_depth,
+            'strings': self.batch_strings.get(),
+            'perceptual': self.batch_perceptual.get(),
+        }
+        if options['perceptual']:
+            import perceptual_hash
+            self.batch_hash_index = perceptual_hash.HashIndex()
+        else:
+            self.batch_hash_index = None
+        # A new run supersedes the one in progress: stop its producer and drain loop
+        if self.batch_channel is not None:
+            self.batch_channel.cancel()
+        channel = self.batch_channel = ResultChannel(maxsize=BATCH_CHANNEL_SIZE)
+        self.batch_tree.delete(*self.batch_tree.get_children())
+        self.batch_results = []
         self.show_progress(True)
         self.update_status("📦 Processing batch...")
-        self.root.after(0, lambda: self.batch_tree.delete(*self.batch_tree.get_children()))
-        self.batch_results.clear()
-        folder = self.selected_folder.get()
+        threading.Thread(target=self._batch_thread, args=(folder, options, channel), daemon=True).start()
+        self.root.after(BATCH_FRAME_MS, lambda: self._drain_batch(channel, folder, 0.0))
+
+    def _batch_thread(self, folder, options, channel):
+        error = None
+        entries = batch_engine.stream_folder(folder, **options)
         try:
-            files = []
-            for root, dirs, files_ in os.walk(folder):
-                for f in files_:
-                    files.append(os.path.join(root, f))
-                break  # top-level only
-            total = len(files)
-            for idx, path in enumerate(files):
-                try:
-                    stat = os.stat(path)
-                    size = stat.st_size
-                    ext = os.path.splitext(path)[1].lower()
-                    modified = datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d')
-                    md5 = self.compute_hashes(path)['MD5'][:8] + '...'
-                    status = "✅ Clean"
-                    if size > 10_000_000:
-                        status = "⚠️ Large"
-                    if ext in ('.exe', '.dll', '.bat', '.vbs', '.elf'):
-                        status = "🔴 Executable"
-                    self.root.after(0, lambda p=path, e=ext, s=size, m=md5, mod=modified, stat=status:
-                                   self.batch_tree.insert('', 'end', values=(
-                                       os.path.basename(p), e, f"{s:,}", m, stat, mod)))
-                    self.batch_results.append({
-                        'file': path, 'type': ext, 'size': size,
-                        'md5': md5, 'status': status, 'modified': modified
-                    })
-                    self.root.after(0, lambda i=idx, t=total: self.update_status(f"📦 Processed {i+1}/{t} files..."))
-                except Exception:
-                    continue
-            self.root.after(0, lambda: self.update_status(f"✅ Batch complete: {len(files)} files processed"))
+            for entry in entries:
+                if not channel.put(entry):
+                    break
         except Exception as e:
-            self.root.after(0, lambda: self.update_status(f"❌ Batch error: {str(e)}", is_error=True))
+            error = e
         finally:
-            self.root.after(0, lambda: self.show_progress(False))
+            # Shuts the worker pool down now when a newer batch cancelled this one
+            entries.close()
+            channel.close(error)
+
+    def _drain_batch(self, channel, folder, last_status):
+        """Move queued batch results into the Treeview within one frame budget."""
+        if channel is not self.batch_channel:
+            return
+        rows = channel.drain(BATCH_ROWS_PER_FRAME, BATCH_FRAME_BUDGET)
+        for r in rows:
+            name = os.path.relpath(r['file'], folder)
+            self.mark_near_duplicates(self.insert_batch_row('', r, name), r, name)
+        self.batch_results.extend(rows)
+
+        if channel.done:
+            if channel.error is not None:
+                self.update_status(f"❌ Batch error: {str(channel.error)}", is_error=True)
+            else:
+                self.update_status(f"✅ Batch complete: {len(self.batch_results)} files processed")
+            self.show_progress(False)
+            self.batch_channel = None
+            return
+
+        # Throttle status text; the Treeview rows already show progress
+        now = time.monotonic()
+        if rows and now - last_status >= BATCH_STATUS_INTERVAL:
+            self.update_status(f"📦 Processed {len(self.batch_results)} files...")
+            last_status = now
+        self.root.after(BATCH_FRAME_MS, lambda: self._drain_batch(channel, folder, last_status))
+
+    def insert_batch_row(self, parent, r, name):
+        """Insert a batch row, with archive members as collapsed child rows."""
+        item = self.batch_tree.insert(parent, 'end', values=(
+            name, r['type'], f"{r['size']:,}", r['md5'], r['status'], r['modified'],
+            f"{r['max_entropy']:.2f}" if 'max_entropy' in r else '', ''))
+        for member in r.get('members', ()):
+            self.insert_batch_row(item, member, member['file'].rsplit(archives.SEPARATOR, 1)[-1])
+        return item
+
+    def mark_near_duplicates(self, item, r, name):
+        """Link an image row to earlier rows with a close pHash as soon as it arrives."""
+        if self.batch_hash_index is None or not r.get('phash'):
+            return
+        value = int(r['phash'], 16)
+        matches = self.batch_hash_index.search(value)
+        if matches:
+            distance, (other, other_name) = matches[0]
+            self.batch_tree.set(item, 'Similar', f"≈ {other_name} ({distance})")
+            if not self.batch_tree.set(other, 'Similar'):
+                self.batch_tree.set(other, 'Similar', f"≈ {name} ({distance})")
+        self.batch_hash_index.add(value, (item, name))
+
+    def batch_worker_count(self):
+        """Worker count from the Spinbox; ValueError for empty or non-numeric input."""
+        try:
+            workers = int(self.batch_workers.get())
+        except (tk.TclError, ValueError):
+            workers = 0
+        if workers < 1:
+            raise ValueError("Workers must be a whole number of at least 1.")
+        return workers
+
+    def batch_archive_levels(self):
+        """Archive depth from the Spinbox; ValueError for empty or non-numeric input."""
+        try:
+            depth = int(self.batch_archive_depth.get())
+        except (tk.TclError, ValueError):
+            depth = -1
+        if depth < 0:
+            raise ValueError("Archive depth must be a whole number of at least 0.")
+        return depth
+
+    def batch_scan_depth(self):
+        """Depth limit for the scanner: 0 = top level, None = unlimited.
+
+        Raises ValueError for a typed value that is not a whole number.
+        """
+        if not self.batch_recursive.get():
+            return 0
+        depth = self.batch_max_depth.get().strip()
+        if not depth:
+            return None
+        if not depth.isdigit():
+            raise ValueError("Max depth must be a whole number, or empty for no limit.")
+        return int(depth)
 
     def generate_batch_report(self):
         if not self.batch_results:
             messagebox.showinfo("No Data", "No batch results to export.", parent=self.root)
             return
-        report = "Batch Analysis Report\n"
-        report += "="*50 + "\n"
-        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-        report += f"Folder: {self.selected_folder.get()}\n"
-        report += f"Files analyzed: {len(self.batch_results)}\n\n"
-        clean = sum(1 for r in self.batch_results if r['status'] == '✅ Clean')
-        suspicious = len(self.batch_results) - clean
-        report += f"Clean files: {clean}\n"
-        report += f"Suspicious files: {suspicious}\n\n"
-        report += "Details:\n"
-        for r in self.batch_results:
-            report += f"  {r['file']} - {r['type']} - {r['size']} bytes - {r['md5']} - {r['status']}\n"
+        report = core.format_batch_report(self.batch_results, self.selected_folder.get())
         filename = filedialog.asksaveasfilename(defaultextension=".txt",
                                                 filetypes=[("Text files","*.txt")],
                                                 title="Save Batch Report")
@@ -912,39 +898,248 @@ class ModernForensicsTool:
         if not self.selected_file.get():
             messagebox.showwarning("No File", "Please select a file first.", parent=self.root)
             return
-        threading.Thread(target=self._hex_thread, daemon=True).start()
+        try:
+            hex_file = hexview.HexFile(self.selected_file.get())
+        except Exception as e:
+            self.update_status(f"❌ Hex error: {str(e)}", is_error=True)
+            return
+        self.close_hex_file()
+        self.hex_file = hex_file
+        self.hex_top_line = 0
+        self.hex_highlight = None
+        self.render_hex()
+        self.update_status(f"✅ Hex view loaded: {hex_file.size:,} bytes")
+        self.notebook.select(3)
+        threading.Thread(target=self._entropy_thread, args=(hex_file.path, self.hex_entropy_token),
+                         daemon=True).start()
+
+    def close_hex_file(self):
+        if self.hex_file is not None:
+            self.hex_file.close()
+            self.hex_file = None
+        self.cancel_hex_search()
+        self.hex_hits.delete(0, tk.END)
+        self.hex_hit_offsets = []
+        # Results of a profile still running for the old file are dropped
+        self.hex_entropy_token += 1
+        self.hex_entropy = None
+        self.entropy_canvas.delete('all')
+
+    def _entropy_thread(self, path, token):
+        try:
+            entropy = core.entropy_profile(path)
+        except Exception as e:
+            self.root.after(0, lambda: self.update_status(f"❌ Entropy profile failed: {str(e)}", is_error=True))
+            return
+        self.root.after(0, lambda: self.show_entropy_profile(entropy, token))
 
-    def _hex_thread(self):
-        self.show_progress(True)
-        self.update_status("🔢 Loading hex view...")
+    def show_entropy_profile(self, entropy, token):
+        if token != self.hex_entropy_token:
+            return
+        self.hex_entropy = entropy
+        self.draw_entropy_chart()
+
+    def draw_entropy_chart(self):
+        """Draw the entropy profile as bars, 8 bits per byte at full height."""
+        canvas = self.entropy_canvas
+        canvas.delete('all')
+        if self.hex_entropy is None or not len(self.hex_entropy):
+            return
+        import byte_entropy
+        width = max(1, canvas.winfo_width())
+        values = byte_entropy.downsample(self.hex_entropy, width)
+        scale = width / len(values)
+        for i, value in enumerate(values.tolist()):
+            x = int(i * scale)
+            top = ENTROPY_CHART_HEIGHT * (1 - value / 8)
+            color = self.colors['danger'] if value >= byte_entropy.HIGH_ENTROPY else self.colors['accent']
+            canvas.create_line(x, ENTROPY_CHART_HEIGHT, x, top, fill=color)
+
+    def on_entropy_click(self, event):
+        if self.hex_file is None or self.hex_entropy is None or not len(self.hex_entropy):
+            return
+        fraction = min(max(event.x / max(1, self.entropy_canvas.winfo_width()), 0.0), 1.0)
+        window = min(int(fraction * len(self.hex_entropy)), len(self.hex_entropy) - 1)
+        self.hex_jump_to_offset(window * core.ENTROPY_WINDOW)
+
+    def render_hex(self):
+        """Redraw only the lines currently visible in the Hex tab."""
+        self.hex_text.delete(1.0, tk.END)
+        if self.hex_file is None:
+            return
+        total = self.hex_file.line_count
+        self.hex_top_line = max(0, min(self.hex_top_line, total - self.hex_visible_lines))
+        self.hex_text.insert(tk.END, self.hex_file.render(self.hex_top_line, self.hex_visible_lines))
+
+        if self.hex_highlight is not None:
+            row = self.hex_highlight - self.hex_top_line
+            if 0 <= row < self.hex_visible_lines:
+                self.hex_text.tag_add('hit', f'{row + 1}.0', f'{row + 1}.end')
+
+        if total:
+            first = self.hex_top_line / total
+            self.hex_scroll.set(first, min(1.0, (self.hex_top_line + self.hex_visible_lines) / total))
+        else:
+            self.hex_scroll.set(0, 1)
+
+    def on_hex_resize(self, event):
+        linespace = tkfont.Font(font=self.hex_text['font']).metrics('linespace')
+        visible = max(1, event.height // max(1, linespace))
+        if visible != self.hex_visible_lines:
+            self.hex_visible_lines = visible
+            self.render_hex()
+
+    def on_hex_scroll(self, action, amount, unit=None):
+        """Scrollbar callback: ('moveto', fraction) or ('scroll', n, 'units'|'pages')."""
+        if self.hex_file is None:
+            return
+        if action == 'moveto':
+            self.hex_top_line = int(float(amount) * self.hex_file.line_count)
+            self.render_hex()
+        elif action == 'scroll':
+            step = self.hex_visible_lines if unit == 'pages' else 1
+            self.hex_scroll_lines(int(amount) * step)
+
+    def hex_scroll_lines(self, delta):
+        if self.hex_file is None:
+            return 'break'
+        self.hex_top_line += delta
+        self.render_hex()
+        return 'break'
+
+    def hex_jump_to_offset(self, offset=None):
+        if self.hex_file is None:
+            messagebox.showinfo("No Hex View", "Load a file into the hex view first.", parent=self.root)
+            return
+        if offset is None:
+            try:
+                offset = int(self.hex_offset.get().strip(), 0)
+            except ValueError:
+                self.update_status("❌ Invalid offset", is_error=True)
+                return
+        line = self.hex_file.line_of(offset)
+        self.hex_highlight = line
+        self.hex_top_line = line
+        self.render_hex()
+        self.update_status(f"✅ Jumped to offset 0x{offset:X}")
+
+    def hex_search(self):
+        if self.hex_file is None:
+            messagebox.showinfo("No Hex View", "Load a file into the hex view first.", parent=self.root)
+            return
         try:
-            path = self.selected_file.get()
-            hex_dump = self.generate_hex_dump(path)
-            self.root.after(0, lambda: self.display_hex(hex_dump))
+            pattern = hexsearch.parse_pattern(self.hex_search_text.get(), self.hex_search_mode.get(),
+                                              self.hex_search_case.get())
+        except ValueError as e:
+            self.update_status(f"❌ {str(e)}", is_error=True)
+            return
+        path = self.hex_file.path
+        rows = lambda cancel, report: ((offset, f"0x{offset:08X}  ({length} B)")
+                                       for offset, length in hexsearch.search_file(path, pattern, cancel=cancel,
+                                                                                   progress=report))
+        self.start_hex_listing(rows, "🔍", "Search", "hits", hexsearch.MAX_HITS)
+
+    def hex_strings(self):
+        if self.hex_file is None:
+            messagebox.showinfo("No Hex View", "Load a file into the hex view first.", parent=self.root)
+            return
+        path = self.hex_file.path
+        # 'A' marks ASCII strings, 'U' UTF-16LE ones
+        rows = lambda cancel, report: ((offset, f"0x{offset:08X} {'A' if encoding == 'ascii' else 'U'} {text[:200]}")
+                                       for offset, encoding, text in core.iter_strings(path, cancel=cancel,
+                                                                                       progress=report))
+        self.start_hex_listing(rows, "🔤", "Strings", "strings", core.STRINGS_LIMIT)
+
+    def start_hex_listing(self, rows, icon, title, noun, limit):
+        """Fill the hit list from `rows(cancel, report)`, a generator of (offset, label) run in a thread."""
+        self.cancel_hex_search()
+        self.hex_hits.delete(0, tk.END)
+        self.hex_hit_offsets = []
+        cancel = threading.Event()
+        self.hex_search_cancel = cancel
+        channel = ResultChannel(maxsize=BATCH_CHANNEL_SIZE)
+        progress = [0.0]
+        labels = (icon, title, noun, limit)
+        self.update_status(f"{icon} {title}...")
+        threading.Thread(target=self._hex_listing_thread, args=(rows, cancel, channel, progress),
+                         daemon=True).start()
+        self.root.after(BATCH_FRAME_MS, lambda: self._drain_hex_hits(channel, cancel, progress, 0.0, labels))
+
+    def _hex_listing_thread(self, rows, cancel, channel, progress):
+        def report(fraction):
+            progress[0] = fraction
+
+        error = None
+        try:
+            for row in rows(cancel, report):
+                channel.put(row)
         except Exception as e:
-            self.root.after(0, lambda: self.update_status(f"❌ Hex error: {str(e)}", is_error=True))
+            error = e
         finally:
-            self.root.after(0, lambda: self.show_progress(False))
+            channel.close(error)
+
+    def _drain_hex_hits(self, channel, cancel, progress, last_status, labels):
+        """Add rows to the hit list within one frame budget; the first one is shown at once."""
+        icon, title, noun, limit = labels
+        hits = channel.drain(BATCH_ROWS_PER_FRAME, BATCH_FRAME_BUDGET)
+        if not cancel.is_set():
+            for offset, label in hits:
+                self.hex_hit_offsets.append(offset)
+                self.hex_hits.insert(tk.END, label)
+            if hits and len(self.hex_hit_offsets) == len(hits):
+                self.hex_jump_to_offset(hits[0][0])
+
+        if channel.done:
+            count = len(self.hex_hit_offsets)
+            if channel.error is not None:
+                self.update_status(f"❌ {title} failed: {str(channel.error)}", is_error=True)
+            elif cancel.is_set():
+                # A listing superseded by a newer one stays quiet
+                if self.hex_search_cancel is None:
+                    self.update_status(f"⏹ {title} cancelled after {count} {noun}")
+            else:
+                capped = f" (limit of {limit} reached)" if count >= limit else ""
+                self.update_status(f"✅ {title} complete: {count} {noun}{capped}")
+            return
 
-    def generate_hex_dump(self, path, bytes_per_line=16):
-        lines = []
-        with open(path, 'rb') as f:
-            offset = 0
-            while chunk := f.read(bytes_per_line):
-                hex_str = ' '.join(f'{b:02X}' for b in chunk)
-                ascii_str = ''.join(chr(b) if 32 <= b <= 126 else '.' for b in chunk)
-                lines.append(f'{offset:08X}: {hex_str:<{bytes_per_line*3}} {ascii_str}')
-                offset += len(chunk)
-                if offset > 2048:
-                    lines.append('... (file truncated)')
-                    break
-        return '\n'.join(lines)
+        now = time.monotonic()
+        if not cancel.is_set() and now - last_status >= BATCH_STATUS_INTERVAL:
+            self.update_status(f"{icon} {title}... {progress[0]:.0%}, {len(self.hex_hit_offsets)} {noun}")
+            last_status = now
+        self.root.after(BATCH_FRAME_MS, lambda: self._drain_hex_hits(channel, cancel, progress, last_status, labels))
 
-    def display_hex(self, hex_data):
-        self.hex_text.delete(1.0, tk.END)
-        self.hex_text.insert(tk.END, hex_data)
-        self.update_status("✅ Hex view loaded successfully!")
-        self.notebook.select(3)
+    def cancel_hex_search(self):
+        if self.hex_search_cancel is not None:
+            self.hex_search_cancel.set()
+            self.hex_search_cancel = None
+
+    def on_hex_hit_select(self, event):
+        selection = self.hex_hits.curselection()
+        if selection and self.hex_file is not None:
+            self.hex_jump_to_offset(self.hex_hit_offsets[selection[0]])
+
+    def export_hex_dump(self):
+        if not self.selected_file.get():
+            messagebox.showwarning("No File", "Please select a file first.", parent=self.root)
+            return
+        filename = filedialog.asksaveasfilename(defaultextension=".txt",
+                                                filetypes=[("Text files","*.txt")],
+                                                title="Export Full Hex Dump")
+        if filename:
+            threading.Thread(target=self._hex_export_thread, args=(self.selected_file.get(), filename),
+                             daemon=True).start()
+
+    def _hex_export_thread(self, path, filename):
+        self.show_progress(True)
+        self.update_status("🔢 Exporting hex dump...")
+        try:
+            stats = hexview.write_hex_dump(path, filename)
+            self.root.after(0, lambda: self.update_status(
+                f"✅ Hex dump saved to {os.path.basename(filename)} ({stats['mb_per_sec']:.1f} MB/s)"))
+        except Exception as e:
+            self.root.after(0, lambda: self.update_status(f"❌ Hex export failed: {str(e)}", is_error=True))
+        finally:
+            self.root.after(0, lambda: self.show_progress(False))
 
     # ---------- EXPORT ----------
     def export_to_json(self):
@@ -964,10 +1159,25 @@ class ModernForensicsTool:
                 json.dump(data, f, indent=2, default=str)
             self.update_status(f"✅ Exported to {os.path.basename(filename)}")
 
+    # ---------- RESULT CACHE ----------
+    def active_cache_path(self):
+        return result_cache.DEFAULT_CACHE_PATH if self.use_cache.get() else None
+
+    def active_cache(self):
+        path = self.active_cache_path()
+        return result_cache.open_cache(path) if path else None
+
+    def clear_cache(self):
+        if not messagebox.askyesno("Clear Cache", "Delete all cached hashes and metadata?", parent=self.root):
+            return
+        result_cache.open_cache().invalidate()
+        self.update_status("✅ Result cache cleared")
+
     def clear_results(self):
         self.clear_tree()
         self.batch_tree.delete(*self.batch_tree.get_children())
         self.stego_text.delete(1.0, tk.END)
+        self.close_hex_file()
         self.hex_text.delete(1.0, tk.END)
         self.current_metadata.clear()
         self.batch_results.clear()